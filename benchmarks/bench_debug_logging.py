@@ -0,0 +1,51 @@
+"""Compares the cost of the per-request debug log line on a large request body, with debug logging disabled
+
+Usage: python benchmarks/bench_debug_logging.py [megabytes], with evclient installed or on PYTHONPATH
+"""
+import logging
+import sys
+import timeit
+
+import requests
+
+from evclient import BaseClient
+
+logger = logging.getLogger('evclient.base_client')
+
+
+def make_response(body) -> requests.Response:
+    request = requests.Request('POST', 'https://customer.noda.se/test/api/v1/timeseries', data=body).prepare()
+    response = requests.Response()
+    response.status_code = 200
+    response._content = b''
+    response.request = request
+    return response
+
+
+def eager_log(response: requests.Response) -> None:
+    """The log line as it was: the f-string is built even if debug logging is off"""
+    logger.debug(
+        f'API Request sent:\n'
+        f'Url: {response.request.url}\n'
+        f'Body: {response.request.body}\n'
+        f'Status Code: {response.status_code}'
+    )
+
+
+def main() -> None:
+    size = int(float(sys.argv[1]) * 1000000) if len(sys.argv) > 1 else 20000000
+    logging.basicConfig(level=logging.WARNING)
+    client = BaseClient(domain='test', api_key='123456789', rate_limit=None)
+    # Form bodies are str, compressed bodies are bytes and are logged as their repr.
+    for body_type, body in [('str', 'x' * size), ('bytes', bytes(range(256)) * (size // 256))]:
+        response = make_response(body)
+        for name, func in [
+            ('eager f-string', lambda: eager_log(response)),
+            ('_process_response', lambda: client._process_response(response)),
+        ]:
+            best = min(timeit.repeat(func, number=10, repeat=5)) / 10
+            print(f'{body_type:<6} {name:<20} {best * 1000:8.3f}ms per call')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,39 @@
+"""Compares decoding and encoding a timeseries response with the available JSON codecs
+
+Usage: python benchmarks/bench_json_codec.py [points], with evclient installed or on PYTHONPATH
+"""
+import datetime
+import json
+import sys
+import timeit
+
+from evclient import json_codec
+from evclient.json_codec import JSONCodec, OrjsonCodec
+
+
+def make_body(points: int) -> bytes:
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    data = [{'ts': (start + datetime.timedelta(seconds=i)).isoformat(), 'v': i * 0.5} for i in range(points)]
+    return json.dumps({'timeseries': [{'node_id': 1, 'tag': 'outdoortemp', 'data': data}]}).encode('utf-8')
+
+
+def main() -> None:
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    body = make_body(points)
+    document = json.loads(body)
+    codecs = [JSONCodec()]
+    if json_codec.orjson is not None:
+        codecs.append(OrjsonCodec())
+
+    for codec in codecs:
+        assert codec.loads(body) == document
+        for name, func in [
+            ('loads', lambda: codec.loads(body)),
+            ('dumps', lambda: codec.dumps(document)),
+        ]:
+            best = min(timeit.repeat(func, number=1, repeat=5))
+            print(f'{codec.name:<8} {name:<6} {best:8.3f}s  {points / best:12,.0f} points/s')
+
+
+if __name__ == '__main__':
+    main()
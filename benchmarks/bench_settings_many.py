@@ -0,0 +1,53 @@
+"""Compares fetching the settings of many nodes one by one and with get_settings_many
+
+The network is stubbed with a fixed latency per request and the rate limit is off, so the measured speedup is the
+one reached when the domain rate limit allows it. With a rate limit, throughput is capped at that many requests per
+second whatever the number of workers.
+
+Usage: python benchmarks/bench_settings_many.py, with evclient installed or on PYTHONPATH
+"""
+import time
+
+import requests
+
+from evclient import SettingsClient
+
+NODES = 400
+LATENCY = 0.02
+
+
+def make_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['content-type'] = 'application/json'
+    response._content = body
+    response.request = requests.Request('GET', 'https://customer.noda.se').prepare()
+    return response
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    time.sleep(LATENCY)
+    return make_response(b'{"coco": {"default": {"hello": "world"}}}')
+
+
+def main() -> None:
+    client = SettingsClient(domain='test', api_key='123456789', rate_limit=None)
+    client._session.request = request
+    node_ids = list(range(NODES))
+
+    started = time.perf_counter()
+    for node_id in node_ids:
+        client.get_settings('node', node_id, path='coco')
+    serial = time.perf_counter() - started
+    print(f'{"serial":>12}: {serial:6.2f}s')
+
+    for max_workers in (4, 8, 16):
+        started = time.perf_counter()
+        results = list(client.get_settings_many('node', node_ids, path='coco', max_workers=max_workers))
+        elapsed = time.perf_counter() - started
+        assert len(results) == NODES
+        print(f'{max_workers:>4} workers: {elapsed:6.2f}s ({serial / elapsed:.1f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Compares json.dumps with a datetime default hook to encode_timeseries for a store_multiple_timeseries_data payload
+
+Usage: python benchmarks/bench_timeseries_encoder.py [points], with evclient installed or on PYTHONPATH
+"""
+import datetime
+import json
+import sys
+import timeit
+
+from evclient import TimeseriesColumns
+from evclient.timeseries_encoder import encode_timeseries
+
+
+def json_default(obj):
+    if isinstance(obj, datetime.datetime):
+        return obj.isoformat()
+    raise TypeError(type(obj).__name__)
+
+
+def make_timeseries(points: int, nodes: int = 100) -> list:
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))
+    per_node = points // nodes
+    return [{
+        'node_id': node_id,
+        'tag': 'outdoortemp',
+        'data': [{'v': i * 0.1, 'ts': start + datetime.timedelta(seconds=i)} for i in range(per_node)]
+    } for node_id in range(nodes)]
+
+
+def main() -> None:
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    timeseries = make_timeseries(points)
+    columns = [
+        TimeseriesColumns.from_response_group({
+            'node_id': group['node_id'],
+            'tag': group['tag'],
+            'data': [{'v': row['v'], 'ts': row['ts'].timestamp()} for row in group['data']]
+        }) for group in timeseries
+    ]
+    assert json.loads(encode_timeseries(timeseries)) == json.loads(json.dumps(timeseries, default=json_default))
+
+    for name, func in [
+        ('json.dumps(default=)', lambda: json.dumps(timeseries, default=json_default)),
+        ('encode_timeseries', lambda: encode_timeseries(timeseries)),
+        ('encode_timeseries columnar', lambda: encode_timeseries(columns)),
+    ]:
+        best = min(timeit.repeat(func, number=1, repeat=3))
+        print(f'{name:<28} {best:8.3f}s  {points / best:12,.0f} points/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Compares parsing the timestamps of a timeseries response per row with pyrfc3339 and in bulk
+
+Usage: python benchmarks/bench_timestamps.py [points], with evclient installed or on PYTHONPATH
+"""
+import datetime
+import sys
+import timeit
+
+import pyrfc3339
+
+from evclient.timestamps import parse_timestamps
+
+
+def make_values(points: int) -> list:
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))
+    return [(start + datetime.timedelta(seconds=i)).isoformat() for i in range(points)]
+
+
+def main() -> None:
+    points = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    values = make_values(points)
+    assert parse_timestamps(values) == [pyrfc3339.parse(value) for value in values]
+
+    for name, func in [
+        ('pyrfc3339 per row', lambda: [pyrfc3339.parse(value) for value in values]),
+        ('parse_timestamps', lambda: parse_timestamps(values)),
+    ]:
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print(f'{name:<20} {best:8.3f}s  {points / best:12,.0f} points/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Measures the per-call cost of the runtime type checks of the clients
+
+Runs every case with type checks on (the default), with a client created with type_checks=False, and in a fresh
+interpreter with EV_TYPE_CHECKS=0, which leaves the checks out at import time. The network is stubbed, so only the
+client overhead is measured.
+
+Usage: python benchmarks/bench_type_checks.py, with evclient installed or on PYTHONPATH
+"""
+import datetime
+import os
+import subprocess
+import sys
+import timeit
+
+import requests
+
+from evclient import TimeseriesClient, SettingsClient
+from evclient.typecheck import type_checks_enabled
+from evclient.utils import filter_none_values_from_dict
+
+
+def make_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response.headers['content-type'] = 'application/json'
+    response._content = body
+    response.request = requests.Request('GET', 'https://customer.noda.se').prepare()
+    return response
+
+
+def cases(type_checks: bool) -> list:
+    kwargs = dict(domain='test', api_key='123456789', rate_limit=None, type_checks=type_checks)
+    timeseries_client = TimeseriesClient(**kwargs)
+    settings_client = SettingsClient(**kwargs)
+    settings_response = make_response(b'{"value": "1"}')
+    start = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+    timeseries = [{
+        'node_id': node_id,
+        'tag': 'outdoortemp',
+        'data': [{'ts': start + datetime.timedelta(minutes=i), 'v': 1.0} for i in range(1000)]
+    } for node_id in range(10)]
+
+    empty_response = make_response(b'')
+    settings_client._session.request = lambda *args, **kwargs: settings_response
+    timeseries_client._session.request = lambda *args, **kwargs: empty_response
+
+    return [
+        ('filter_none_values_from_dict', 100000, lambda: filter_none_values_from_dict({'a': 1, 'b': None})),
+        ('_process_response', 100000, lambda: settings_client._process_response(settings_response)),
+        ('get_settings', 10000, lambda: settings_client.get_settings('node', 1, path='coco')),
+        ('store_multiple_timeseries_data 10k', 20,
+         lambda: timeseries_client.store_multiple_timeseries_data(timeseries)),
+    ]
+
+
+def run(mode: str, type_checks: bool) -> None:
+    for name, number, func in cases(type_checks):
+        per_call = min(timeit.repeat(func, number=number, repeat=7)) / number
+        print(f'{mode:<18} {name:<36} {per_call * 1e6:10.2f}us per call')
+
+
+def main() -> None:
+    if not type_checks_enabled():
+        run('EV_TYPE_CHECKS=0', True)
+        return
+    run('checked', True)
+    run('type_checks=False', False)
+    sys.stdout.flush()
+    subprocess.run([sys.executable, __file__], env={**os.environ, 'EV_TYPE_CHECKS': '0'}, check=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,9 @@
 __version__ = '0.1.0'
 
+import importlib
 import logging
-from .base_client import BaseClient
-from .client import EVClient
-from .csv_import_client import CSVImportClient
-from .node_client import NodeClient
-from .tag_client import TagClient
-from .settings_client import SettingsClient
-from .timeseries_client import TimeseriesClient
-from .dataset_client import DatasetClient
+from typing import Any, List
+
 from .exceptions import (
     EVBadRequestException,
     EVUnauthorizedException,
@@ -20,28 +15,83 @@ from .exceptions import (
     EVInternalServerException,
     EVFatalErrorException
 )
-from .types.csv_import_types import (
-    CSVImportIntegrationType,
-    CSVImportResponse
-)
-from .types.node_types import (
-    DeviceType,
-    NodeType,
-    NodeResponse
-)
-from .types.tag_types import (
-    TagType,
-    TagResponse
-)
-from .types.timeseries_types import (
-    TimeseriesResponseData,
-    TimeseriesResponseGroup,
-    TimeseriesResponse,
-    StoreTimeseriesResponse,
-    StoreTimeseriesData,
-    TimeseriesData,
-    TimeseriesGroup
-)
-from .types.dataset_types import DatasetType
+
+# The clients and types are imported on first access (PEP 562), so `import evclient` does not import requests,
+# aiohttp and the other dependencies up front.
+_LAZY_IMPORTS = {
+    '.base_client': ['BaseClient'],
+    '.client': ['EVClient'],
+    '.async_client': ['AsyncEVClient'],
+    '.csv_import_client': ['CSVImportClient'],
+    '.node_client': ['NodeClient'],
+    '.tag_client': ['TagClient'],
+    '.settings_client': ['SettingsClient', 'SettingsResult', 'SettingsSyncResult'],
+    '.settings_diff': ['SettingsChange'],
+    '.settings_cache': ['SettingsCache', 'SettingsCacheStats'],
+    '.timeseries_client': ['TimeseriesClient'],
+    '.dataset_client': ['DatasetClient'],
+    '.timeseries_writer': ['TimeseriesWriter'],
+    '.timeseries_write_scheduler': ['TimeseriesWriteScheduler'],
+    '.timeseries_cache': ['TimeseriesCache'],
+    '.node_catalog': ['Node', 'NodeCatalog'],
+    '.tag_registry': ['TagRegistry', 'TimeseriesQueryPlanner', 'TimeseriesQuery'],
+    '.rate_limiter': ['RateLimiter'],
+    '.retry': ['RetryPolicy'],
+    '.json_codec': ['JSONCodec', 'OrjsonCodec'],
+    '.compression': ['CompressionStats'],
+    '.instrumentation': ['RequestHooks', 'RequestInfo', 'ResponseInfo', 'MetricsCollector'],
+    '.types.csv_import_types': [
+        'CSVImportIntegrationType',
+        'CSVImportResponse'
+    ],
+    '.types.node_types': [
+        'DeviceType',
+        'NodeType',
+        'NodeResponse'
+    ],
+    '.types.tag_types': [
+        'TagType',
+        'TagResponse'
+    ],
+    '.types.timeseries_types': [
+        'TimeseriesResponseData',
+        'TimeseriesResponseGroup',
+        'TimeseriesResponse',
+        'StoreTimeseriesResponse',
+        'StoreTimeseriesData',
+        'TimeseriesData',
+        'TimeseriesGroup'
+    ],
+    '.types.dataset_types': ['DatasetType'],
+    '.columnar': ['TimeseriesColumns'],
+}
+_LAZY_MODULES = {name: module for module, names in _LAZY_IMPORTS.items() for name in names}
+
+__all__ = [
+    'EVBadRequestException',
+    'EVUnauthorizedException',
+    'EVRequestFailedException',
+    'EVForbiddenException',
+    'EVNotFoundException',
+    'EVConflictException',
+    'EVTooManyRequestsException',
+    'EVInternalServerException',
+    'EVFatalErrorException',
+    *_LAZY_MODULES
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_MODULES))
+
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -0,0 +1,431 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Any, Dict, List, Optional, TextIO, Tuple, Union
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+from .typecheck import typechecked
+from .base_client import BaseClient
+from .columnar import TimeseriesColumns
+from .compression import CompressionStats
+from .csv_import_client import _CSV_IMPORT_API_PATH
+from .dataset_client import _DATASET_API_PATH, _datasets_query_params, _dataset_body
+from .instrumentation import RequestTrace, ResponseInfo
+from .node_client import _NODE_API_PATH, _parse_nodes
+from .settings_client import _SETTINGS_API_PATH, _settings_query_params, _settings_body
+from .tag_client import _TAG_API_PATH, _parse_tags
+from .timeseries_chunking import merge_timeseries_groups
+from .timeseries_client import (
+    _TIMESERIES_API_PATH,
+    DEFAULT_MAX_NODES_PER_REQUEST,
+    TimeseriesRequest,
+    _plan_timeseries_requests,
+    _timeseries_query_params,
+    _store_timeseries_body,
+    _store_multiple_timeseries_body,
+    _parse_timeseries_response,
+    _parse_store_multiple_timeseries_response,
+    _parse_store_timeseries_response
+)
+from .types.csv_import_types import CSVImportResponse
+from .types.dataset_types import DatasetType
+from .types.node_types import NodeType
+from .types.tag_types import TagType
+from .types.timeseries_types import (
+    TimeseriesGroup,
+    StoreTimeseriesData
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncEVClient(BaseClient):
+    """
+    An asyncio client for all sections of NODA EnergyView API
+
+    Has the same methods as :class:`.EVClient`, as coroutines. Requests are sent with a non-blocking
+    `aiohttp <https://docs.aiohttp.org>`_ session, which is an optional dependency. Install it with
+    ``pip install aiohttp``.
+
+    The client should be closed when done, preferably by using it as an async context manager::
+
+        async with AsyncEVClient(domain='my-domain', api_key='my-api-key') as client:
+            nodes = await client.get_nodes()
+    """
+
+    @typechecked
+    def __init__(self,
+                 domain: Optional[str] = None,
+                 api_key: Optional[str] = None,
+                 endpoint_url: Optional[str] = None,
+                 max_connections: int = 10,
+                 max_concurrency: int = 10,
+                 timeout: Optional[float] = 300.0,
+                 **kwargs
+                 ) -> None:
+        """AsyncEVClient constructor
+
+        Takes the same arguments as :class:`.BaseClient`, and the following.
+
+        Args:
+            max_connections (int): Size of the connection pool.
+            max_concurrency (int): Maximum number of requests in flight at the same time.
+                Requests are also held back by the domain rate limiter, which is shared with the sync clients.
+            timeout (Optional[float]): Total timeout in seconds for a single request.
+        """
+        if aiohttp is None:
+            raise ImportError('AsyncEVClient requires aiohttp, install it with: pip install aiohttp')
+        super().__init__(domain, api_key, endpoint_url, **kwargs)
+        # The endpoints, their parameters and response parsing are shared with the sync clients.
+        self._csv_import_api_path: str = _CSV_IMPORT_API_PATH
+        self._node_api_path: str = _NODE_API_PATH
+        self._tag_api_path: str = _TAG_API_PATH
+        self._settings_api_path: str = _SETTINGS_API_PATH
+        self._timeseries_api_path: str = _TIMESERIES_API_PATH
+        self._dataset_api_path: str = _DATASET_API_PATH
+
+        self._max_connections: int = max_connections
+        self._max_concurrency: int = max_concurrency
+        self._timeout: Optional[float] = timeout
+        self._async_session: Optional['aiohttp.ClientSession'] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> 'AsyncEVClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the underlying connection pool"""
+        if self._async_session is not None:
+            await self._async_session.close()
+            self._async_session = None
+        self._session.close()
+
+    def _get_async_session(self) -> 'aiohttp.ClientSession':
+        if self._async_session is None or self._async_session.closed:
+            self._async_session = aiohttp.ClientSession(
+                headers=dict(self._session.headers),
+                connector=aiohttp.TCPConnector(limit=self._max_connections),
+                timeout=aiohttp.ClientTimeout(total=self._timeout),
+                trace_configs=[_trace_config()]
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._async_session
+
+    async def _send(self, method: str, url: str, decode: bool = True, **kwargs: Any) -> Optional[Any]:
+        """Send a request and process the response like :meth:`.BaseClient._process_response` does
+
+        Waits for the domain rate limit and retries failed requests according to the retry policy of the client.
+        Without `decode`, the response is neither decoded nor checked for errors and None is returned, as for silent
+        stores of the sync clients.
+        """
+        self._encode_json_body(kwargs)
+        compressed = self._compress_request(method, kwargs)
+        if compressed is not None:
+            response, content, trace = await self._send_request(method, url, *compressed)
+            if not self._compression_rejected(response.status, content):
+                return self._process_async_response(response, content, trace, decode)
+            self._finish_trace(trace)
+        response, content, trace = await self._send_request(method, url, kwargs)
+        return self._process_async_response(response, content, trace, decode)
+
+    async def _send_request(self,
+                            method: str,
+                            url: str,
+                            kwargs: Dict[str, Any],
+                            compression: Optional[CompressionStats] = None
+                            ) -> Tuple['aiohttp.ClientResponse', bytes, Optional[RequestTrace]]:
+        session = self._get_async_session()
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            trace = None
+            try:
+                async with self._semaphore:
+                    # The rate limit is waited for once the request may be sent, requests held back by the
+                    # concurrency limit would otherwise all be sent together once their reserved times have passed.
+                    if self._rate_limiter is not None:
+                        await self._wait_for_rate_limit(method)
+                    trace = self._start_trace(method, url, attempt)
+                    async with session.request(method, url, trace_request_ctx=trace, **kwargs) as response:
+                        content = await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self._trace_error(trace, e)
+                delay = self._get_retry_delay(method, attempt, started)
+                if delay is None:
+                    raise
+            else:
+                self._trace_async_response(trace, content, response.status, kwargs.get('data'), compression)
+                delay = self._get_retry_delay(
+                    method, attempt, started, response.status, response.headers.get('Retry-After')
+                )
+                if delay is None:
+                    return response, content, trace
+                self._finish_trace(trace)
+            self._trace_retry(trace, delay)
+            logger.debug('Retrying %s %s in %.2fs (retry %d)', method, url, delay, attempt + 1)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _wait_for_rate_limit(self, method: str) -> None:
+        # Like :meth:`.RateLimiter.acquire`, without blocking the event loop.
+        delay = self._rate_limiter.reserve(method)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        delay = self._rate_limiter.reserve_domain()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _trace_async_response(self,
+                              trace: Optional[RequestTrace],
+                              content: bytes,
+                              status: int,
+                              data: Any,
+                              compression: Optional[CompressionStats] = None
+                              ) -> None:
+        if trace is None:
+            return
+        dns = trace.span('dns_start', 'dns_end')
+        connect = trace.span('connect_start', 'connect_end')
+        headers = trace.marks.get('headers')
+        trace.response = ResponseInfo(
+            status=status,
+            bytes_in=len(content),
+            bytes_out=len(data) if isinstance(data, (bytes, str)) else None,
+            dns=dns,
+            # The host name is resolved while the connection is created.
+            connect=connect - (dns or 0.0) if connect is not None else None,
+            ttfb=headers - trace.started if headers is not None else None,
+            total=trace.elapsed(),
+            decode=None,
+            compression=compression
+        )
+
+    def _process_async_response(self,
+                                response: 'aiohttp.ClientResponse',
+                                content: bytes,
+                                trace: Optional[RequestTrace] = None,
+                                decode: bool = True
+                                ) -> Optional[Any]:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('API Request sent:\nUrl: %s\nStatus Code: %s', response.url, response.status)
+        if not decode:
+            self._finish_trace(trace)
+            return None
+        content_type = response.headers.get('content-type')
+        if content_type is not None:
+            content_type = content_type.split(';')[0].strip()
+        if response.status < 400:
+            decode_started = time.perf_counter()
+            result = self._decode_content(content, content_type)
+            self._finish_trace(trace, decode=time.perf_counter() - decode_started)
+            return result
+        self._finish_trace(trace)
+        self._raise_for_status(response.status, content, content_type)
+
+    @typechecked
+    async def get_csv_imports(self) -> CSVImportResponse:
+        """See :meth:`.CSVImportClient.get_csv_imports`"""
+        return await self._send('GET', f'{self._url}/{self._csv_import_api_path}')
+
+    async def upload_csv_file(self, import_uuid: str, csv_file: TextIO) -> None:
+        """See :meth:`.CSVImportClient.upload_csv_file`"""
+        return await self._send(
+            'POST',
+            f'{self._url}/{self._csv_import_api_path}/{import_uuid}',
+            data={'file': csv_file}
+        )
+
+    @typechecked
+    async def get_nodes(self) -> List[NodeType]:
+        """See :meth:`.NodeClient.get_nodes`"""
+        return _parse_nodes(await self._send('GET', f'{self._url}/{self._node_api_path}'))
+
+    @typechecked
+    async def get_tags(self) -> List[TagType]:
+        """See :meth:`.TagClient.get_tags`"""
+        return _parse_tags(await self._send('GET', f'{self._url}/{self._tag_api_path}'))
+
+    @typechecked
+    async def get_settings(self,
+                           settings_type: str,
+                           settings_id: int,
+                           path: Optional[str] = None,
+                           extract: Optional[bool] = False
+                           ) -> Any:
+        """See :meth:`.SettingsClient.get_settings`"""
+        return await self._send(
+            'GET',
+            f'{self._url}/{self._settings_api_path}/{settings_type}/{settings_id}',
+            params=_settings_query_params(path, extract)
+        )
+
+    @typechecked
+    async def store_settings(self,
+                             settings_type: str,
+                             settings_id: int,
+                             path: str,
+                             value: str,
+                             force: Optional[bool] = False
+                             ) -> Dict[str, str]:
+        """See :meth:`.SettingsClient.store_settings`"""
+        return await self._send(
+            'PUT',
+            f'{self._url}/{self._settings_api_path}/{settings_type}/{settings_id}',
+            data=_settings_body(path, value, force)
+        )
+
+    @typechecked
+    async def get_timeseries_data(self,
+                                  node_ids: Optional[Union[int, List[int]]] = None,
+                                  tags: Optional[Union[str, List[str]]] = None,
+                                  start: Optional[datetime.datetime] = None,
+                                  end: Optional[datetime.datetime] = None,
+                                  resolution: Optional[str] = None,
+                                  aggregate: Optional[str] = None,
+                                  epoch: Optional[bool] = False,
+                                  columnar: bool = False,
+                                  raw_epoch: bool = False,
+                                  max_nodes_per_request: Optional[int] = DEFAULT_MAX_NODES_PER_REQUEST,
+                                  max_points_per_request: Optional[int] = None,
+                                  sample_interval: Optional[float] = None
+                                  ) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
+        """See :meth:`.TimeseriesClient.get_timeseries_data`
+
+        Large queries are split into the same requests as by the sync client, which are sent concurrently within
+        `max_concurrency` and the domain rate limit.
+        """
+        chunks: List[TimeseriesRequest] = _plan_timeseries_requests(
+            node_ids, tags, start, end, resolution, max_nodes_per_request, max_points_per_request, sample_interval
+        )
+
+        async def get_chunk(chunk: TimeseriesRequest) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
+            chunk_node_ids, chunk_start, chunk_end = chunk
+            r = await self._send(
+                'GET',
+                f'{self._url}/{self._timeseries_api_path}',
+                params=_timeseries_query_params(
+                    chunk_node_ids, tags, chunk_start, chunk_end, resolution, aggregate, epoch
+                )
+            )
+            return _parse_timeseries_response(r, columnar, raw_epoch)
+
+        if len(chunks) == 1:
+            return await get_chunk(chunks[0])
+        return merge_timeseries_groups(list(await asyncio.gather(*[get_chunk(chunk) for chunk in chunks])))
+
+    @typechecked
+    async def store_timeseries_data(self,
+                                    node_id: int,
+                                    tag: str,
+                                    val: float,
+                                    ts: datetime.datetime,
+                                    silent: Optional[bool] = True
+                                    ) -> Optional[StoreTimeseriesData]:
+        """See :meth:`.TimeseriesClient.store_timeseries_data`"""
+        response_data = await self._send(
+            'POST',
+            f'{self._url}/{self._timeseries_api_path}',
+            decode=not silent,
+            data=_store_timeseries_body(node_id, tag, val, ts, silent)
+        )
+        if silent:
+            return None
+        return _parse_store_timeseries_response(response_data)
+
+    @typechecked
+    async def store_multiple_timeseries_data(self,
+                                             timeseries: List[Union[TimeseriesGroup, TimeseriesColumns]],
+                                             overwrite: Optional[bool] = False,
+                                             silent: Optional[bool] = True,
+                                             ) -> Optional[List[TimeseriesGroup]]:
+        """See :meth:`.TimeseriesClient.store_multiple_timeseries_data`"""
+        r = await self._send(
+            'POST',
+            f'{self._url}/{self._timeseries_api_path}',
+            data=_store_multiple_timeseries_body(timeseries, overwrite, silent)
+        )
+        return _parse_store_multiple_timeseries_response(r, silent)
+
+    @typechecked
+    async def get_datasets(self,
+                           offset: Optional[int] = None,
+                           limit: Optional[int] = None
+                           ) -> List[DatasetType]:
+        """See :meth:`.DatasetClient.get_datasets`"""
+        return await self._send(
+            'GET',
+            f'{self._url}/{self._dataset_api_path}',
+            params=_datasets_query_params(offset, limit)
+        )
+
+    @typechecked
+    async def create_dataset(self,
+                             content: str,
+                             dataset_format: str,
+                             name: str,
+                             tags: Optional[List[str]] = None,
+                             thing_uuid: Optional[str] = None
+                             ) -> DatasetType:
+        """See :meth:`.DatasetClient.create_dataset`"""
+        return await self._send(
+            'POST',
+            f'{self._url}/{self._dataset_api_path}',
+            json=_dataset_body(content, dataset_format, name, tags, thing_uuid)
+        )
+
+    @typechecked
+    async def get_dataset(self, dataset_uuid: str) -> DatasetType:
+        """See :meth:`.DatasetClient.get_dataset`"""
+        return await self._send('GET', f'{self._url}/{self._dataset_api_path}/{dataset_uuid}')
+
+    @typechecked
+    async def get_dataset_content(self, dataset_uuid: str) -> Any:
+        """See :meth:`.DatasetClient.get_dataset_content`"""
+        return await self._send('GET', f'{self._url}/{self._dataset_api_path}/{dataset_uuid}/raw')
+
+    @typechecked
+    async def update_dataset(self,
+                             dataset_uuid: str,
+                             content: Optional[str] = None,
+                             dataset_format: Optional[str] = None,
+                             name: Optional[str] = None,
+                             tags: Optional[List[str]] = None,
+                             thing_uuid: Optional[str] = None
+                             ) -> None:
+        """See :meth:`.DatasetClient.update_dataset`"""
+        return await self._send(
+            'PUT',
+            f'{self._url}/{self._dataset_api_path}/{dataset_uuid}',
+            json=_dataset_body(content, dataset_format, name, tags, thing_uuid)
+        )
+
+    @typechecked
+    async def delete_dataset(self, dataset_uuid: str) -> None:
+        """See :meth:`.DatasetClient.delete_dataset`"""
+        return await self._send('DELETE', f'{self._url}/{self._dataset_api_path}/{dataset_uuid}')
+
+
+def _trace_config() -> 'aiohttp.TraceConfig':
+    """Records connection events in the marks of the :class:`.RequestTrace` passed as `trace_request_ctx`"""
+    def mark(name: str):
+        async def handler(session, context, params) -> None:
+            if context.trace_request_ctx is not None:
+                context.trace_request_ctx.marks[name] = time.perf_counter()
+        return handler
+
+    config = aiohttp.TraceConfig()
+    config.on_dns_resolvehost_start.append(mark('dns_start'))
+    config.on_dns_resolvehost_end.append(mark('dns_end'))
+    config.on_connection_create_start.append(mark('connect_start'))
+    config.on_connection_create_end.append(mark('connect_end'))
+    # Sent once the response headers have been received.
+    config.on_request_end.append(mark('headers'))
+    return config
@@ -1,14 +1,11 @@
-import json.decoder
 import os
+import time
 import logging
-from warnings import filterwarnings
-from typing import Type, Dict, Optional, Any
+from typing import Type, Dict, List, Optional, Any, Tuple, Union
 
-import yaml
 import requests
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 
+from .typecheck import typechecked, disable_type_checks
 from .exceptions import (
     EVBadRequestException,
     EVUnauthorizedException,
@@ -21,8 +18,20 @@ from .exceptions import (
     EVFatalErrorException,
     EVUnexpectedStatusCodeException,
 )
+from .compression import (
+    DEFAULT_COMPRESSION_THRESHOLD,
+    ENCODINGS,
+    CompressionStats,
+    compress,
+    encode_body,
+    is_rejected
+)
+from .instrumentation import RequestHooks, RequestInfo, RequestTrace, ResponseInfo, endpoint_path
+from .json_codec import JSONCodec, get_json_codec
+from .rate_limiter import RateLimiter, DEFAULT_RATE_LIMIT, get_rate_limiter
+from .retry import RetryPolicy
 
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
+DEFAULT_LOG_BODY_LIMIT = 1024
 logger = logging.getLogger(__name__)
 Response = requests.models.Response
 
@@ -44,17 +53,32 @@ class BaseClient:
         429: EVTooManyRequestsException,
     }
 
-    @beartype
+    @typechecked
     def __init__(self,
                  domain: Optional[str] = None,
                  api_key: Optional[str] = None,
-                 endpoint_url: Optional[str] = None
+                 endpoint_url: Optional[str] = None,
+                 rate_limit: Optional[float] = DEFAULT_RATE_LIMIT,
+                 get_rate_limit: Optional[float] = None,
+                 set_rate_limit: Optional[float] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 json_codec: Optional[Union[str, JSONCodec]] = None,
+                 request_compression: Optional[str] = None,
+                 compression_threshold: int = DEFAULT_COMPRESSION_THRESHOLD,
+                 compression_level: int = 6,
+                 hooks: Optional[List[RequestHooks]] = None,
+                 log_bodies: bool = False,
+                 log_body_limit: int = DEFAULT_LOG_BODY_LIMIT,
+                 type_checks: bool = True
                  ) -> None:
         """BaseClient constructor
 
         Defines the base url and customer domain for the EnergyView API and sets headers in a new
         requests session.
 
+        Requests are throttled by the rate limits of the client, and by a domain rate limit that is shared by all
+        clients in the process that talk to the same domain.
+
         Will look for the following environment variables if parameters are omitted:
 
         EV_DOMAIN
@@ -67,10 +91,36 @@ class BaseClient:
             domain (Optional[str]): The EnergyView domain to make requests to.
             api_key (Optional[str]): API Key for the selected EnergyView domain.
             endpoint_url (Optional[str]): Alternative EnergyView URL
+            rate_limit (Optional[float]): Maximum number of requests per second of this client. The API allows 10 per
+                domain, the default stays just below that, and all clients of a domain together are kept below it
+                too. A lower limit only slows down this client. None disables rate limiting.
+            get_rate_limit (Optional[float]): Optional separate budget (requests per second) for GET requests.
+            set_rate_limit (Optional[float]): Optional separate budget (requests per second) for
+                POST, PUT and DELETE requests.
+            retry_policy (Optional[:class:`.RetryPolicy`]): Retry failed requests (429, 5xx and connection errors)
+                according to this policy. Requests are not retried if omitted.
+            json_codec (Optional[Union[str, :class:`.JSONCodec`]]): Codec, or name of the codec, for JSON request
+                and response bodies: 'json' or 'orjson'. Defaults to the EV_JSON_CODEC environment variable, else to
+                orjson if installed.
+            request_compression (Optional[str]): Compress POST and PUT bodies with this Content-Encoding, gzip or
+                deflate. Off by default. The first compressed request probes the server: if it is rejected with
+                415, or with 400 and an error about the encoding, it is sent again uncompressed and compression is
+                turned off for the client. Other errors are not resent, the next compressed request probes again.
+                The size, ratio and time of each compression are reported to the `hooks` in
+                :attr:`.ResponseInfo.compression`.
+            compression_threshold (int): Bodies smaller than this many bytes are sent uncompressed.
+            compression_level (int): zlib compression level, 1 is fastest and 9 is smallest.
+            hooks (Optional[List[:class:`.RequestHooks`]]): Called with the method, endpoint, status, sizes and
+                timings of every request, such as a :class:`.MetricsCollector`. More can be added to `hooks` later.
+            log_bodies (bool): Include request bodies in the debug log of each request.
+            log_body_limit (int): Logged bodies are truncated to this many characters.
+            type_checks (bool): Check argument and return types of the client methods at runtime. Set the
+                EV_TYPE_CHECKS environment variable to 0 to leave out the checks of all clients at import time.
 
         Raises:
             :class:`.EVFatalErrorException`: The client could not find a specified domain
                 or api key for the EnergyView API
+            ValueError: Unknown JSON codec name or request compression.
         """
         if endpoint_url:
             self._base_url: str = endpoint_url
@@ -100,19 +150,242 @@ class BaseClient:
 
         self._url: str = f'{self._base_url}/{self._domain}/{self._api_root}/{self._api_version}'
 
-    @beartype
-    def _handle_successful_response(self, response: Response) -> Optional[Any]:
-        if response.headers.get('content-type') == 'application/yaml':
+        self._rate_limiter: Optional[RateLimiter] = None
+        if rate_limit:
+            self._rate_limiter = get_rate_limiter(self._url, rate_limit, get_rate_limit, set_rate_limit)
+        self._retry_policy: Optional[RetryPolicy] = retry_policy
+        self._json_codec: JSONCodec = get_json_codec(json_codec)
+
+        if request_compression is not None and request_compression not in ENCODINGS:
+            raise ValueError(f'Unknown request compression {request_compression!r}, expected gzip or deflate')
+        self._request_compression: Optional[str] = request_compression
+        self._compression_threshold: int = compression_threshold
+        self._compression_level: int = compression_level
+        self._compression_supported: Optional[bool] = None
+        self.hooks: List[RequestHooks] = list(hooks or [])
+        self._log_bodies: bool = log_bodies
+        self._log_body_limit: int = log_body_limit
+        if not type_checks:
+            disable_type_checks(self)
+
+    @property
+    def json_codec(self) -> JSONCodec:
+        """The codec used for JSON request and response bodies"""
+        return self._json_codec
+
+    def _encode_json_body(self, kwargs: Dict[str, Any]) -> None:
+        """Replaces a `json` request argument by a body encoded with the client codec"""
+        if kwargs.get('json') is None:
+            kwargs.pop('json', None)
+            return
+        kwargs['data'] = self._json_codec.dumps(kwargs.pop('json'))
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), 'Content-Type': 'application/json'}
+
+    @property
+    def request_compression_supported(self) -> Optional[bool]:
+        """Whether the server accepts compressed request bodies, None until a compressed request has been answered"""
+        return self._compression_supported
+
+    def _compress_request(self,
+                          method: str,
+                          kwargs: Dict[str, Any]
+                          ) -> Optional[Tuple[Dict[str, Any], CompressionStats]]:
+        """Returns the request arguments with a compressed body and its stats, None if the body should be sent as is"""
+        if self._request_compression is None or self._compression_supported is False or method not in ('POST', 'PUT'):
+            return None
+        data = kwargs.get('data')
+        body = encode_body(data)
+        if body is None or len(body) < self._compression_threshold or kwargs.get('files'):
+            return None
+
+        compressed, stats = compress(body, self._request_compression, self._compression_level)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                'Compressed request body with %s: %d -> %d bytes, ratio %.1f in %.1fms',
+                stats.encoding, stats.original_size, stats.compressed_size, stats.ratio, stats.seconds * 1000
+            )
+        headers = {**(kwargs.get('headers') or {}), 'Content-Encoding': stats.encoding}
+        if isinstance(data, dict):
+            headers.setdefault('Content-Type', 'application/x-www-form-urlencoded')
+        return {**kwargs, 'data': compressed, 'headers': headers}, stats
+
+    def _compression_rejected(self, status_code: int, content: bytes) -> bool:
+        """Records the outcome of a compressed request, True if the server could not read it and it must be resent"""
+        if self._compression_supported is not None:
+            return False
+        if status_code < 400:
+            self._compression_supported = True
+        elif is_rejected(status_code, content):
+            logger.warning(
+                f'{self._url} rejected a {self._request_compression} compressed request with {status_code}, '
+                f'sending requests uncompressed'
+            )
+            self._compression_supported = False
+            return True
+        return False
+
+    @typechecked
+    def _request(self, method: str, url: str, **kwargs: Any) -> Response:
+        """Send a request with the client session, waiting for the domain rate limit if needed
+
+        Failed requests are retried according to the retry policy of the client. When the retries run out,
+        the last response is returned or the last connection error is raised.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The full request url.
+            **kwargs: Passed on to :meth:`requests.Session.request`. A `json` body is encoded with the client codec.
+        """
+        self._encode_json_body(kwargs)
+        compressed = self._compress_request(method, kwargs)
+        if compressed is not None:
+            response = self._send_request(method, url, *compressed)
+            if not self._compression_rejected(response.status_code, response.content):
+                return response
+            self._finish_trace(self._pop_trace(response))
+        return self._send_request(method, url, kwargs)
+
+    def _send_request(self,
+                      method: str,
+                      url: str,
+                      kwargs: Dict[str, Any],
+                      compression: Optional[CompressionStats] = None
+                      ) -> Response:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(method)
+            trace = self._start_trace(method, url, attempt)
+            try:
+                response: Response = self._session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._trace_error(trace, e)
+                delay = self._get_retry_delay(method, attempt, started)
+                if delay is None:
+                    raise
+            else:
+                self._trace_response(trace, response, kwargs.get('stream', False), compression)
+                delay = self._get_retry_delay(
+                    method, attempt, started, response.status_code, response.headers.get('Retry-After')
+                )
+                if delay is None:
+                    return response
+                self._finish_trace(self._pop_trace(response))
+            self._trace_retry(trace, delay)
+            logger.debug('Retrying %s %s in %.2fs (retry %d)', method, url, delay, attempt + 1)
+            time.sleep(delay)
+            attempt += 1
+
+    def _call_hooks(self, name: str, *args: Any) -> None:
+        for hook in self.hooks:
+            try:
+                getattr(hook, name)(*args)
+            except Exception:
+                logger.exception(f'Request hook {name} failed')
+
+    def _start_trace(self, method: str, url: str, attempt: int) -> Optional[RequestTrace]:
+        """Starts timing an attempt and calls the on_request_start hooks, returns None if there are no hooks"""
+        if not self.hooks:
+            return None
+        trace = RequestTrace(RequestInfo(method, endpoint_path(url, self._url), url, attempt))
+        self._call_hooks('on_request_start', trace.request)
+        return trace
+
+    def _trace_response(self,
+                        trace: Optional[RequestTrace],
+                        response: Response,
+                        stream: bool,
+                        compression: Optional[CompressionStats] = None
+                        ) -> None:
+        """Records the timings of a response, the hooks are called by :meth:`_finish_trace` once it is decoded"""
+        if trace is None:
+            return
+        body = response.request.body
+        trace.response = ResponseInfo(
+            status=response.status_code,
+            bytes_in=None if stream else _bytes_read(response),
+            bytes_out=len(body) if isinstance(body, (bytes, str)) else None,
+            dns=None,
+            connect=None,
+            ttfb=response.elapsed.total_seconds(),
+            total=trace.elapsed(),
+            decode=None,
+            compression=compression
+        )
+        response._evclient_trace = trace
+
+    def _pop_trace(self, response: Response) -> Optional[RequestTrace]:
+        return response.__dict__.pop('_evclient_trace', None)
+
+    def _finish_trace(self, trace: Optional[RequestTrace], **changes: Any) -> None:
+        """Calls the on_response hooks, `changes` replace fields of the recorded :class:`.ResponseInfo`"""
+        if trace is not None:
+            self._call_hooks('on_response', trace.request, trace.response._replace(**changes))
+
+    def _trace_error(self, trace: Optional[RequestTrace], error: BaseException) -> None:
+        if trace is not None:
+            self._call_hooks('on_error', trace.request, error, trace.elapsed())
+
+    def _trace_retry(self, trace: Optional[RequestTrace], delay: float) -> None:
+        if trace is not None:
+            self._call_hooks('on_retry', trace.request, delay)
+
+    def _get_retry_delay(self,
+                         method: str,
+                         attempt: int,
+                         started: float,
+                         status_code: Optional[int] = None,
+                         retry_after: Optional[str] = None
+                         ) -> Optional[float]:
+        if self._retry_policy is None:
+            return None
+        return self._retry_policy.get_delay(method, attempt, time.monotonic() - started, status_code, retry_after)
+
+    @typechecked
+    def _decode_content(self, content: bytes, content_type: Optional[str]) -> Optional[Any]:
+        if content_type == 'application/yaml':
+            import yaml
+
             try:
-                return yaml.safe_load(response.text)
+                return yaml.safe_load(content)
             except yaml.YAMLError:
-                return response.content or None
+                return content or None
         try:
-            return response.json()
-        except json.decoder.JSONDecodeError:
-            return response.content or None
+            return self._json_codec.loads(content)
+        except ValueError:
+            return content or None
 
-    @beartype
+    @typechecked
+    def _handle_successful_response(self, response: Response) -> Optional[Any]:
+        return self._decode_content(response.content, response.headers.get('content-type'))
+
+    def _log_request(self, url: Any, status_code: int, body: Any = None) -> None:
+        """Logs a request at debug level, callers check that debug logging is enabled first"""
+        if self._log_bodies:
+            logger.debug(
+                'API Request sent:\nUrl: %s\nBody: %s\nStatus Code: %s',
+                url, _truncate_body(body, self._log_body_limit), status_code
+            )
+        else:
+            logger.debug('API Request sent:\nUrl: %s\nStatus Code: %s', url, status_code)
+
+    def _raise_for_status(self, status_code: int, content: bytes, content_type: Optional[str]) -> None:
+        """Raise the exception mapped to an unsuccessful status code, with the error message of the body if any"""
+        if status_code < 400:
+            return
+        if status_code >= 500:
+            raise EVInternalServerException
+        msg = None
+        if content_type == 'application/json':
+            try:
+                msg = self._json_codec.loads(content).get('error')
+            except (ValueError, AttributeError):
+                pass
+        exception = self.responses.get(status_code, EVUnexpectedStatusCodeException)
+        raise exception(msg)
+
+    @typechecked
     def _process_response(self, response: Response) -> Optional[Any]:
         """Process the response from EnergyView API
 
@@ -134,23 +407,29 @@ class BaseClient:
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        logger.debug(
-            f'API Request sent:\n'
-            f'Url: {response.request.url}\n'
-            f'Body: {response.request.body}\n'
-            f'Status Code: {response.status_code}'
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_request(response.request.url, response.status_code, response.request.body)
 
+        trace = self._pop_trace(response)
         if response.status_code < 400:
-            return self._handle_successful_response(response)
-        elif 400 <= response.status_code < 500:
-            msg = None
-            try:
-                if response.headers.get("content-type") == "application/json":
-                    msg = response.json().get("error")
-            except json.decoder.JSONDecodeError:
-                pass
-            exception = self.responses.get(response.status_code, EVUnexpectedStatusCodeException)
-            raise exception(msg)
-        else:
-            raise EVInternalServerException
+            decode_started = time.perf_counter()
+            result = self._handle_successful_response(response)
+            self._finish_trace(trace, decode=time.perf_counter() - decode_started)
+            return result
+        self._finish_trace(trace)
+        self._raise_for_status(response.status_code, response.content, response.headers.get('content-type'))
+
+
+def _truncate_body(body: Any, limit: int) -> Any:
+    """Shortens a request body for logging, only the logged part is copied"""
+    if not isinstance(body, (str, bytes)) or len(body) <= limit:
+        return body
+    return f'{body[:limit]!s}... ({len(body)} in total)'
+
+
+def _bytes_read(response: Response) -> Optional[int]:
+    """Number of body bytes read from the connection, before content decoding"""
+    try:
+        return response.raw.tell()
+    except (AttributeError, OSError):
+        return None
@@ -0,0 +1,148 @@
+import datetime
+from array import array
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
+
+from .timestamps import parse_timestamp, parse_timestamps
+from .types.timeseries_types import TimeseriesGroup, TimeseriesResponseGroup
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy
+
+EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+_NOT_IMPORTED = object()
+
+Column = Union[array, 'numpy.ndarray']
+
+
+class TimeseriesColumns:
+    """Timeseries data of a single node and tag, stored as two contiguous columns
+
+    Uses a fraction of the memory of a list of :class:`.TimeseriesData` dicts. The columns are NumPy arrays if NumPy
+    is installed, else :class:`array.array`, both support the buffer protocol.
+
+    Attributes:
+        node_id: Domain-unique identifier for the node.
+        tag: Name of the sensor for which the data belongs.
+        ts: Timestamps as int64 nanoseconds since the Unix epoch.
+        v: Values as float64, missing values are NaN.
+    """
+    __slots__ = ('node_id', 'tag', 'ts', 'v')
+
+    def __init__(self, node_id: int, tag: str, ts: Column, v: Column) -> None:
+        self.node_id: int = node_id
+        self.tag: str = tag
+        self.ts: Column = ts
+        self.v: Column = v
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def __repr__(self) -> str:
+        return f'TimeseriesColumns(node_id={self.node_id!r}, tag={self.tag!r}, points={len(self)})'
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, TimeseriesColumns):
+            return NotImplemented
+        return (self.node_id, self.tag, list(self.ts)) == (other.node_id, other.tag, list(other.ts)) and \
+            _same_values(self.v, other.v)
+
+    @classmethod
+    def from_response_group(cls, group: TimeseriesResponseGroup) -> 'TimeseriesColumns':
+        """Builds columns from a timeseries group as returned by EnergyView API, with string or epoch timestamps"""
+        rows = group.get('data', [])
+        nan = float('nan')
+        v = _to_column(array('d', [nan if row.get('v') is None else row.get('v') for row in rows]))
+        if rows and not isinstance(rows[0].get('ts'), str):
+            ts = epoch_to_ns([row['ts'] for row in rows])
+        else:
+            timestamps = parse_timestamps([row.get('ts') for row in rows])
+            ts = _to_column(array('q', [timestamp_to_ns(ts) for ts in timestamps]))
+        return cls(group.get('node_id'), group.get('tag'), ts, v)
+
+    @classmethod
+    def concatenate(cls, parts: List['TimeseriesColumns']) -> 'TimeseriesColumns':
+        """Concatenates the columns of several parts of the same node and tag, in the given order"""
+        numpy = get_numpy()
+        if numpy is not None:
+            ts = numpy.concatenate([part.ts for part in parts])
+            v = numpy.concatenate([part.v for part in parts])
+        else:
+            ts = array('q')
+            v = array('d')
+            for part in parts:
+                ts.extend(part.ts)
+                v.extend(part.v)
+        return cls(parts[0].node_id, parts[0].tag, ts, v)
+
+    def to_group(self, tz: Optional[datetime.tzinfo] = datetime.timezone.utc) -> TimeseriesGroup:
+        """Converts the columns to the dict shape returned by :meth:`.TimeseriesClient.get_timeseries_data`
+
+        Args:
+            tz (Optional[datetime.tzinfo]): Time zone of the returned timestamps. The original UTC offsets of the
+                response are not kept. Defaults to UTC.
+        """
+        return {
+            'node_id': self.node_id,
+            'tag': self.tag,
+            'data': [
+                {'ts': ns_to_datetime(ts, tz), 'v': None if v != v else v}
+                for ts, v in zip(self.ts.tolist(), self.v.tolist())
+            ]
+        }
+
+
+def timestamp_to_ns(ts: Union[str, int, float, datetime.datetime]) -> int:
+    """Converts an RFC3339 string, epoch seconds or datetime to nanoseconds since the Unix epoch"""
+    if isinstance(ts, str):
+        ts = parse_timestamp(ts)
+    if isinstance(ts, datetime.datetime):
+        return (ts - EPOCH_UTC) // _MICROSECOND * 1000
+    return round(ts * 1000000) * 1000
+
+
+def epoch_to_ns(timestamps: List[Union[int, float]]) -> Column:
+    """Converts Unix timestamps in seconds to a column of nanoseconds, vectorised if NumPy is installed"""
+    numpy = get_numpy()
+    if numpy is None:
+        return array('q', [round(ts * 1000000) * 1000 for ts in timestamps])
+    return numpy.rint(numpy.asarray(timestamps, dtype=numpy.float64) * 1e6).astype(numpy.int64) * 1000
+
+
+def ns_to_datetime(ns: int, tz: Optional[datetime.tzinfo] = datetime.timezone.utc) -> datetime.datetime:
+    """Converts nanoseconds since the Unix epoch to a datetime with microsecond precision"""
+    return (EPOCH_UTC + datetime.timedelta(microseconds=ns // 1000)).astimezone(tz)
+
+
+def get_numpy() -> Any:
+    """Returns the numpy module, None if it is not installed
+
+    NumPy is slow to import, so it is imported on first use rather than with evclient.
+    """
+    numpy = globals().get('numpy', _NOT_IMPORTED)
+    if numpy is _NOT_IMPORTED:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover
+            numpy = None
+        globals()['numpy'] = numpy
+    return numpy
+
+
+def __getattr__(name: str) -> Any:
+    if name == 'numpy':
+        return get_numpy()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _to_column(values: array) -> Column:
+    numpy = get_numpy()
+    if numpy is None:
+        return values
+    return numpy.frombuffer(values, dtype=numpy.int64 if values.typecode == 'q' else numpy.float64)
+
+
+def _same_values(a: Iterable[float], b: Iterable[float]) -> bool:
+    a = list(a)
+    b = list(b)
+    return len(a) == len(b) and all(x == y or (x != x and y != y) for x, y in zip(a, b))
@@ -0,0 +1,76 @@
+import time
+import zlib
+from typing import Any, NamedTuple, Optional, Tuple
+from urllib.parse import urlencode
+
+# zlib window bits of the gzip and zlib (HTTP "deflate") containers.
+ENCODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+# Status code of a server that does not accept the Content-Encoding. Only taken as a rejection while probing.
+REJECTED_STATUS_CODE = 415
+# A 400 is only taken as a rejection when its body names the encoding, otherwise the request itself was wrong.
+_ENCODING_ERROR_WORDS = (b'encoding', b'compress', b'gzip', b'deflate')
+
+
+class CompressionStats(NamedTuple):
+    """
+    Attributes:
+        encoding: The Content-Encoding of the request, gzip or deflate.
+        original_size: Size of the body in bytes before compression.
+        compressed_size: Size of the body in bytes as sent.
+        seconds: Time spent compressing.
+    """
+    encoding: str
+    original_size: int
+    compressed_size: int
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        """Original size divided by compressed size"""
+        return self.original_size / self.compressed_size if self.compressed_size else 1.0
+
+
+def encode_body(data: Any) -> Optional[bytes]:
+    """Returns a request body as bytes, None if it is not a plain or form-encoded body
+
+    Dicts are form-encoded like :mod:`requests` does, leaving out None values. Bodies with files or other streams
+    are not handled.
+    """
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, str):
+        return data.encode('utf-8')
+    if isinstance(data, dict) and all(isinstance(v, (str, bytes, int, float)) or v is None for v in data.values()):
+        return urlencode([(k, v) for k, v in data.items() if v is not None]).encode('utf-8')
+    return None
+
+
+def is_rejected(status_code: int, content: bytes) -> bool:
+    """Returns whether a response tells that the server could not read a compressed request body"""
+    if status_code == REJECTED_STATUS_CODE:
+        return True
+    if status_code != 400 or not content:
+        return False
+    content = content.lower()
+    return any(word in content for word in _ENCODING_ERROR_WORDS)
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> Tuple[bytes, CompressionStats]:
+    """Compresses a request body
+
+    Args:
+        body (bytes): The body to compress.
+        encoding (str): gzip or deflate.
+        level (int): zlib compression level, 1 is fastest and 9 is smallest.
+
+    Returns:
+        The compressed body and its :class:`CompressionStats`.
+    """
+    started = time.perf_counter()
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    compressed = compressor.compress(body) + compressor.flush()
+    return compressed, CompressionStats(encoding, len(body), len(compressed), time.perf_counter() - started)
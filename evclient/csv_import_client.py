@@ -1,33 +1,32 @@
-from warnings import filterwarnings
 from typing import TextIO, Optional
 
 import requests
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 
+from .typecheck import typechecked
 from .types.csv_import_types import CSVImportResponse
 from .base_client import BaseClient
 
-
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 Response = requests.models.Response
 
+_CSV_IMPORT_API_PATH: str = 'csvimport'
+
 
 class CSVImportClient(BaseClient):
     """
     A client for handling the csv import section of EnergyView API.
     """
 
-    @beartype
+    @typechecked
     def __init__(self,
                  domain: Optional[str] = None,
                  api_key: Optional[str] = None,
-                 endpoint_url: Optional[str] = None
+                 endpoint_url: Optional[str] = None,
+                 **kwargs
                  ) -> None:
-        super().__init__(domain, api_key, endpoint_url)
-        self._csv_import_api_path: str = 'csvimport'
+        super().__init__(domain, api_key, endpoint_url, **kwargs)
+        self._csv_import_api_path: str = _CSV_IMPORT_API_PATH
 
-    @beartype
+    @typechecked
     def get_csv_imports(self) -> CSVImportResponse:
         """Fetches all existing csv import definitions from EnergyView API
 
@@ -43,7 +42,8 @@ class CSVImportClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.get(
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._csv_import_api_path}'
         )
         return self._process_response(response)
@@ -65,7 +65,8 @@ class CSVImportClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.post(
+        response: Response = self._request(
+            'POST',
             url=f'{self._url}/{self._csv_import_api_path}/{import_uuid}',
             files={'file': csv_file}
         )
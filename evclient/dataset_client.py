@@ -1,33 +1,38 @@
-from warnings import filterwarnings
-from typing import List, Any, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Deque, Iterator, List, Any, Dict, Optional
 
 import requests
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 
+from .typecheck import typechecked
 from .types.dataset_types import DatasetType
 from .base_client import BaseClient
 from .utils import filter_none_values_from_dict
 
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 Response = requests.models.Response
 
+_DATASET_API_PATH: str = 'dataset'
+
+# The API returns at most 100 datasets per page.
+MAX_DATASETS_PER_PAGE: int = 100
+
 
 class DatasetClient(BaseClient):
     """
     A client for handling the dataset section of EnergyView API.
     """
 
-    @beartype
+    @typechecked
     def __init__(self,
                  domain: Optional[str] = None,
                  api_key: Optional[str] = None,
-                 endpoint_url: Optional[str] = None
+                 endpoint_url: Optional[str] = None,
+                 **kwargs
                  ) -> None:
-        super().__init__(domain, api_key, endpoint_url)
-        self._dataset_api_path: str = 'dataset'
+        super().__init__(domain, api_key, endpoint_url, **kwargs)
+        self._dataset_api_path: str = _DATASET_API_PATH
 
-    @beartype
+    @typechecked
     def get_datasets(self,
                      offset: Optional[int] = None,
                      limit: Optional[int] = None
@@ -51,16 +56,82 @@ class DatasetClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.get(
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._dataset_api_path}',
-            params=filter_none_values_from_dict({
-                'offset': offset,
-                'limit': limit
-            })
+            params=_datasets_query_params(offset, limit)
         )
         return self._process_response(response)
 
-    @beartype
+    @typechecked
+    def iter_datasets(self,
+                      tags: Optional[List[str]] = None,
+                      thing_uuid: Optional[str] = None,
+                      page_size: int = MAX_DATASETS_PER_PAGE,
+                      prefetch: int = 2
+                      ) -> Iterator[DatasetType]:
+        """Fetches all datasets from EnergyView API, one page at a time
+
+        While a page is consumed, the next `prefetch` pages are fetched in parallel, within the domain rate limit.
+        Paging stops at the first page with fewer than `page_size` datasets, up to `prefetch` requests for pages past
+        the end may already have been sent by then. Pages are read by offset, datasets created or deleted during the
+        iteration may be skipped or returned twice.
+
+        Example::
+
+            for dataset in client.iter_datasets(tags=['forecast']):
+                print(dataset['name'])
+
+        Args:
+            tags (Optional[List[str]]): Only yield datasets with all of these tags.
+            thing_uuid (Optional[str]): Only yield datasets bound to the Node/Thing with this UUID.
+            page_size (int): Number of datasets per request, between 1 and 100.
+            prefetch (int): Number of pages to fetch ahead of the one being consumed. 0 fetches one page at a time.
+
+        Yields:
+            :class:`.DatasetType` in the order returned by the API.
+
+        Raises:
+            ValueError: `page_size` is not between 1 and 100, or `prefetch` is negative.
+            :class:`.EVUnexpectedStatusCodeException`: Unexpected status code received.
+            :class:`.EVBadRequestException`: Sent request had insufficient data or invalid options.
+            :class:`.EVUnauthorizedException`: Request was refused due to lacking authentication credentials.
+            :class:`.EVForbiddenException`: Server understands the request but refuses to authorize it.
+            :class:`.EVTooManyRequestsException`: Sent too many requests in a given amount of time.
+            :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
+                from fulfilling the request.
+        """
+        if not 1 <= page_size <= MAX_DATASETS_PER_PAGE:
+            raise ValueError(f'page_size must be between 1 and {MAX_DATASETS_PER_PAGE}')
+        if prefetch < 0:
+            raise ValueError('prefetch must not be negative')
+        return self._iter_dataset_pages(tags, thing_uuid, page_size, prefetch)
+
+    def _iter_dataset_pages(self,
+                            tags: Optional[List[str]],
+                            thing_uuid: Optional[str],
+                            page_size: int,
+                            prefetch: int
+                            ) -> Iterator[DatasetType]:
+        with ThreadPoolExecutor(max_workers=prefetch + 1) as executor:
+            pages: Deque[Future] = deque()
+            offset = 0
+            try:
+                while True:
+                    while len(pages) <= prefetch:
+                        pages.append(executor.submit(self.get_datasets, offset, page_size))
+                        offset += page_size
+                    page: List[DatasetType] = pages.popleft().result() or []
+                    for dataset in page:
+                        if _dataset_matches(dataset, tags, thing_uuid):
+                            yield dataset
+                    if len(page) < page_size:
+                        return
+            finally:
+                for future in pages:
+                    future.cancel()
+
+    @typechecked
     def create_dataset(self,
                        content: str,
                        dataset_format: str,
@@ -90,19 +161,14 @@ class DatasetClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.post(
+        response: Response = self._request(
+            'POST',
             url=f'{self._url}/{self._dataset_api_path}',
-            json=filter_none_values_from_dict({
-                'content': content,
-                'format': dataset_format,
-                'name': name,
-                'tags': tags,
-                'thing_uuid': thing_uuid
-            })
+            json=_dataset_body(content, dataset_format, name, tags, thing_uuid)
         )
         return self._process_response(response)
 
-    @beartype
+    @typechecked
     def get_dataset(self, dataset_uuid: str) -> DatasetType:
         """Fetches a specific dataset from EnergyView API by uuid
 
@@ -122,12 +188,13 @@ class DatasetClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.get(
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._dataset_api_path}/{dataset_uuid}'
         )
         return self._process_response(response)
 
-    @beartype
+    @typechecked
     def get_dataset_content(self, dataset_uuid: str) -> Any:
         """Fetches the raw content of a specific dataset from EnergyView API
 
@@ -157,12 +224,13 @@ class DatasetClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.get(
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._dataset_api_path}/{dataset_uuid}/raw'
         )
         return self._process_response(response)
 
-    @beartype
+    @typechecked
     def update_dataset(self,
                        dataset_uuid: str,
                        content: Optional[str] = None,
@@ -191,19 +259,14 @@ class DatasetClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.put(
+        response: Response = self._request(
+            'PUT',
             url=f'{self._url}/{self._dataset_api_path}/{dataset_uuid}',
-            json=filter_none_values_from_dict({
-                'content': content,
-                'format': dataset_format,
-                'name': name,
-                'tags': tags,
-                'thing_uuid': thing_uuid
-            })
+            json=_dataset_body(content, dataset_format, name, tags, thing_uuid)
         )
         return self._process_response(response)
 
-    @beartype
+    @typechecked
     def delete_dataset(self, dataset_uuid: str) -> None:
         """Deletes a specific dataset from EnergyView API by uuid
 
@@ -220,7 +283,36 @@ class DatasetClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.delete(
+        response: Response = self._request(
+            'DELETE',
             url=f'{self._url}/{self._dataset_api_path}/{dataset_uuid}'
         )
         return self._process_response(response)
+
+
+def _datasets_query_params(offset: Optional[int], limit: Optional[int]) -> Dict[str, Any]:
+    return filter_none_values_from_dict({
+        'offset': offset,
+        'limit': limit
+    })
+
+
+def _dataset_body(content: Optional[str],
+                  dataset_format: Optional[str],
+                  name: Optional[str],
+                  tags: Optional[List[str]],
+                  thing_uuid: Optional[str]
+                  ) -> Dict[str, Any]:
+    return filter_none_values_from_dict({
+        'content': content,
+        'format': dataset_format,
+        'name': name,
+        'tags': tags,
+        'thing_uuid': thing_uuid
+    })
+
+
+def _dataset_matches(dataset: DatasetType, tags: Optional[List[str]], thing_uuid: Optional[str]) -> bool:
+    if thing_uuid is not None and dataset.get('thing_uuid') != thing_uuid:
+        return False
+    return not tags or all(tag in (dataset.get('tags') or []) for tag in tags)
@@ -0,0 +1,230 @@
+import bisect
+import re
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .compression import CompressionStats
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments that identify a single resource: numeric ids and uuids.
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F]{8}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{4}-?[0-9a-fA-F]{12})$')
+
+
+class RequestInfo(NamedTuple):
+    """
+    Attributes:
+        method: The HTTP method.
+        path: The endpoint path below the API root, with ids replaced by {id}, such as settings/node/{id}.
+        url: The full request url, without query parameters.
+        attempt: 0 for the first attempt, else the number of the retry.
+    """
+    method: str
+    path: str
+    url: str
+    attempt: int
+
+
+class ResponseInfo(NamedTuple):
+    """
+    Attributes:
+        status: The response status code.
+        bytes_in: Size of the response body, None if unknown.
+        bytes_out: Size of the request body, None if unknown.
+        dns: Seconds spent resolving the host name, None if no lookup was made or it was not measured.
+        connect: Seconds spent opening the connection, TLS included, None if a pooled connection was used or it was
+            not measured.
+        ttfb: Seconds from sending the request until the response headers arrived.
+        total: Seconds from sending the request until the response body was read.
+        decode: Seconds spent decoding the body, None if it was not decoded.
+        compression: Size, ratio and time of the compression of the request body, None if it was sent uncompressed.
+    """
+    status: int
+    bytes_in: Optional[int]
+    bytes_out: Optional[int]
+    dns: Optional[float]
+    connect: Optional[float]
+    ttfb: Optional[float]
+    total: float
+    decode: Optional[float]
+    compression: Optional[CompressionStats] = None
+
+
+class RequestHooks:
+    """Receives the requests made by a client, pass instances with the `hooks` argument of :class:`.BaseClient`
+
+    Every method does nothing by default, override the ones you need. Hooks are called on the thread making the
+    request, so they should be fast and thread-safe. Exceptions raised by hooks are logged and otherwise ignored.
+
+    Every attempt starts with :meth:`on_request_start` and ends with either :meth:`on_response` or
+    :meth:`on_error`, followed by :meth:`on_retry` if the attempt is retried.
+    """
+
+    def on_request_start(self, request: RequestInfo) -> None:
+        """Called before an attempt is sent, after waiting for the rate limiter"""
+
+    def on_response(self, request: RequestInfo, response: ResponseInfo) -> None:
+        """Called when a response has been received, and decoded if it was not retried"""
+
+    def on_error(self, request: RequestInfo, error: BaseException, total: float) -> None:
+        """Called when an attempt failed without a response, such as a connection error or timeout"""
+
+    def on_retry(self, request: RequestInfo, delay: float) -> None:
+        """Called when the attempt will be retried after `delay` seconds"""
+
+
+class EndpointMetrics:
+    """Counters and a latency histogram of a single endpoint, see :class:`MetricsCollector`"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets: Tuple[float, ...] = tuple(buckets)
+        self.requests: int = 0
+        self.responses: int = 0
+        self.errors: int = 0
+        self.retries: int = 0
+        self.status_codes: Dict[int, int] = {}
+        self.bytes_in: int = 0
+        self.bytes_out: int = 0
+        # One count per bucket upper bound, the last one counts latencies above the largest bound.
+        self.latency_counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.latency_sum: float = 0.0
+        self.latency_max: float = 0.0
+        self.ttfb_sum: float = 0.0
+        self.decode_sum: float = 0.0
+
+    def observe(self, response: ResponseInfo) -> None:
+        """Counts a response"""
+        self.responses += 1
+        self.status_codes[response.status] = self.status_codes.get(response.status, 0) + 1
+        self.bytes_in += response.bytes_in or 0
+        self.bytes_out += response.bytes_out or 0
+        self.latency_counts[bisect.bisect_left(self.buckets, response.total)] += 1
+        self.latency_sum += response.total
+        self.latency_max = max(self.latency_max, response.total)
+        self.ttfb_sum += response.ttfb or 0.0
+        self.decode_sum += response.decode or 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates a latency quantile in seconds as the upper bound of the bucket it falls in
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            The estimate, at most the largest latency seen, or None if there were no responses.
+        """
+        if not self.responses:
+            return None
+        rank = q * self.responses
+        seen = 0
+        for bound, count in zip(self.buckets, self.latency_counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the counters, the latency histogram and the 50th, 95th and 99th latency percentiles"""
+        return {
+            'requests': self.requests,
+            'responses': self.responses,
+            'errors': self.errors,
+            'retries': self.retries,
+            'status_codes': dict(self.status_codes),
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'latency_sum': self.latency_sum,
+            'latency_max': self.latency_max,
+            'ttfb_sum': self.ttfb_sum,
+            'decode_sum': self.decode_sum,
+            'histogram': dict(zip(self.buckets + (float('inf'),), self.latency_counts)),
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+        }
+
+
+class MetricsCollector(RequestHooks):
+    """Keeps request counters and latency histograms per endpoint in memory
+
+    Example::
+
+        metrics = MetricsCollector()
+        client = EVClient(hooks=[metrics])
+        ...
+        for endpoint, stats in metrics.snapshot().items():
+            print(endpoint, stats['responses'], stats['p95'])
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        """
+        Args:
+            buckets (Sequence[float]): Ascending upper bounds in seconds of the latency histogram buckets.
+        """
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+
+    def _endpoint(self, request: RequestInfo) -> EndpointMetrics:
+        key = f'{request.method} {request.path}'
+        metrics = self._endpoints.get(key)
+        if metrics is None:
+            metrics = self._endpoints[key] = EndpointMetrics(self.buckets)
+        return metrics
+
+    def on_request_start(self, request: RequestInfo) -> None:
+        with self._lock:
+            self._endpoint(request).requests += 1
+
+    def on_response(self, request: RequestInfo, response: ResponseInfo) -> None:
+        with self._lock:
+            self._endpoint(request).observe(response)
+
+    def on_error(self, request: RequestInfo, error: BaseException, total: float) -> None:
+        with self._lock:
+            self._endpoint(request).errors += 1
+
+    def on_retry(self, request: RequestInfo, delay: float) -> None:
+        with self._lock:
+            self._endpoint(request).retries += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the metrics of every endpoint by "METHOD path", see :meth:`EndpointMetrics.to_dict`"""
+        with self._lock:
+            return {key: metrics.to_dict() for key, metrics in sorted(self._endpoints.items())}
+
+    def reset(self) -> None:
+        """Drops all metrics"""
+        with self._lock:
+            self._endpoints.clear()
+
+
+class RequestTrace:
+    """The timings of a single attempt while it is in flight, used by the clients to call the hooks"""
+
+    __slots__ = ('request', 'started', 'marks', 'response')
+
+    def __init__(self, request: RequestInfo) -> None:
+        self.request: RequestInfo = request
+        self.started: float = time.perf_counter()
+        # time.perf_counter() of connection events, filled in by the transport if it reports them.
+        self.marks: Dict[str, float] = {}
+        self.response: Optional[ResponseInfo] = None
+
+    def elapsed(self) -> float:
+        """Seconds since the attempt was sent"""
+        return time.perf_counter() - self.started
+
+    def span(self, start: str, end: str) -> Optional[float]:
+        """Seconds between two marks, None if either is missing"""
+        if start not in self.marks or end not in self.marks:
+            return None
+        return self.marks[end] - self.marks[start]
+
+
+def endpoint_path(url: str, api_url: str) -> str:
+    """Returns the path of `url` below `api_url`, with ids replaced by {id} so that paths group by endpoint"""
+    path = url[len(api_url):] if url.startswith(api_url) else url
+    path = path.split('?', 1)[0].strip('/')
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
@@ -0,0 +1,89 @@
+import json
+import os
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JSONCodec:
+    """Encodes request bodies and decodes response bodies with the standard library :mod:`json` module
+
+    Every client holds a codec, see :attr:`.BaseClient.json_codec`. Subclasses plug in faster JSON libraries.
+    """
+
+    name: str = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encodes `obj` as UTF-8 JSON
+
+        Raises:
+            TypeError: `obj` holds a value that can not be encoded.
+        """
+        return json.dumps(obj).encode('utf-8')
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        """Decodes a JSON document
+
+        Raises:
+            ValueError: `content` is not valid JSON.
+        """
+        return json.loads(content)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+
+class OrjsonCodec(JSONCodec):
+    """A codec using `orjson <https://github.com/ijl/orjson>`_, which is several times faster than :mod:`json`
+
+    orjson is an optional dependency, install it with ``pip install orjson``. Documents orjson does not handle, such as
+    integers beyond 64 bits or NaN literals, fall back to :mod:`json`, so both codecs accept the same input.
+    """
+
+    name: str = 'orjson'
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError('OrjsonCodec requires orjson, install it with: pip install orjson')
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, content: Union[bytes, str]) -> Any:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return super().loads(content)
+
+
+CODECS = {
+    JSONCodec.name: JSONCodec,
+    OrjsonCodec.name: OrjsonCodec,
+}
+
+
+def get_json_codec(codec: Optional[Union[str, JSONCodec]] = None) -> JSONCodec:
+    """Returns the JSON codec for a client
+
+    Args:
+        codec (Optional[Union[str, JSONCodec]]): A codec, or the name of one: 'json' or 'orjson'. Defaults to the
+            EV_JSON_CODEC environment variable, else to the fastest installed codec.
+
+    Raises:
+        ValueError: Unknown codec name.
+        ImportError: The library of the codec is not installed.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    name = codec or os.environ.get('EV_JSON_CODEC')
+    if name is None:
+        return OrjsonCodec() if orjson is not None else JSONCodec()
+    if name not in CODECS:
+        raise ValueError(f'Unknown JSON codec {name!r}, expected one of {", ".join(CODECS)}')
+    return CODECS[name]()
@@ -0,0 +1,192 @@
+import codecs
+import json
+import re
+from typing import Any, Callable, Iterable, Iterator, List, Tuple, Union
+
+# Consumed text is dropped from the buffer once this many characters have been read.
+_COMPACT_SIZE = 1 << 16
+_WHITESPACE = ' \t\n\r'
+
+
+class _Reader:
+    """A text buffer over an iterable of chunks, decoding one JSON value at a time"""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]], loads: Callable[[str], Any] = json.loads) -> None:
+        self._chunks = iter(chunks)
+        self._loads = loads
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer: str = ''
+        self._pos: int = 0
+        self._eof: bool = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        if self._pos > _COMPACT_SIZE:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """Returns the next non-whitespace character without consuming it, an empty string at the end"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars: str) -> str:
+        """Consumes the next non-whitespace character, which must be one of `chars`"""
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(f'Expecting one of {chars!r}', self._buffer, self._pos)
+        self._pos += 1
+        return char
+
+    def items(self) -> List[Any]:
+        """Decodes the array items in the buffer that are followed by a separator
+
+        The last item of the array or of the buffer is left to :meth:`value`.
+        """
+        self.peek()
+        buffer = self._buffer
+        # Objects are usually separated by '},', try to decode everything up to the last one in a single call. The
+        # prefix only decodes as an array if that '}' closes an item, else the items are decoded one by one.
+        cut = buffer.rfind('},', self._pos)
+        if cut != -1:
+            try:
+                items = self._loads('[' + buffer[self._pos:cut + 1] + ']')
+            except json.JSONDecodeError:
+                pass
+            else:
+                self._pos = cut + 2
+                return items
+
+        raw_decode = self._json.raw_decode
+        match = _SEPARATOR.match
+        items = []
+        append = items.append
+        pos = self._pos
+        try:
+            while True:
+                value, end = raw_decode(buffer, pos)
+                separator = match(buffer, end)
+                if separator is None or separator.end() == len(buffer):
+                    break
+                pos = separator.end()
+                append(value)
+        except json.JSONDecodeError:
+            pass
+        self._pos = pos
+        return items
+
+    def value(self) -> Any:
+        """Decodes the next complete JSON value"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the buffer may continue in the next chunk.
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return value
+
+
+_SEPARATOR = re.compile(r'[ \t\n\r]*,[ \t\n\r]*')
+
+
+def iter_timeseries_events(chunks: Iterable[Union[bytes, str]],
+                           loads: Callable[[str], Any] = json.loads
+                           ) -> Iterator[Tuple[str, Any]]:
+    """Incrementally parses a timeseries response body as it is read
+
+    Data points are decoded as the chunks arrive, so the body never has to be held in memory as a whole, neither as
+    text nor as an object tree.
+
+    Args:
+        chunks (Iterable[Union[bytes, str]]): The response body in chunks, such as
+            :meth:`requests.Response.iter_content`.
+        loads (Callable[[str], Any]): Decodes the points that are complete in the buffer, such as
+            :meth:`.JSONCodec.loads`. Must raise :class:`json.JSONDecodeError` on invalid input.
+
+    Yields:
+        Tuples of event and value, for each group in the `timeseries` array:
+
+        -   ('start', None) when a group starts.
+
+        -   ('field', (key, value)) for each member of the group other than `data`, such as `node_id` and `tag`.
+
+        -   ('data', points) for consecutive points in the `data` array of the group, a list of
+            :class:`.TimeseriesResponseData` with as many points as were decoded from the chunks read so far.
+
+        -   ('end', None) when the group ends.
+
+    Raises:
+        json.JSONDecodeError: The body is not valid JSON.
+    """
+    reader = _Reader(chunks, loads)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        key = reader.value()
+        reader.expect(':')
+        if key == 'timeseries' and reader.peek() == '[':
+            yield from _iter_groups(reader)
+        else:
+            reader.value()
+        if reader.expect(',}') == '}':
+            return
+
+
+def _iter_groups(reader: _Reader) -> Iterator[Tuple[str, Any]]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.expect(']')
+        return
+    while True:
+        reader.expect('{')
+        yield 'start', None
+        if reader.peek() != '}':
+            while True:
+                key = reader.value()
+                reader.expect(':')
+                if key == 'data' and reader.peek() == '[':
+                    yield from _iter_array(reader, 'data')
+                else:
+                    yield 'field', (key, reader.value())
+                if reader.expect(',}') == '}':
+                    break
+        else:
+            reader.expect('}')
+        yield 'end', None
+        if reader.expect(',]') == ']':
+            return
+
+
+def _iter_array(reader: _Reader, event: str) -> Iterator[Tuple[str, List[Any]]]:
+    reader.expect('[')
+    if reader.peek() == ']':
+        reader.expect(']')
+        return
+    while True:
+        # Items are decoded in bulk while the buffer holds them, the reader handles items split between chunks.
+        items = reader.items()
+        items.append(reader.value())
+        yield event, items
+        if reader.expect(',]') == ']':
+            return
@@ -0,0 +1,248 @@
+import logging
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from .types.node_types import NodeType
+
+logger = logging.getLogger(__name__)
+
+
+class Node:
+    """A node of :class:`NodeCatalog`, with the fields of :class:`.NodeType` as attributes
+
+    Nodes use `__slots__` and share the strings that repeat between nodes, they take a fraction of the memory of the
+    response dicts. The device is flattened into `device_id`, `device_name` and `protocol_id`.
+    """
+
+    __slots__ = (
+        'id', 'uuid', 'name', 'description', 'public', 'owner', 'enabled', 'archived', 'representation',
+        'device_id', 'device_name', 'protocol_id', 'sensor_ids', 'interval'
+    )
+
+    def __init__(self,
+                 id: int,
+                 uuid: str,
+                 name: str,
+                 description: str = '',
+                 public: bool = False,
+                 owner: bool = False,
+                 enabled: bool = True,
+                 archived: bool = False,
+                 representation: Optional[str] = None,
+                 device_id: Optional[int] = None,
+                 device_name: Optional[str] = None,
+                 protocol_id: Optional[int] = None,
+                 sensor_ids: Tuple[int, ...] = (),
+                 interval: Optional[int] = None
+                 ) -> None:
+        self.id: int = id
+        self.uuid: str = uuid
+        self.name: str = name
+        self.description: str = description
+        self.public: bool = public
+        self.owner: bool = owner
+        self.enabled: bool = enabled
+        self.archived: bool = archived
+        self.representation: Optional[str] = representation
+        self.device_id: Optional[int] = device_id
+        self.device_name: Optional[str] = device_name
+        self.protocol_id: Optional[int] = protocol_id
+        self.sensor_ids: Tuple[int, ...] = sensor_ids
+        self.interval: Optional[int] = interval
+
+    @classmethod
+    def from_dict(cls, node: NodeType) -> 'Node':
+        """Creates a node from an item of :meth:`.NodeClient.get_nodes`"""
+        device = node.get('device') or {}
+        return cls(
+            id=node['id'],
+            uuid=node.get('uuid'),
+            name=node.get('name'),
+            description=node.get('description') or '',
+            public=node.get('public', False),
+            owner=node.get('owner', False),
+            enabled=node.get('enabled', True),
+            archived=node.get('archived', False),
+            representation=_intern(node.get('representation')),
+            device_id=device.get('id'),
+            device_name=_intern(device.get('name')),
+            protocol_id=device.get('protocol_id'),
+            sensor_ids=tuple(node.get('sensor_ids') or ()),
+            interval=node.get('interval')
+        )
+
+    def to_dict(self) -> NodeType:
+        """Returns the node as returned by :meth:`.NodeClient.get_nodes`"""
+        return {
+            'id': self.id,
+            'uuid': self.uuid,
+            'name': self.name,
+            'description': self.description,
+            'public': self.public,
+            'owner': self.owner,
+            'enabled': self.enabled,
+            'archived': self.archived,
+            'representation': self.representation,
+            'device': {'id': self.device_id, 'name': self.device_name, 'protocol_id': self.protocol_id},
+            'sensor_ids': list(self.sensor_ids),
+            'interval': self.interval,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f'Node(id={self.id!r}, name={self.name!r}, representation={self.representation!r})'
+
+
+class _Indexes:
+    """An immutable set of indexes over one fetch of the nodes, replaced as a whole on refresh"""
+
+    __slots__ = ('nodes', 'by_id', 'by_uuid', 'by_name', 'by_protocol_id', 'by_representation', 'by_sensor_id',
+                 'loaded_at')
+
+    def __init__(self, nodes: List[Node], loaded_at: float) -> None:
+        self.nodes: Tuple[Node, ...] = tuple(nodes)
+        self.by_id: Dict[int, Node] = {node.id: node for node in nodes}
+        self.by_uuid: Dict[str, Node] = {node.uuid: node for node in nodes}
+        self.by_name = _group(nodes, lambda node: (node.name,))
+        self.by_protocol_id = _group(nodes, lambda node: (node.protocol_id,))
+        self.by_representation = _group(nodes, lambda node: (node.representation,))
+        self.by_sensor_id = _group(nodes, lambda node: node.sensor_ids)
+        self.loaded_at: float = loaded_at
+
+
+class NodeCatalog:
+    """The nodes of a domain, indexed by id, uuid, name, device protocol, representation and sensor id
+
+    Nodes are fetched with :meth:`.NodeClient.get_nodes` on first use. With a `ttl`, a background thread fetches them
+    again every `ttl` seconds. Lookups never wait for a refresh, they see the previous nodes until the new ones are
+    indexed. A failed background refresh is logged and the previous nodes are kept.
+
+    Example::
+
+        with NodeCatalog(client, ttl=600) as catalog:
+            node = catalog.by_id(60)
+            heating = catalog.by_representation('circuit/heat')
+    """
+
+    def __init__(self,
+                 client,
+                 ttl: Optional[float] = 300.0,
+                 clock: Callable[[], float] = time.monotonic
+                 ) -> None:
+        """
+        Args:
+            client (NodeClient): The client used to fetch the nodes, such as an :class:`.EVClient`.
+            ttl (Optional[float]): Seconds between background refreshes. None only refreshes on demand, see
+                :meth:`refresh`.
+            clock (Callable[[], float]): Returns the current time in seconds, used for :attr:`age`.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be positive')
+        self._client = client
+        self.ttl: Optional[float] = ttl
+        self._clock: Callable[[], float] = clock
+        self._indexes: Optional[_Indexes] = None
+        self._refresh_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if ttl is not None:
+            self._thread = threading.Thread(target=self._run, name='NodeCatalog', daemon=True)
+            self._thread.start()
+
+    def __enter__(self) -> 'NodeCatalog':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the background refresh, lookups keep working on the nodes fetched so far"""
+        self._closed.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def refresh(self) -> None:
+        """Fetch and index the nodes now, blocking until done
+
+        Raises:
+            Exception: Any exception raised by :meth:`.NodeClient.get_nodes`, the previous nodes are kept.
+        """
+        with self._refresh_lock:
+            self._load()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the nodes were fetched, None if they have not been fetched yet"""
+        indexes = self._indexes
+        return None if indexes is None else self._clock() - indexes.loaded_at
+
+    def _load(self) -> _Indexes:
+        nodes = [Node.from_dict(node) for node in self._client.get_nodes()]
+        # The indexes are built before they replace the previous ones, so lookups never see a partial catalog.
+        self._indexes = _Indexes(nodes, self._clock())
+        return self._indexes
+
+    def _get_indexes(self) -> _Indexes:
+        indexes = self._indexes
+        if indexes is None:
+            with self._refresh_lock:
+                indexes = self._indexes or self._load()
+        return indexes
+
+    def _run(self) -> None:
+        while not self._closed.wait(self.ttl):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Failed to refresh the node catalog, keeping the previous nodes')
+
+    def __len__(self) -> int:
+        return len(self._get_indexes().nodes)
+
+    def __iter__(self) -> Iterator[Node]:
+        return iter(self._get_indexes().nodes)
+
+    def __contains__(self, node_id: object) -> bool:
+        return node_id in self._get_indexes().by_id
+
+    def by_id(self, node_id: int) -> Optional[Node]:
+        """Returns the node with the domain-unique id, None if there is none"""
+        return self._get_indexes().by_id.get(node_id)
+
+    def by_uuid(self, uuid: str) -> Optional[Node]:
+        """Returns the node with the uuid, None if there is none"""
+        return self._get_indexes().by_uuid.get(uuid)
+
+    def by_name(self, name: str) -> Tuple[Node, ...]:
+        """Returns the nodes with the name, names are not unique"""
+        return self._get_indexes().by_name.get(name, ())
+
+    def by_protocol_id(self, protocol_id: int) -> Tuple[Node, ...]:
+        """Returns the nodes with a device of the protocol"""
+        return self._get_indexes().by_protocol_id.get(protocol_id, ())
+
+    def by_representation(self, representation: str) -> Tuple[Node, ...]:
+        """Returns the nodes with the representation, such as circuit/heat"""
+        return self._get_indexes().by_representation.get(representation, ())
+
+    def by_sensor_id(self, sensor_id: int) -> Tuple[Node, ...]:
+        """Returns the nodes the sensor is attached to"""
+        return self._get_indexes().by_sensor_id.get(sensor_id, ())
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _group(nodes: List[Node], keys: Callable[[Node], Tuple]) -> Dict[object, Tuple[Node, ...]]:
+    groups: Dict[object, List[Node]] = {}
+    for node in nodes:
+        for key in keys(node):
+            groups.setdefault(key, []).append(node)
+    return {key: tuple(group) for key, group in groups.items()}
@@ -1,32 +1,32 @@
-from warnings import filterwarnings
 from typing import List, Optional
 
 import requests
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 
+from .typecheck import typechecked
 from .types.node_types import NodeType, NodeResponse
 from .base_client import BaseClient
 
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 Response = requests.models.Response
 
+_NODE_API_PATH: str = 'nodes'
+
 
 class NodeClient(BaseClient):
     """
     A client for handling the node / collectors section of EnergyView API.
     """
 
-    @beartype
+    @typechecked
     def __init__(self,
                  domain: Optional[str] = None,
                  api_key: Optional[str] = None,
-                 endpoint_url: Optional[str] = None
+                 endpoint_url: Optional[str] = None,
+                 **kwargs
                  ) -> None:
-        super().__init__(domain, api_key, endpoint_url)
-        self._node_api_path: str = 'nodes'
+        super().__init__(domain, api_key, endpoint_url, **kwargs)
+        self._node_api_path: str = _NODE_API_PATH
 
-    @beartype
+    @typechecked
     def get_nodes(self) -> List[NodeType]:
         """Fetches all nodes / collectors from EnergyView API
 
@@ -42,8 +42,12 @@ class NodeClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.get(
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._node_api_path}'
         )
-        response_data: NodeResponse = self._process_response(response)
-        return [] if response_data is None else response_data.get('nodes')
+        return _parse_nodes(self._process_response(response))
+
+
+def _parse_nodes(response_data: Optional[NodeResponse]) -> List[NodeType]:
+    return [] if response_data is None else response_data.get('nodes')
@@ -0,0 +1,161 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+SET_METHODS = frozenset({'POST', 'PUT', 'PATCH', 'DELETE'})
+
+# The API allows 10 requests per second and domain, stay just below it by default.
+DEFAULT_RATE_LIMIT: float = 9.0
+
+
+class TokenBucket:
+    """A thread safe token bucket
+
+    Tokens are refilled at `rate` tokens per second and at most `capacity` tokens can be spent in a burst.
+    The bucket is kept as a theoretical arrival time (GCRA), which lets callers reserve a token ahead of time and
+    sleep outside the lock instead of polling.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 capacity: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic
+                 ) -> None:
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._clock: Callable[[], float] = clock
+        self._interval: float = 1.0 / rate
+        self._tolerance: float = (capacity - 1) * self._interval
+        self._tat: float = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, not_before: Optional[float] = None) -> float:
+        """Reserve one token
+
+        Args:
+            not_before (Optional[float]): Clock time before which the token will not be used.
+
+        Returns:
+            The clock time at which the reserved token may be used.
+        """
+        with self._lock:
+            now = self._clock()
+            if not_before is not None and not_before > now:
+                now = not_before
+            tat = max(self._tat, now)
+            allowed_at = max(now, tat - self._tolerance)
+            self._tat = tat + self._interval
+            return allowed_at
+
+
+class RateLimiter:
+    """Limits the request rate of a client towards a single EnergyView domain
+
+    Requests are held back by the budget of the client, `rate` requests per second, and by the domain bucket shared
+    with the other clients of the domain, see :func:`get_rate_limiter`. GET and SET (POST, PUT, PATCH, DELETE)
+    requests may additionally be given budgets of their own, since the API treats them differently.
+
+    The budgets of the client are reserved first, the domain slot only once the client may send, so that requests
+    queued by a slow client do not hold slots of the domain ahead of time.
+    """
+
+    def __init__(self,
+                 rate: float = DEFAULT_RATE_LIMIT,
+                 get_rate: Optional[float] = None,
+                 set_rate: Optional[float] = None,
+                 burst: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 domain_bucket: Optional[TokenBucket] = None
+                 ) -> None:
+        """
+        Args:
+            rate (float): Requests per second of the client.
+            get_rate (Optional[float]): Separate budget for GET requests.
+            set_rate (Optional[float]): Separate budget for POST, PUT, PATCH and DELETE requests.
+            burst (float): Number of requests that may be sent at once after an idle period.
+            clock (Callable[[], float]): Returns the current time in seconds.
+            sleep (Callable[[float], None]): Waits a number of seconds.
+            domain_bucket (Optional[TokenBucket]): Bucket of the domain, shared with the limiters of other clients.
+                The client has no bucket of its own when `rate` is not below the rate of the domain bucket.
+        """
+        self._clock: Callable[[], float] = clock
+        self._sleep: Callable[[float], None] = sleep
+        self._domain_bucket: Optional[TokenBucket] = domain_bucket
+        self._bucket: Optional[TokenBucket] = None
+        if domain_bucket is None or rate < domain_bucket.rate:
+            self._bucket = TokenBucket(rate, burst, clock)
+        self._get_bucket: Optional[TokenBucket] = TokenBucket(get_rate, burst, clock) if get_rate else None
+        self._set_bucket: Optional[TokenBucket] = TokenBucket(set_rate, burst, clock) if set_rate else None
+        self._lock = threading.Lock()
+
+    def reserve(self, method: str) -> float:
+        """Reserve a request slot in the budgets of the client without blocking
+
+        Once the returned delay has passed, the slot of the domain is reserved with :meth:`reserve_domain`.
+
+        Args:
+            method (str): The HTTP method of the request.
+
+        Returns:
+            Number of seconds the caller has to wait before reserving the domain slot.
+        """
+        bucket = self._set_bucket if method.upper() in SET_METHODS else self._get_bucket
+        with self._lock:
+            allowed_at = bucket.reserve() if bucket is not None else None
+            if self._bucket is not None:
+                allowed_at = self._bucket.reserve(allowed_at)
+        return max(0.0, allowed_at - self._clock()) if allowed_at is not None else 0.0
+
+    def reserve_domain(self) -> float:
+        """Reserve a request slot in the domain bucket without blocking
+
+        Returns:
+            Number of seconds the caller has to wait before sending the request.
+        """
+        if self._domain_bucket is None:
+            return 0.0
+        return max(0.0, self._domain_bucket.reserve() - self._clock())
+
+    def acquire(self, method: str) -> float:
+        """Block until a request may be sent
+
+        Args:
+            method (str): The HTTP method of the request.
+
+        Returns:
+            Number of seconds spent waiting.
+        """
+        delay = self.reserve(method)
+        if delay > 0:
+            self._sleep(delay)
+        domain_delay = self.reserve_domain()
+        if domain_delay > 0:
+            self._sleep(domain_delay)
+        return delay + domain_delay
+
+
+_domain_buckets: Dict[str, TokenBucket] = {}
+_domain_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(url: str,
+                     rate: float = DEFAULT_RATE_LIMIT,
+                     get_rate: Optional[float] = None,
+                     set_rate: Optional[float] = None
+                     ) -> RateLimiter:
+    """Returns a rate limiter for a client of a domain url
+
+    The limiters of a domain url share one domain bucket, created on first use, which keeps all clients in the process
+    within :data:`DEFAULT_RATE_LIMIT` together. `rate`, `get_rate` and `set_rate` only limit the client the limiter is
+    created for.
+    """
+    with _domain_buckets_lock:
+        domain_bucket = _domain_buckets.get(url)
+        if domain_bucket is None:
+            domain_bucket = _domain_buckets[url] = TokenBucket(DEFAULT_RATE_LIMIT)
+    return RateLimiter(rate, get_rate, set_rate, domain_bucket=domain_bucket)
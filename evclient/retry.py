@@ -0,0 +1,109 @@
+import datetime
+import email.utils
+import random
+from typing import Callable, Iterable, Optional
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class RetryPolicy:
+    """Decides if and when a failed request to EnergyView API should be retried
+
+    Delays grow exponentially with "full jitter", i.e. a random delay between zero and the exponential cap, which
+    spreads out retries from concurrent clients without waiting longer than needed. A Retry-After header sent by the
+    server always takes precedence over the computed delay.
+
+    Only idempotent methods are retried by default. A 429 Too Many Requests response is the exception, since the
+    server rejected the request before processing it, so it is retried for every method.
+    """
+
+    def __init__(self,
+                 max_retries: int = 5,
+                 backoff_factor: float = 0.25,
+                 max_backoff: float = 30.0,
+                 max_retry_time: Optional[float] = 120.0,
+                 status_codes: Iterable[int] = RETRY_STATUS_CODES,
+                 methods: Iterable[str] = IDEMPOTENT_METHODS,
+                 respect_retry_after: bool = True,
+                 retry_connection_errors: bool = True,
+                 random_func: Callable[[], float] = random.random
+                 ) -> None:
+        """RetryPolicy constructor
+
+        Args:
+            max_retries (int): Maximum number of retries per request.
+            backoff_factor (float): Cap of the first delay in seconds. The cap is doubled for every retry.
+            max_backoff (float): Upper bound in seconds for a single computed delay.
+            max_retry_time (Optional[float]): Retry budget in seconds. No retry is made if it would end later than
+                this long after the first attempt was sent. None disables the budget.
+            status_codes (Iterable[int]): Response status codes that should be retried.
+            methods (Iterable[str]): HTTP methods that may be retried. Add POST or PUT here to retry those as well.
+            respect_retry_after (bool): Wait as long as the Retry-After header says, if sent by the server.
+            retry_connection_errors (bool): Retry requests that failed with a connection error or timeout.
+            random_func (Callable[[], float]): Source of randomness in [0, 1) for the jitter.
+        """
+        self.max_retries: int = max_retries
+        self.backoff_factor: float = backoff_factor
+        self.max_backoff: float = max_backoff
+        self.max_retry_time: Optional[float] = max_retry_time
+        self.status_codes: frozenset = frozenset(status_codes)
+        self.methods: frozenset = frozenset(method.upper() for method in methods)
+        self.respect_retry_after: bool = respect_retry_after
+        self.retry_connection_errors: bool = retry_connection_errors
+        self._random: Callable[[], float] = random_func
+
+    def backoff(self, attempt: int) -> float:
+        """Returns a jittered exponential delay in seconds before retry number `attempt` (starting at 0)"""
+        cap = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return cap * self._random()
+
+    def is_retryable(self, method: str, status_code: Optional[int] = None) -> bool:
+        """Checks if a request may be retried given its response status, None on connection errors"""
+        if status_code is None:
+            return self.retry_connection_errors and method.upper() in self.methods
+        if status_code not in self.status_codes:
+            return False
+        return status_code == 429 or method.upper() in self.methods
+
+    def get_delay(self,
+                  method: str,
+                  attempt: int,
+                  elapsed: float,
+                  status_code: Optional[int] = None,
+                  retry_after: Optional[str] = None
+                  ) -> Optional[float]:
+        """Returns the number of seconds to wait before the next attempt, or None if no retry should be made
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): Number of retries already made.
+            elapsed (float): Seconds since the first attempt was sent.
+            status_code (Optional[int]): Response status of the last attempt, None if it failed to connect.
+            retry_after (Optional[str]): The Retry-After header of the last response, if any.
+        """
+        if attempt >= self.max_retries or not self.is_retryable(method, status_code):
+            return None
+        delay = parse_retry_after(retry_after) if self.respect_retry_after else None
+        if delay is None:
+            delay = self.backoff(attempt)
+        if self.max_retry_time is not None and elapsed + delay > self.max_retry_time:
+            return None
+        return delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parses a Retry-After header, given either as seconds or as an HTTP date, into seconds from now"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (date - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
@@ -0,0 +1,203 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class SettingsKey(NamedTuple):
+    """
+    Attributes:
+        url: The API url of the domain.
+        settings_type: The type of the resource, such as node.
+        settings_id: The numeric id of the resource.
+    """
+    url: str
+    settings_type: str
+    settings_id: int
+
+
+class SettingsCacheStats(NamedTuple):
+    """
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that were not cached, or expired.
+        expired: Cached trees dropped because they were older than the ttl.
+        invalidations: Cached trees dropped because settings were stored beneath them.
+        evictions: Resources dropped to stay within `max_entries`.
+        entries: Resources currently cached.
+    """
+    hits: int
+    misses: int
+    expired: int
+    invalidations: int
+    evictions: int
+    entries: int
+
+    @property
+    def hit_ratio(self) -> float:
+        """Share of lookups answered from the cache, 0 before the first lookup"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class SettingsCache:
+    """An in-memory cache of settings trees, for :class:`.SettingsClient`
+
+    A settings tree is cached per resource and fetched path, as returned by the API without `extract`. A lookup is
+    answered from the tree of the path itself or of any path above it, so once `coco` is cached, `coco.default` and
+    `coco.default.hello` are answered locally too, with or without `extract`. Trees expire `ttl` seconds after they
+    were fetched.
+
+    Settings stored through a client that uses the cache drop the cached trees above and beneath the stored path of
+    that resource. Settings changed by anyone else are seen once the trees expire.
+
+    Example::
+
+        cache = SettingsCache(ttl=30)
+        client = SettingsClient(settings_cache=cache)
+        client.get_settings('node', 1, path='coco.default', extract=True)
+        print(cache.stats().hit_ratio)
+    """
+
+    def __init__(self,
+                 ttl: float = 60.0,
+                 max_entries: Optional[int] = 10000,
+                 clock: Callable[[], float] = time.monotonic
+                 ) -> None:
+        """
+        Args:
+            ttl (float): Seconds a fetched tree is used for.
+            max_entries (Optional[int]): Maximum number of resources to cache, the least recently used are dropped
+                first. None does not limit the cache.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        if ttl <= 0:
+            raise ValueError('ttl must be positive')
+        self.ttl: float = ttl
+        self.max_entries: Optional[int] = max_entries
+        self._clock: Callable[[], float] = clock
+        # Fetched trees and their expiry time by resource, then by fetched path, '' being the whole tree.
+        self._entries: 'OrderedDict[SettingsKey, Dict[str, Tuple[Any, float]]]' = OrderedDict()
+        # Bumped by every invalidation, so that trees fetched before a write are not cached after it. A single counter
+        # for all resources, one per resource would grow with every resource ever stored.
+        self._generation: int = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    def get(self, key: SettingsKey, path: Optional[str] = None) -> Tuple[bool, Any]:
+        """Looks up the settings at `path` of a resource
+
+        Returns:
+            Tuple of whether the settings were cached, and a copy of the settings beneath `path`.
+        """
+        parts = split_settings_path(path)
+        with self._lock:
+            trees = self._entries.get(key)
+            if trees is not None:
+                self._entries.move_to_end(key)
+                now = self._clock()
+                for depth in range(len(parts) + 1):
+                    found, value = self._find(trees, parts, depth, now)
+                    if found:
+                        self._hits += 1
+                        return True, copy.deepcopy(value)
+                if not trees:
+                    del self._entries[key]
+            self._misses += 1
+        return False, None
+
+    def _find(self, trees: Dict[str, Tuple[Any, float]], parts: List[str], depth: int, now: float) -> Tuple[bool, Any]:
+        fetched_path = '.'.join(parts[:depth])
+        entry = trees.get(fetched_path)
+        if entry is None:
+            return False, None
+        tree, expires = entry
+        if now >= expires:
+            del trees[fetched_path]
+            self._expired += 1
+            return False, None
+        return find_settings_path(tree, parts)
+
+    def generation(self) -> int:
+        """Returns the number of invalidations so far, read it before fetching a tree to :meth:`put`"""
+        with self._lock:
+            return self._generation
+
+    def put(self, key: SettingsKey, path: Optional[str], tree: Any, generation: Optional[int] = None) -> None:
+        """Caches the settings tree fetched for `path` of a resource, without `extract`
+
+        Args:
+            key (SettingsKey): The resource.
+            path (Optional[str]): The path the tree was fetched for.
+            tree (Any): The fetched tree.
+            generation (Optional[int]): The :meth:`generation` before the tree was fetched. The tree is not cached if
+                any resource was invalidated since, it may be older than the write.
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            trees = self._entries.setdefault(key, {})
+            trees['.'.join(split_settings_path(path))] = (copy.deepcopy(tree), self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: SettingsKey, path: Optional[str] = None) -> None:
+        """Drops the cached trees of a resource that contain, or are beneath, `path`, all of them if it is None"""
+        parts = split_settings_path(path)
+        with self._lock:
+            self._generation += 1
+            trees = self._entries.get(key)
+            if trees is None:
+                return
+            for fetched_path in list(trees):
+                fetched_parts = split_settings_path(fetched_path)
+                depth = min(len(parts), len(fetched_parts))
+                if parts[:depth] == fetched_parts[:depth]:
+                    del trees[fetched_path]
+                    self._invalidations += 1
+            if not trees:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drops all cached trees, the statistics are kept"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> SettingsCacheStats:
+        """Returns the hit, miss and invalidation counts since the cache was created"""
+        with self._lock:
+            return SettingsCacheStats(
+                self._hits, self._misses, self._expired, self._invalidations, self._evictions, len(self._entries)
+            )
+
+
+def split_settings_path(path: Optional[str]) -> List[str]:
+    """Splits a dotted settings path into its keys, no keys for the whole tree"""
+    return path.split('.') if path else []
+
+
+def find_settings_path(tree: Any, parts: List[str]) -> Tuple[bool, Any]:
+    """Walks a settings tree down the keys of a path
+
+    Returns:
+        Tuple of whether the path exists, and the settings beneath it.
+    """
+    for part in parts:
+        if not isinstance(tree, dict) or part not in tree:
+            return False, None
+        tree = tree[part]
+    return True, tree
+
+
+def wrap_settings_path(parts: List[str], value: Any) -> Any:
+    """Nests `value` beneath the keys of a path, as the API returns a path without `extract`"""
+    for part in reversed(parts):
+        value = {part: value}
+    return value
@@ -1,38 +1,78 @@
-from warnings import filterwarnings
-from typing import Dict, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, TypeVar
 
 import requests
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 
+from .exceptions import EVResponseError
+from .settings_cache import SettingsCache, SettingsKey, find_settings_path, split_settings_path, wrap_settings_path
+from .settings_diff import SettingsChange, diff_settings, settings_value
+from .typecheck import typechecked
 from .base_client import BaseClient
 from .utils import filter_none_values_from_dict
 
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 Response = requests.models.Response
 
+T = TypeVar('T')
+
+_SETTINGS_API_PATH: str = 'settings'
+
+
+class SettingsResult(NamedTuple):
+    """
+    Attributes:
+        settings_id: The numeric id of the resource.
+        settings: The settings of the resource, None if the request failed.
+        error: The exception raised by the request, None if it succeeded.
+    """
+    settings_id: int
+    settings: Optional[Any]
+    error: Optional[Exception]
+
+
+class SettingsSyncResult(NamedTuple):
+    """
+    Attributes:
+        settings_id: The numeric id of the resource.
+        changes: The leaves that differ from the current settings, see :func:`.diff_settings`.
+        stored: Number of changes stored, in order. Less than the number of changes if the sync failed or was a dry
+            run.
+        error: The exception raised by the sync, None if it succeeded.
+    """
+    settings_id: int
+    changes: List[SettingsChange]
+    stored: int
+    error: Optional[Exception]
+
 
 class SettingsClient(BaseClient):
     """
     A client for handling the settings / metadata section of EnergyView API.
     """
 
-    @beartype
+    @typechecked
     def __init__(self,
                  domain: Optional[str] = None,
                  api_key: Optional[str] = None,
-                 endpoint_url: Optional[str] = None
+                 endpoint_url: Optional[str] = None,
+                 settings_cache: Optional[SettingsCache] = None,
+                 **kwargs
                  ) -> None:
-        super().__init__(domain, api_key, endpoint_url)
-        self._settings_api_path: str = 'settings'
+        """
+        Args:
+            settings_cache (Optional[:class:`.SettingsCache`]): Answer :meth:`get_settings` from this cache when
+                possible, see :class:`.SettingsCache`. The other arguments are those of :class:`.BaseClient`.
+        """
+        super().__init__(domain, api_key, endpoint_url, **kwargs)
+        self._settings_api_path: str = _SETTINGS_API_PATH
+        self.settings_cache: Optional[SettingsCache] = settings_cache
 
-    @beartype
+    @typechecked
     def get_settings(self,
                      settings_type: str,
                      settings_id: int,
                      path: Optional[str] = None,
                      extract: Optional[bool] = False
-                     ) -> Dict:
+                     ) -> Any:
         """Fetches all settings / metadata of a resource from EnergyView API
 
         Args:
@@ -65,7 +105,8 @@ class SettingsClient(BaseClient):
                     "world"
 
         Returns:
-            Dict of settings, keys will vary depending on the settings_type and resource requested
+            Dict of settings, keys will vary depending on the settings_type and resource requested. With `extract`,
+            the value beneath `path`, which may also be a list or a scalar.
 
         Raises:
             :class:`.EVUnexpectedStatusCodeException`: Unexpected status code received.
@@ -77,16 +118,83 @@ class SettingsClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.get(
+        if self.settings_cache is not None:
+            return self._get_cached_settings(self.settings_cache, settings_type, settings_id, path, extract)
+        return self._fetch_settings(settings_type, settings_id, path, extract)
+
+    def _fetch_settings(self,
+                        settings_type: str,
+                        settings_id: int,
+                        path: Optional[str],
+                        extract: Optional[bool]
+                        ) -> Any:
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._settings_api_path}/{settings_type}/{settings_id}',
-            params=filter_none_values_from_dict({
-                'path': path,
-                'extract': 1 if extract else 0
-            })
+            params=_settings_query_params(path, extract)
         )
         return self._process_response(response)
 
-    @beartype
+    def _get_cached_settings(self,
+                             cache: SettingsCache,
+                             settings_type: str,
+                             settings_id: int,
+                             path: Optional[str],
+                             extract: Optional[bool]
+                             ) -> Any:
+        key = SettingsKey(self._url, settings_type, settings_id)
+        parts: List[str] = split_settings_path(path)
+        generation = cache.generation()
+        found, value = cache.get(key, path)
+        if not found:
+            # Trees are fetched without extract, so that the paths beneath can be answered from them.
+            tree = self._fetch_settings(settings_type, settings_id, path, False)
+            found, value = find_settings_path(tree, parts)
+            if not found:
+                # The cache only holds paths that exist, what is returned for a missing path is left to the API.
+                return self._fetch_settings(settings_type, settings_id, path, extract) if extract else tree
+            cache.put(key, path, tree, generation)
+        return value if extract else wrap_settings_path(parts, value)
+
+    @typechecked
+    def get_settings_many(self,
+                          settings_type: str,
+                          settings_ids: List[int],
+                          path: Optional[str] = None,
+                          extract: Optional[bool] = False,
+                          max_workers: int = 8
+                          ) -> Iterator[SettingsResult]:
+        """Fetches the settings / metadata of many resources in parallel
+
+        The requests are sent by up to `max_workers` threads, within the domain rate limit. A failed request does
+        not stop the others, its exception is returned in :attr:`.SettingsResult.error`. Requests are only submitted
+        as results are consumed, closing the iterator early stops the remaining requests.
+
+        Example::
+
+            for result in client.get_settings_many('node', node_ids, path='coco.default', extract=True):
+                if result.error is None:
+                    audit(result.settings_id, result.settings)
+
+        Args:
+            settings_type (str): See :meth:`get_settings`.
+            settings_ids (List[int]): The numeric ids of the resources.
+            path (Optional[str]): See :meth:`get_settings`, shared by all resources.
+            extract (Optional[bool]): See :meth:`get_settings`, shared by all resources.
+            max_workers (int): Maximum number of requests to send in parallel.
+
+        Yields:
+            :class:`.SettingsResult` for each id, in order of completion.
+        """
+        def get_settings(settings_id: int) -> SettingsResult:
+            try:
+                return SettingsResult(settings_id, self.get_settings(settings_type, settings_id, path, extract), None)
+            except (EVResponseError, requests.RequestException) as e:
+                return SettingsResult(settings_id, None, e)
+
+        return _map_as_completed(get_settings, settings_ids, max_workers)
+
+    @typechecked
     def store_settings(self,
                        settings_type: str,
                        settings_id: int,
@@ -126,12 +234,143 @@ class SettingsClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.put(
-            url=f'{self._url}/{self._settings_api_path}/{settings_type}/{settings_id}',
-            data=filter_none_values_from_dict({
-                'path': path,
-                'value': value,
-                'force': 1 if force else None
-            })
-        )
+        try:
+            response: Response = self._request(
+                'PUT',
+                url=f'{self._url}/{self._settings_api_path}/{settings_type}/{settings_id}',
+                data=_settings_body(path, value, force)
+            )
+        finally:
+            # Also when the request failed, the value may have been stored anyway.
+            if self.settings_cache is not None:
+                self.settings_cache.invalidate(SettingsKey(self._url, settings_type, settings_id), path)
         return self._process_response(response)
+
+    @typechecked
+    def sync_settings(self,
+                      settings_type: str,
+                      settings_id: int,
+                      tree: Dict,
+                      dry_run: bool = False,
+                      force: Optional[bool] = False
+                      ) -> List[SettingsChange]:
+        """Stores the leaves of a settings tree that differ from the current settings of a resource
+
+        The current settings are fetched once, both trees are flattened into dotted paths and
+        :meth:`store_settings` is only called for the leaves that changed, one after the other. Settings missing from
+        `tree` are left as they are.
+
+        Example::
+
+            changes = client.sync_settings('node', 1, {'coco': {'default': {'hello': 'world'}}}, dry_run=True)
+            for change in changes:
+                print(f'{change.path}: {change.old!r} -> {change.new!r}')
+
+        Args:
+            settings_type (str): See :meth:`get_settings`.
+            settings_id (int): The numeric id associated with the resource.
+            tree (Dict): The desired settings. Values are stored as JSON, so strings stay strings.
+            dry_run (bool): Only fetch the current settings and return the changes, without storing them.
+            force (Optional[bool]): See :meth:`store_settings`, needed to change the type of a value.
+
+        Returns:
+            List[:class:`.SettingsChange`] the changes that were stored, or would be stored on a dry run.
+
+        Raises:
+            :class:`.EVUnexpectedStatusCodeException`: Unexpected status code received.
+            :class:`.EVBadRequestException`: Sent request had insufficient data or invalid options.
+            :class:`.EVUnauthorizedException`: Request was refused due to lacking authentication credentials.
+            :class:`.EVForbiddenException`: Server understands the request but refuses to authorize it.
+            :class:`.EVNotFoundException`: The requested resource was not found.
+            :class:`.EVTooManyRequestsException`: Sent too many requests in a given amount of time.
+            :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
+                from fulfilling the request.
+        """
+        result = self._sync_settings(settings_type, settings_id, tree, dry_run, force)
+        if result.error is not None:
+            raise result.error
+        return result.changes
+
+    @typechecked
+    def sync_settings_many(self,
+                           settings_type: str,
+                           trees: Dict[int, Dict],
+                           dry_run: bool = False,
+                           force: Optional[bool] = False,
+                           max_workers: int = 8
+                           ) -> Iterator[SettingsSyncResult]:
+        """Syncs the settings of many resources in parallel, see :meth:`sync_settings`
+
+        Resources are synced by up to `max_workers` threads, within the domain rate limit. The changes of a single
+        resource are stored in order by one thread. A failed sync does not stop the others.
+
+        Args:
+            settings_type (str): See :meth:`get_settings`.
+            trees (Dict[int, Dict]): The desired settings by resource id.
+            dry_run (bool): Only fetch the current settings and return the changes, without storing them.
+            force (Optional[bool]): See :meth:`store_settings`.
+            max_workers (int): Maximum number of resources to sync in parallel.
+
+        Yields:
+            :class:`.SettingsSyncResult` for each resource, in order of completion.
+        """
+        def sync_settings(settings_id: int) -> SettingsSyncResult:
+            return self._sync_settings(settings_type, settings_id, trees[settings_id], dry_run, force)
+
+        return _map_as_completed(sync_settings, list(trees), max_workers)
+
+    def _sync_settings(self,
+                       settings_type: str,
+                       settings_id: int,
+                       tree: Dict,
+                       dry_run: bool,
+                       force: Optional[bool]
+                       ) -> SettingsSyncResult:
+        changes: List[SettingsChange] = []
+        stored = 0
+        try:
+            # The current settings are always fetched, a cached tree may be older than the last change.
+            changes = diff_settings(self._fetch_settings(settings_type, settings_id, None, False), tree)
+            if not dry_run:
+                for change in changes:
+                    self.store_settings(settings_type, settings_id, change.path, settings_value(change.new), force)
+                    stored += 1
+        except (EVResponseError, requests.RequestException) as e:
+            return SettingsSyncResult(settings_id, changes, stored, e)
+        return SettingsSyncResult(settings_id, changes, stored, None)
+
+
+def _map_as_completed(func: Callable[[int], T], settings_ids: List[int], max_workers: int) -> Iterator[T]:
+    pending_ids = iter(settings_ids)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        running: Set[Future] = set()
+        try:
+            while True:
+                # Two requests per worker are queued, so workers never wait for the consumer to submit more.
+                for settings_id in pending_ids:
+                    running.add(executor.submit(func, settings_id))
+                    if len(running) >= 2 * max_workers:
+                        break
+                if not running:
+                    return
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def _settings_query_params(path: Optional[str], extract: Optional[bool]) -> Dict[str, Any]:
+    return filter_none_values_from_dict({
+        'path': path,
+        'extract': 1 if extract else 0
+    })
+
+
+def _settings_body(path: str, value: str, force: Optional[bool]) -> Dict[str, Any]:
+    return filter_none_values_from_dict({
+        'path': path,
+        'value': value,
+        'force': 1 if force else None
+    })
@@ -0,0 +1,74 @@
+import json
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class SettingsChange(NamedTuple):
+    """
+    Attributes:
+        path: The dotted path of the changed leaf, for example coco.default.hello.
+        old: The current value, None if the path does not exist yet.
+        new: The value to store.
+    """
+    path: str
+    old: Optional[Any]
+    new: Any
+
+
+def flatten_settings(tree: Any, prefix: str = '') -> Dict[str, Any]:
+    """Flattens a settings tree into its leaves by dotted path
+
+    Objects are walked, everything else, lists included, is a leaf. Empty objects have no leaves.
+
+    Example::
+
+        >>> flatten_settings({'coco': {'default': {'hello': 'world', 'ids': [1, 2]}}})
+        {'coco.default.hello': 'world', 'coco.default.ids': [1, 2]}
+    """
+    if not isinstance(tree, dict):
+        return {prefix: tree} if prefix else {}
+    leaves: Dict[str, Any] = {}
+    for key, value in tree.items():
+        path = f'{prefix}.{key}' if prefix else str(key)
+        if isinstance(value, dict):
+            leaves.update(flatten_settings(value, path))
+        else:
+            leaves[path] = value
+    return leaves
+
+
+def diff_settings(current: Any, desired: Any) -> List[SettingsChange]:
+    """Returns the leaves of `desired` that are missing from, or differ from, `current`
+
+    Leaves that only exist in `current` are not changes, settings are never removed. Values of different JSON types
+    differ even when Python considers them equal, so `True` replaces `1`, but `1.0` does not replace `1`.
+
+    Returns:
+        List[:class:`SettingsChange`] in the order of `desired`.
+    """
+    old_leaves = flatten_settings(current)
+    missing = object()
+    changes: List[SettingsChange] = []
+    for path, new in flatten_settings(desired).items():
+        old = old_leaves.get(path, missing)
+        if old is missing:
+            changes.append(SettingsChange(path, None, new))
+        elif not _same_value(old, new):
+            changes.append(SettingsChange(path, old, new))
+    return changes
+
+
+def settings_value(value: Any) -> str:
+    """Returns the value as sent to :meth:`.SettingsClient.store_settings`, which takes a JSON value
+
+    Strings are quoted too, otherwise '8080' would be stored as a number and differ from the desired tree again on the
+    next sync.
+    """
+    return json.dumps(value)
+
+
+def _same_value(a: Any, b: Any) -> bool:
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    return type(a) is type(b) and a == b
@@ -1,32 +1,32 @@
-from warnings import filterwarnings
 from typing import List, Optional
 
 import requests
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 
+from .typecheck import typechecked
 from .types.tag_types import TagResponse, TagType
 from .base_client import BaseClient
 
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 Response = requests.models.Response
 
+_TAG_API_PATH: str = 'tags'
+
 
 class TagClient(BaseClient):
     """
     A client for handling the tag / sensor section of EnergyView API.
     """
 
-    @beartype
+    @typechecked
     def __init__(self,
                  domain: Optional[str] = None,
                  api_key: Optional[str] = None,
-                 endpoint_url: Optional[str] = None
+                 endpoint_url: Optional[str] = None,
+                 **kwargs
                  ) -> None:
-        super().__init__(domain, api_key, endpoint_url)
-        self._tag_api_path: str = 'tags'
+        super().__init__(domain, api_key, endpoint_url, **kwargs)
+        self._tag_api_path: str = _TAG_API_PATH
 
-    @beartype
+    @typechecked
     def get_tags(self) -> List[TagType]:
         """Fetches all tags / sensors from EnergyView API
 
@@ -42,8 +42,12 @@ class TagClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.get(
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._tag_api_path}'
         )
-        response_data: TagResponse = self._process_response(response)
-        return [] if response_data is None else response_data.get('sensors')
+        return _parse_tags(self._process_response(response))
+
+
+def _parse_tags(response_data: Optional[TagResponse]) -> List[TagType]:
+    return [] if response_data is None else response_data.get('sensors')
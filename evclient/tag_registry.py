@@ -0,0 +1,180 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from .node_catalog import NodeCatalog
+from .types.tag_types import TagType
+
+
+class TimeseriesQuery(NamedTuple):
+    """
+    Attributes:
+        node_ids: The nodes to fetch, None when no node filter was given.
+        tags: The tags to fetch for each of the nodes, None when no tag filter was given.
+    """
+    node_ids: Optional[Union[int, List[int]]]
+    tags: Optional[Union[str, List[str]]]
+
+
+class _Indexes:
+    """An immutable set of indexes over one fetch of the tags, replaced as a whole on refresh"""
+
+    __slots__ = ('tags', 'by_id', 'by_key', 'by_name', 'loaded_at')
+
+    def __init__(self, tags: List[TagType], loaded_at: float) -> None:
+        self.tags: Tuple[TagType, ...] = tuple(tags)
+        self.by_id: Dict[int, TagType] = {tag['id']: tag for tag in tags}
+        self.by_key: Dict[Tuple[int, str], TagType] = {(tag.get('protocol_id'), tag['name']): tag for tag in tags}
+        by_name: Dict[str, List[TagType]] = {}
+        for tag in tags:
+            by_name.setdefault(tag['name'], []).append(tag)
+        self.by_name: Dict[str, Tuple[TagType, ...]] = {name: tuple(group) for name, group in by_name.items()}
+        self.loaded_at: float = loaded_at
+
+
+class TagRegistry:
+    """The tags / sensors of a domain, indexed by id and by protocol and name
+
+    Tags are fetched with :meth:`.TagClient.get_tags` on first use, and fetched again on the first lookup after they
+    are older than `ttl` seconds. Tag names are only unique within a protocol, use :meth:`resolve` to find the id of
+    a name.
+
+    Example::
+
+        registry = TagRegistry(client)
+        tag_id = registry.resolve_id('outdoortemp', protocol_id=1)
+    """
+
+    def __init__(self,
+                 client,
+                 ttl: Optional[float] = 3600.0,
+                 clock: Callable[[], float] = time.monotonic
+                 ) -> None:
+        """
+        Args:
+            client (TagClient): The client used to fetch the tags, such as an :class:`.EVClient`.
+            ttl (Optional[float]): Seconds the tags are used before they are fetched again. None only refreshes on
+                demand, see :meth:`refresh`.
+            clock (Callable[[], float]): Returns the current time in seconds.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError('ttl must be positive')
+        self._client = client
+        self.ttl: Optional[float] = ttl
+        self._clock: Callable[[], float] = clock
+        self._indexes: Optional[_Indexes] = None
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Fetch and index the tags now
+
+        Raises:
+            Exception: Any exception raised by :meth:`.TagClient.get_tags`, the previous tags are kept.
+        """
+        with self._refresh_lock:
+            self._load()
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the tags were fetched, None if they have not been fetched yet"""
+        indexes = self._indexes
+        return None if indexes is None else self._clock() - indexes.loaded_at
+
+    def _load(self) -> _Indexes:
+        self._indexes = _Indexes(self._client.get_tags(), self._clock())
+        return self._indexes
+
+    def _is_stale(self, indexes: Optional[_Indexes]) -> bool:
+        return indexes is None or (self.ttl is not None and self._clock() - indexes.loaded_at >= self.ttl)
+
+    def _get_indexes(self) -> _Indexes:
+        indexes = self._indexes
+        if self._is_stale(indexes):
+            with self._refresh_lock:
+                indexes = self._indexes
+                if self._is_stale(indexes):
+                    indexes = self._load()
+        return indexes
+
+    def __len__(self) -> int:
+        return len(self._get_indexes().tags)
+
+    def __iter__(self) -> Iterator[TagType]:
+        return iter(self._get_indexes().tags)
+
+    def get(self, tag_id: int) -> Optional[TagType]:
+        """Returns the tag with the domain-unique id, None if there is none"""
+        return self._get_indexes().by_id.get(tag_id)
+
+    def resolve(self, name: str, protocol_id: int) -> Optional[TagType]:
+        """Returns the tag with the name within the protocol, None if there is none"""
+        return self._get_indexes().by_key.get((protocol_id, name))
+
+    def resolve_id(self, name: str, protocol_id: int) -> Optional[int]:
+        """Returns the id of the tag with the name within the protocol, None if there is none"""
+        tag = self.resolve(name, protocol_id)
+        return None if tag is None else tag['id']
+
+    def by_name(self, name: str) -> Tuple[TagType, ...]:
+        """Returns the tags with the name, one per protocol that declares it"""
+        return self._get_indexes().by_name.get(name, ())
+
+    def tag_names(self, sensor_ids: Iterable[int]) -> Set[str]:
+        """Returns the names of the tags with the ids, such as the `sensor_ids` of a node, ignoring unknown ids"""
+        by_id = self._get_indexes().by_id
+        return {by_id[sensor_id]['name'] for sensor_id in sensor_ids if sensor_id in by_id}
+
+
+class TimeseriesQueryPlanner:
+    """Prunes timeseries queries to the node and tag pairs that exist
+
+    The API fetches every requested tag of every requested node. The planner uses the `sensor_ids` of the nodes to
+    drop the tags a node does not have, and groups nodes that have the same tags into one query, so the API is not
+    asked for groups that are always empty.
+
+    Nodes missing from the catalog and tags missing from the registry are kept as requested, they may have been
+    added since the catalog or registry was fetched.
+
+    Example::
+
+        planner = TimeseriesQueryPlanner(TagRegistry(client), NodeCatalog(client, ttl=None))
+        client.get_timeseries_data(node_ids, ['outdoortemp', 'supplytemp'], start, end, planner=planner)
+    """
+
+    def __init__(self, tags: TagRegistry, nodes: NodeCatalog) -> None:
+        """
+        Args:
+            tags (TagRegistry): The tags of the domain.
+            nodes (NodeCatalog): The nodes of the domain.
+        """
+        self.tags: TagRegistry = tags
+        self.nodes: NodeCatalog = nodes
+
+    def plan(self,
+             node_ids: Optional[Union[int, List[int]]],
+             tags: Optional[Union[str, List[str]]]
+             ) -> List[TimeseriesQuery]:
+        """Returns the queries that fetch the existing pairs of `node_ids` and `tags`
+
+        Queries without a node or tag filter are returned unchanged, the API only returns existing groups for them.
+
+        Returns:
+            List[:class:`TimeseriesQuery`] in order of the first node of each query. Empty if no pair exists.
+        """
+        if node_ids is None or tags is None:
+            return [TimeseriesQuery(node_ids, tags)]
+        requested: List[str] = tags if isinstance(tags, list) else [tags]
+        queries: Dict[Tuple[str, ...], List[int]] = {}
+        for node_id in (node_ids if isinstance(node_ids, list) else [node_ids]):
+            node_tags = self.node_tags(node_id, requested)
+            if node_tags:
+                queries.setdefault(node_tags, []).append(node_id)
+        return [TimeseriesQuery(ids, list(names)) for names, ids in queries.items()]
+
+    def node_tags(self, node_id: int, tags: List[str]) -> Tuple[str, ...]:
+        """Returns the tags of `tags` that the node may have, in the given order"""
+        node = self.nodes.by_id(node_id)
+        if node is None:
+            return tuple(tags)
+        names = self.tags.tag_names(node.sensor_ids)
+        return tuple(tag for tag in tags if tag in names or not self.tags.by_name(tag))
@@ -0,0 +1,231 @@
+import datetime
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .columnar import TimeseriesColumns, _to_column
+from .timeseries_chunking import RESOLUTION_SECONDS
+
+_MAGIC = b'EVTS1\n'
+_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+# Half-open [start, end) interval in microseconds since the Unix epoch.
+Interval = Tuple[int, int]
+
+
+class CacheKey(NamedTuple):
+    """
+    Attributes:
+        domain: The API url of the domain the data belongs to.
+        node_id: Domain-unique identifier for the node.
+        tag: Name of the sensor.
+        resolution: The resolution of the query, None for raw data.
+        aggregate: The aggregate function of the query.
+    """
+    domain: str
+    node_id: int
+    tag: str
+    resolution: Optional[str]
+    aggregate: Optional[str]
+
+
+class TimeseriesCache:
+    """A persistent cache of timeseries data, used by :meth:`.TimeseriesClient.get_timeseries_data`
+
+    Every node, tag, resolution and aggregate of a domain is stored in its own file in `directory`, together with the
+    time intervals that have been fetched. Queries only fetch the parts of their window that are not covered yet.
+
+    Data newer than `mutable_horizon` may still change and is never cached, it is fetched on every query.
+
+    The files hold a JSON header followed by the timestamps as int64 nanoseconds and the values as float64, see
+    :class:`.TimeseriesColumns`.
+    """
+
+    def __init__(self,
+                 directory: str,
+                 mutable_horizon: datetime.timedelta = datetime.timedelta(days=1),
+                 clock: Callable[[], float] = time.time
+                 ) -> None:
+        """
+        Args:
+            directory (str): Directory of the cache files, created if missing.
+            mutable_horizon (datetime.timedelta): Data newer than this is always fetched from the API.
+            clock (Callable[[], float]): Returns the current Unix time in seconds.
+        """
+        self.directory: str = directory
+        self.mutable_horizon: datetime.timedelta = mutable_horizon
+        self._clock: Callable[[], float] = clock
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def horizon(self) -> int:
+        """Returns the start of the mutable horizon in microseconds since the Unix epoch"""
+        return int(self._clock() * 1000000) - self.mutable_horizon // _MICROSECOND
+
+    def missing(self, key: CacheKey, start: int, end: int) -> List[Interval]:
+        """Returns the parts of [start, end) that are not cached, in microseconds since the Unix epoch"""
+        intervals, _, _ = self._load(key)
+        gaps: List[Interval] = []
+        for covered_start, covered_end in intervals:
+            if covered_end <= start:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > start:
+                gaps.append((start, covered_start))
+            start = max(start, covered_end)
+        if start < end:
+            gaps.append((start, end))
+        return gaps
+
+    def read(self, key: CacheKey, start: int, end: int) -> TimeseriesColumns:
+        """Returns the cached points in [start, end), in microseconds since the Unix epoch"""
+        _, ts, v = self._load(key)
+        i = bisect_left(ts, start * 1000)
+        j = bisect_left(ts, end * 1000)
+        return TimeseriesColumns(key.node_id, key.tag, _to_column(ts[i:j]), _to_column(v[i:j]))
+
+    def update(self,
+               key: CacheKey,
+               start: int,
+               end: int,
+               columns: Optional[TimeseriesColumns],
+               horizon: Optional[int] = None
+               ) -> None:
+        """Replaces the cached points in [start, end) by `columns` and marks the interval as covered
+
+        Points at or after the mutable horizon are not stored, and the covered interval ends at the horizon.
+
+        Args:
+            key (CacheKey): The cached timeseries.
+            start (int): Start of the fetched interval in microseconds since the Unix epoch.
+            end (int): End of the fetched interval, exclusive.
+            columns (Optional[TimeseriesColumns]): The fetched points, None if there were none.
+            horizon (Optional[int]): The mutable horizon to apply, defaults to :meth:`horizon`.
+        """
+        end = min(end, self.horizon() if horizon is None else horizon)
+        if start >= end:
+            return
+        new_ts = array('q')
+        new_v = array('d')
+        if columns is not None:
+            for point_ts, point_v in sorted(zip(columns.ts.tolist(), columns.v.tolist())):
+                if start * 1000 <= point_ts < end * 1000:
+                    new_ts.append(point_ts)
+                    new_v.append(point_v)
+
+        with self._lock:
+            intervals, ts, v = self._load(key)
+            i = bisect_left(ts, start * 1000)
+            j = bisect_left(ts, end * 1000)
+            intervals = merge_intervals(intervals + [(start, end)])
+            self._save(key, intervals, ts[:i] + new_ts + ts[j:], v[:i] + new_v + v[j:])
+
+    def clear(self) -> None:
+        """Removes all cached data"""
+        with self._lock:
+            for name in os.listdir(self.directory):
+                if name.endswith('.evts'):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _path(self, key: CacheKey) -> str:
+        digest = hashlib.sha1(json.dumps(list(key)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{digest}.evts')
+
+    def _load(self, key: CacheKey) -> Tuple[List[Interval], array, array]:
+        try:
+            with open(self._path(key), 'rb') as f:
+                if f.readline() != _MAGIC:
+                    raise ValueError('not a timeseries cache file')
+                header = json.loads(f.readline())
+                if header.get('key') != list(key):
+                    raise ValueError('cache file belongs to another key')
+                ts = array('q')
+                v = array('d')
+                ts.frombytes(f.read(header['points'] * 8))
+                v.frombytes(f.read(header['points'] * 8))
+        except (OSError, ValueError, KeyError, EOFError):
+            return [], array('q'), array('d')
+        if sys.byteorder != 'little':  # pragma: no cover
+            ts.byteswap()
+            v.byteswap()
+        return [tuple(interval) for interval in header['intervals']], ts, v
+
+    def _save(self, key: CacheKey, intervals: List[Interval], ts: array, v: array) -> None:
+        header = {'key': list(key), 'intervals': intervals, 'points': len(ts)}
+        if sys.byteorder != 'little':  # pragma: no cover
+            ts = array('q', ts)
+            v = array('d', v)
+            ts.byteswap()
+            v.byteswap()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_MAGIC)
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+                f.write(ts.tobytes())
+                f.write(v.tobytes())
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+
+def to_microseconds(dt: datetime.datetime) -> int:
+    """Converts a timezone aware datetime to microseconds since the Unix epoch"""
+    if dt.tzinfo is None:
+        raise ValueError('cached timeseries queries need timezone aware start and end')
+    return (dt - _EPOCH_UTC) // _MICROSECOND
+
+
+def from_microseconds(us: int) -> datetime.datetime:
+    """Converts microseconds since the Unix epoch to a datetime in UTC"""
+    return _EPOCH_UTC + datetime.timedelta(microseconds=us)
+
+
+def align_interval(start: int, end: int, resolution: Optional[str]) -> Interval:
+    """Widens [start, end) to whole resolution periods, so no aggregated period is cached partially"""
+    if resolution is None:
+        return start, end
+    period = RESOLUTION_SECONDS[resolution] * 1000000
+    return start - start % period, end + (-end) % period
+
+
+def slice_columns(columns: TimeseriesColumns, start_ns: int, end_ns: int) -> TimeseriesColumns:
+    """Returns the points of sorted columns with a timestamp in [start_ns, end_ns)"""
+    ts = columns.ts.tolist()
+    i = bisect_left(ts, start_ns)
+    j = bisect_left(ts, end_ns)
+    return TimeseriesColumns(columns.node_id, columns.tag, columns.ts[i:j], columns.v[i:j])
+
+
+def merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Merges overlapping and adjacent intervals, the result is sorted"""
+    merged: List[Interval] = []
+    for interval in sorted(intervals):
+        if merged and interval[0] <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], interval[1]))
+        else:
+            merged.append(interval)
+    return merged
+
+
+def group_gaps(gaps: Dict[CacheKey, List[Interval]]) -> Dict[Interval, Tuple[List[int], List[str]]]:
+    """Groups missing intervals of several keys into queries of nodes and tags, in order of first appearance"""
+    queries: Dict[Interval, Tuple[List[int], List[str]]] = {}
+    for key, intervals in gaps.items():
+        for interval in intervals:
+            node_ids, tags = queries.setdefault(interval, ([], []))
+            if key.node_id not in node_ids:
+                node_ids.append(key.node_id)
+            if key.tag not in tags:
+                tags.append(key.tag)
+    return queries
@@ -0,0 +1,165 @@
+import datetime
+import math
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .columnar import TimeseriesColumns
+from .types.timeseries_types import TimeseriesGroup
+
+# Length in seconds of the resolutions that can be split into time slices without cutting an aggregation period.
+RESOLUTION_SECONDS: Dict[str, int] = {
+    'second': 1,
+    'minute': 60,
+    '5minute': 300,
+    '10minute': 600,
+    '15minute': 900,
+    '20minute': 1200,
+    '30minute': 1800,
+    'hour': 3600,
+}
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_EPOCH_UTC = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_RESOLUTION = datetime.timedelta(microseconds=1)
+
+
+class TimeseriesChunk(NamedTuple):
+    """
+    Attributes:
+        node_ids: The nodes to fetch in this chunk, None when no node filter was given.
+        start: The from date-time of the chunk.
+        end: The to date-time of the chunk.
+    """
+    node_ids: Optional[List[int]]
+    start: Optional[datetime.datetime]
+    end: Optional[datetime.datetime]
+
+
+def plan_timeseries_chunks(node_ids: Optional[List[int]],
+                           start: Optional[datetime.datetime] = None,
+                           end: Optional[datetime.datetime] = None,
+                           resolution: Optional[str] = None,
+                           tags_per_node: int = 1,
+                           max_nodes_per_request: Optional[int] = None,
+                           max_points_per_request: Optional[int] = None,
+                           sample_interval: Optional[float] = None
+                           ) -> List[TimeseriesChunk]:
+    """Splits a timeseries query into smaller requests
+
+    Nodes are split into batches of at most `max_nodes_per_request` nodes. If the estimated number of points of a
+    request exceeds `max_points_per_request`, fewer nodes are put in each batch, down to a single node, after which
+    the time window is split into slices. Slices start at whole multiples of the resolution and do not overlap, so no
+    aggregation period is split between two requests.
+
+    The number of points is only estimated when both `start` and `end` are given, and either `resolution` is one of
+    :data:`RESOLUTION_SECONDS` or `sample_interval` tells how often raw data is stored.
+
+    Args:
+        node_ids (Optional[List[int]]): The nodes to fetch.
+        start (Optional[datetime.datetime]): The from date-time of the query window.
+        end (Optional[datetime.datetime]): The to date-time of the query window.
+        resolution (Optional[str]): The resolution of the query.
+        tags_per_node (int): Number of tags fetched for each node.
+        max_nodes_per_request (Optional[int]): Maximum number of nodes in a single request.
+        max_points_per_request (Optional[int]): Maximum estimated number of points in a single request.
+        sample_interval (Optional[float]): Seconds between raw data points, used when no resolution is given.
+
+    Returns:
+        List[:class:`.TimeseriesChunk`] ordered by node batch, then by time.
+    """
+    interval: Optional[float] = RESOLUTION_SECONDS.get(resolution) if resolution else sample_interval
+    points_per_node: Optional[int] = None
+    if max_points_per_request and interval and start is not None and end is not None:
+        duration = max(0.0, (end - start).total_seconds())
+        points_per_node = tags_per_node * max(1, math.ceil(duration / interval))
+
+    batch_size = len(node_ids) if node_ids else 1
+    if max_nodes_per_request:
+        batch_size = min(batch_size, max_nodes_per_request)
+    if points_per_node is not None:
+        batch_size = max(1, min(batch_size, max_points_per_request // points_per_node))
+
+    batches: List[Optional[List[int]]] = [None]
+    if node_ids:
+        batches = [node_ids[i:i + batch_size] for i in range(0, len(node_ids), batch_size)]
+
+    slices: List[Tuple[Optional[datetime.datetime], Optional[datetime.datetime]]] = [(start, end)]
+    if points_per_node is not None and points_per_node > max_points_per_request:
+        slices = _split_window(start, end, interval, max(1, max_points_per_request // tags_per_node))
+
+    return [TimeseriesChunk(batch, slice_start, slice_end) for batch in batches for slice_start, slice_end in slices]
+
+
+def split_time_window(start: datetime.datetime,
+                      end: datetime.datetime,
+                      window: datetime.timedelta,
+                      resolution: Optional[str] = None
+                      ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    """Splits a query window into consecutive, non-overlapping windows of at most `window`
+
+    Raw data windows start at whole multiples of `window` since the Unix epoch. With a resolution, windows are
+    widened to whole resolution periods, resolutions of a day or longer are never split.
+
+    Args:
+        start (datetime.datetime): The from date-time of the query window.
+        end (datetime.datetime): The to date-time of the query window.
+        window (datetime.timedelta): The length of each window.
+        resolution (Optional[str]): The resolution of the query.
+
+    Returns:
+        List of (start, end) tuples, the end of a window is one microsecond before the start of the next.
+    """
+    if window <= datetime.timedelta(0):
+        raise ValueError('window must be positive')
+    if resolution is None:
+        return _split_window(start, end, window.total_seconds(), 1)
+    if resolution not in RESOLUTION_SECONDS:
+        return [(start, end)]
+    interval = RESOLUTION_SECONDS[resolution]
+    return _split_window(start, end, interval, max(1, math.ceil(window.total_seconds() / interval)))
+
+
+def _split_window(start: datetime.datetime,
+                  end: datetime.datetime,
+                  interval: float,
+                  intervals_per_slice: int
+                  ) -> List[Tuple[datetime.datetime, datetime.datetime]]:
+    epoch = _EPOCH if start.tzinfo is None else _EPOCH_UTC
+    period = datetime.timedelta(seconds=interval)
+    step = period * intervals_per_slice
+    boundary = epoch + period * math.floor((start - epoch).total_seconds() / interval) + step
+
+    slices: List[Tuple[datetime.datetime, datetime.datetime]] = []
+    slice_start = start
+    while boundary <= end:
+        slices.append((slice_start, boundary - _RESOLUTION))
+        slice_start = boundary
+        boundary += step
+    if slice_start <= end:
+        slices.append((slice_start, end))
+    return slices
+
+
+def merge_timeseries_groups(results: List[Optional[List[TimeseriesGroup]]]) -> List[TimeseriesGroup]:
+    """Stitches the results of chunked requests, given in plan order, into one group per node and tag
+
+    Results may also be lists of :class:`.TimeseriesColumns`, which are then concatenated.
+    """
+    merged: Dict[Tuple[int, str], Union[TimeseriesGroup, List[TimeseriesColumns]]] = {}
+    for groups in results:
+        for group in groups or []:
+            if isinstance(group, TimeseriesColumns):
+                merged.setdefault((group.node_id, group.tag), []).append(group)
+                continue
+            key = (group.get('node_id'), group.get('tag'))
+            if key in merged:
+                merged[key]['data'].extend(group.get('data', []))
+            else:
+                merged[key] = {
+                    'node_id': group.get('node_id'),
+                    'tag': group.get('tag'),
+                    'data': list(group.get('data', []))
+                }
+    return [
+        TimeseriesColumns.concatenate(group) if isinstance(group, list) else group
+        for group in merged.values()
+    ]
@@ -1,13 +1,11 @@
 import json
 import datetime
-from warnings import filterwarnings
-from typing import List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
-import pyrfc3339
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
 
+from .typecheck import typechecked
 from .types.timeseries_types import (
     TimeseriesResponseGroup,
     TimeseriesResponse,
@@ -17,28 +15,62 @@ from .types.timeseries_types import (
     TimeseriesData,
     StoreTimeseriesData
 )
-from .base_client import BaseClient
+from .base_client import BaseClient, _bytes_read
+from .columnar import TimeseriesColumns
+from .json_stream import iter_timeseries_events
+from .timeseries_cache import (
+    CacheKey,
+    TimeseriesCache,
+    align_interval,
+    from_microseconds,
+    group_gaps,
+    merge_intervals,
+    slice_columns,
+    to_microseconds
+)
+from .timeseries_chunking import (
+    RESOLUTION_SECONDS,
+    TimeseriesChunk,
+    merge_timeseries_groups,
+    plan_timeseries_chunks,
+    split_time_window
+)
+from .tag_registry import TimeseriesQueryPlanner
+from .timestamps import parse_timestamp, parse_timestamps
+from .timeseries_encoder import encode_timeseries
 from .utils import filter_none_values_from_dict
 
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 Response = requests.models.Response
 
+_TIMESERIES_API_PATH: str = 'timeseries'
+
+# The API docs advise against fetching 1000+ nodes in a single request.
+DEFAULT_MAX_NODES_PER_REQUEST: int = 100
+
+# Bytes read at a time, and points parsed at a time, when a response is streamed.
+STREAM_CHUNK_SIZE: int = 1 << 16
+STREAM_BATCH_SIZE: int = 10000
+
+# The node filter, start and end of a single request of a split query.
+TimeseriesRequest = Tuple[Optional[Union[int, List[int]]], Optional[datetime.datetime], Optional[datetime.datetime]]
+
 
 class TimeseriesClient(BaseClient):
     """
     A client for handling the timeseries section of EnergyView API.
     """
 
-    @beartype
+    @typechecked
     def __init__(self,
                  domain: Optional[str] = None,
                  api_key: Optional[str] = None,
-                 endpoint_url: Optional[str] = None
+                 endpoint_url: Optional[str] = None,
+                 **kwargs
                  ) -> None:
-        super().__init__(domain, api_key, endpoint_url)
-        self._timeseries_api_path: str = 'timeseries'
+        super().__init__(domain, api_key, endpoint_url, **kwargs)
+        self._timeseries_api_path: str = _TIMESERIES_API_PATH
 
-    @beartype
+    @typechecked
     def get_timeseries_data(self,
                             node_ids: Optional[Union[int, List[int]]] = None,
                             tags: Optional[Union[str, List[str]]] = None,
@@ -46,10 +78,23 @@ class TimeseriesClient(BaseClient):
                             end: Optional[datetime.datetime] = None,
                             resolution: Optional[str] = None,
                             aggregate: Optional[str] = None,
-                            epoch: Optional[bool] = False
-                            ) -> List[TimeseriesGroup]:
+                            epoch: Optional[bool] = False,
+                            max_nodes_per_request: Optional[int] = DEFAULT_MAX_NODES_PER_REQUEST,
+                            max_points_per_request: Optional[int] = None,
+                            sample_interval: Optional[float] = None,
+                            max_workers: int = 4,
+                            columnar: bool = False,
+                            raw_epoch: bool = False,
+                            cache: Optional[TimeseriesCache] = None,
+                            stream: bool = False,
+                            planner: Optional[TimeseriesQueryPlanner] = None
+                            ) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
         """Fetches all timeseries data from EnergyView API
 
+        Large queries are split into several requests, see :func:`.plan_timeseries_chunks`, which are sent in
+        parallel within the domain rate limit. The results are stitched back together into one group per node and
+        tag, in the order the nodes were given.
+
         Args:
             node_ids (Optional[Union[int,List[int]]]): Filter on one or several unique node identifiers.
             tags (Optional[Union[str,List[str]]]): Filter on one or several sensor names.
@@ -106,9 +151,32 @@ class TimeseriesClient(BaseClient):
             epoch (Optional[bool]): When set to True, the ts field will be in Unix timestamp format (numeric)
                 instead of a string. This is the number of seconds that have elapsed since the Unix epoch,
                 which is the time 00:00:00 UTC on 1 January 1970.
+                Numeric timestamps are converted in bulk to UTC datetime objects, without RFC3339 parsing.
+            max_nodes_per_request (Optional[int]): Maximum number of nodes to fetch in a single request.
+                None sends all nodes in one request.
+            max_points_per_request (Optional[int]): Maximum estimated number of data points in a single request.
+                Only used when both start and end are given, and either resolution or sample_interval is.
+            sample_interval (Optional[float]): Seconds between stored data points, used to estimate the number of
+                points when no resolution is given.
+            max_workers (int): Maximum number of requests to send in parallel when the query is split.
+            columnar (bool): Return a :class:`.TimeseriesColumns` per node and tag instead of a list of dicts per
+                data point, with timestamps as int64 nanoseconds since the Unix epoch and values as float64.
+                Use :meth:`.TimeseriesColumns.to_group` to convert back.
+            raw_epoch (bool): When used with `epoch`, keep the ts field as the numeric Unix timestamp returned by the
+                API instead of converting it to a datetime object. The data points are returned as parsed from the
+                response, which is the fastest way to fetch timeseries data.
+            cache (Optional[:class:`.TimeseriesCache`]): Serve the query from this cache, fetching only the parts of
+                the window that are not cached yet or newer than its mutable horizon. Requires `node_ids`, `tags`
+                and timezone aware `start` and `end`. Only raw data and resolutions up to an hour are cached, they
+                are fetched in whole periods. Timestamps of cached data are returned in UTC.
+            stream (bool): Read and parse the response incrementally, see :func:`.iter_timeseries_events`, instead of
+                loading the whole body and its object tree at once. Lowers the peak memory of large responses.
+            planner (Optional[:class:`.TimeseriesQueryPlanner`]): Only fetch the pairs of node and tag that exist,
+                see :meth:`.TimeseriesQueryPlanner.plan`. Nodes with different tags are fetched in separate queries,
+                the groups are returned in the order of the queries.
 
         Returns:
-            List[:class:`.TimeseriesGroup`]
+            List[:class:`.TimeseriesGroup`] or List[:class:`.TimeseriesColumns`] if `columnar` is set.
 
         Raises:
             :class:`.EVUnexpectedStatusCodeException`: Unexpected status code received.
@@ -120,51 +188,191 @@ class TimeseriesClient(BaseClient):
                 from fulfilling the request.
         """
 
-        def parse_row(row: TimeseriesResponseData) -> TimeseriesData:
-            return {
-                'ts': pyrfc3339.parse(row.get('ts')),
-                'v': row.get('v')
-            }
+        if planner is not None:
+            results = [
+                self.get_timeseries_data(
+                    query.node_ids, query.tags, start, end, resolution, aggregate, epoch, max_nodes_per_request,
+                    max_points_per_request, sample_interval, max_workers, columnar, raw_epoch, cache, stream
+                )
+                for query in planner.plan(node_ids, tags)
+            ]
+            return results[0] if len(results) == 1 else merge_timeseries_groups(results)
+
+        if cache is not None and (resolution is None or resolution in RESOLUTION_SECONDS):
+            return self._get_cached_timeseries_data(
+                cache, node_ids, tags, start, end, resolution, aggregate, columnar,
+                max_nodes_per_request=max_nodes_per_request,
+                max_points_per_request=max_points_per_request,
+                sample_interval=sample_interval,
+                max_workers=max_workers,
+                stream=stream
+            )
+
+        chunks: List[TimeseriesRequest] = _plan_timeseries_requests(
+            node_ids, tags, start, end, resolution, max_nodes_per_request, max_points_per_request, sample_interval
+        )
 
-        node_id = None
-        if isinstance(node_ids, int):
-            node_id = node_ids
-            node_ids = None
+        def get_chunk(chunk: TimeseriesRequest) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
+            chunk_node_ids, chunk_start, chunk_end = chunk
+            return self._get_timeseries_chunk(
+                chunk_node_ids, tags, chunk_start, chunk_end, resolution, aggregate, epoch, columnar, raw_epoch, stream
+            )
+
+        if len(chunks) == 1:
+            return get_chunk(chunks[0])
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return merge_timeseries_groups(list(executor.map(get_chunk, chunks)))
+
+    @typechecked
+    def iter_timeseries_data(self,
+                             node_ids: Optional[Union[int, List[int]]],
+                             tags: Optional[Union[str, List[str]]],
+                             start: datetime.datetime,
+                             end: datetime.datetime,
+                             window: datetime.timedelta = datetime.timedelta(days=1),
+                             resolution: Optional[str] = None,
+                             aggregate: Optional[str] = None,
+                             epoch: Optional[bool] = False,
+                             max_nodes_per_request: Optional[int] = DEFAULT_MAX_NODES_PER_REQUEST,
+                             columnar: bool = False,
+                             raw_epoch: bool = False
+                             ) -> Iterator[Union[TimeseriesGroup, TimeseriesColumns]]:
+        """Fetches timeseries data one time window at a time
+
+        Unlike :meth:`get_timeseries_data`, which holds the whole result in memory, a request is only sent when the
+        previous window has been consumed, so long exports run in bounded memory. Windows are fetched in time order,
+        for each window the nodes are fetched in batches of `max_nodes_per_request`.
+
+        Example::
+
+            for group in client.iter_timeseries_data([1, 2], 'outdoortemp', start, end):
+                writer.writerows((group['node_id'], row['ts'], row['v']) for row in group['data'])
 
-        tag = None
-        if isinstance(tags, str):
-            tag = tags
-            tags = None
+        Args:
+            node_ids (Optional[Union[int,List[int]]]): Filter on one or several unique node identifiers.
+            tags (Optional[Union[str,List[str]]]): Filter on one or several sensor names.
+            start (datetime.datetime): The from date-time of the export.
+            end (datetime.datetime): The to date-time of the export.
+            window (datetime.timedelta): The length of time fetched per request, see :func:`.split_time_window`.
+            resolution (Optional[str]): See :meth:`get_timeseries_data`.
+            aggregate (Optional[str]): See :meth:`get_timeseries_data`.
+            epoch (Optional[bool]): See :meth:`get_timeseries_data`.
+            max_nodes_per_request (Optional[int]): Maximum number of nodes to fetch in a single request.
+            columnar (bool): See :meth:`get_timeseries_data`.
+            raw_epoch (bool): See :meth:`get_timeseries_data`.
+
+        Yields:
+            :class:`.TimeseriesGroup`, or :class:`.TimeseriesColumns` if `columnar` is set, with the data of one node
+            and tag within one window. A node and tag is yielded once per window in which it has data.
 
-        response: Response = self._session.get(
+        Raises:
+            :class:`.EVUnexpectedStatusCodeException`: Unexpected status code received.
+            :class:`.EVBadRequestException`: Sent request had insufficient data or invalid options.
+            :class:`.EVUnauthorizedException`: Request was refused due to lacking authentication credentials.
+            :class:`.EVForbiddenException`: Server understands the request but refuses to authorize it.
+            :class:`.EVTooManyRequestsException`: Sent too many requests in a given amount of time.
+            :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
+                from fulfilling the request.
+        """
+        for window_start, window_end in split_time_window(start, end, window, resolution):
+            batches: List[Optional[Union[int, List[int]]]] = [node_ids]
+            if isinstance(node_ids, list):
+                batches = [chunk.node_ids for chunk in plan_timeseries_chunks(
+                    node_ids, max_nodes_per_request=max_nodes_per_request
+                )]
+            for batch in batches:
+                yield from self._get_timeseries_chunk(
+                    batch, tags, window_start, window_end, resolution, aggregate, epoch, columnar, raw_epoch
+                )
+
+    def _get_cached_timeseries_data(self,
+                                    cache: TimeseriesCache,
+                                    node_ids: Optional[Union[int, List[int]]],
+                                    tags: Optional[Union[str, List[str]]],
+                                    start: Optional[datetime.datetime],
+                                    end: Optional[datetime.datetime],
+                                    resolution: Optional[str],
+                                    aggregate: Optional[str],
+                                    columnar: bool,
+                                    **kwargs
+                                    ) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
+        if node_ids is None or tags is None or start is None or end is None:
+            raise ValueError('cached timeseries queries need node_ids, tags, start and end')
+        node_ids = node_ids if isinstance(node_ids, list) else [node_ids]
+        tags = tags if isinstance(tags, list) else [tags]
+        # The API window is inclusive, the cache works with half-open intervals.
+        window: Tuple[int, int] = (to_microseconds(start), to_microseconds(end) + 1)
+        keys: List[CacheKey] = [
+            CacheKey(self._url, node_id, tag, resolution, aggregate) for node_id in node_ids for tag in tags
+        ]
+
+        horizon: int = cache.horizon()
+        gaps = {
+            key: merge_intervals([align_interval(*gap, resolution) for gap in cache.missing(key, *window)])
+            for key in keys
+        }
+        fresh: Dict[CacheKey, List[TimeseriesColumns]] = {}
+        for (gap_start, gap_end), (gap_node_ids, gap_tags) in group_gaps(gaps).items():
+            groups: List[TimeseriesColumns] = self.get_timeseries_data(
+                gap_node_ids, gap_tags, from_microseconds(gap_start), from_microseconds(gap_end - 1),
+                resolution, aggregate, epoch=True, columnar=True, **kwargs
+            )
+            fetched = {(group.node_id, group.tag): group for group in groups}
+            for node_id in gap_node_ids:
+                for tag in gap_tags:
+                    key = CacheKey(self._url, node_id, tag, resolution, aggregate)
+                    group = fetched.get((node_id, tag))
+                    cache.update(key, gap_start, gap_end, group, horizon)
+                    if group is not None and (gap_start, gap_end) in gaps.get(key, []):
+                        fresh.setdefault(key, []).append(group)
+
+        start_ns, end_ns = max(window[0], horizon) * 1000, window[1] * 1000
+        result: List[TimeseriesColumns] = []
+        for key in keys:
+            parts: List[TimeseriesColumns] = [cache.read(key, *window)]
+            # Data past the mutable horizon is not cached, take it from this query's responses.
+            parts.extend(slice_columns(group, start_ns, end_ns) for group in fresh.get(key, []))
+            columns = TimeseriesColumns.concatenate(parts)
+            if len(columns):
+                result.append(columns)
+
+        if columnar:
+            return result
+        return [columns.to_group() for columns in result]
+
+    def _get_timeseries_chunk(self,
+                              node_ids: Optional[Union[int, List[int]]],
+                              tags: Optional[Union[str, List[str]]],
+                              start: Optional[datetime.datetime],
+                              end: Optional[datetime.datetime],
+                              resolution: Optional[str],
+                              aggregate: Optional[str],
+                              epoch: Optional[bool],
+                              columnar: bool = False,
+                              raw_epoch: bool = False,
+                              stream: bool = False
+                              ) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
+        response: Response = self._request(
+            'GET',
             url=f'{self._url}/{self._timeseries_api_path}',
-            params=filter_none_values_from_dict({
-                'node_id': node_id,
-                'node_ids': json.dumps(node_ids) if node_ids else None,
-                'tag': tag,
-                'tags': json.dumps(tags) if tags else None,
-                'start': start.isoformat() if start is not None else None,
-                'end': end.isoformat() if end is not None else None,
-                'resolution': resolution,
-                'aggregate': aggregate,
-                'epoch': 1 if epoch else None,
-            })
+            params=_timeseries_query_params(node_ids, tags, start, end, resolution, aggregate, epoch),
+            stream=stream
         )
-
-        r: TimeseriesResponse = self._process_response(response)
-        if r is None:
-            return []
-
-        timeseries: List[TimeseriesResponseGroup] = r.get('timeseries', [])
-        if timeseries is not None:
-            timeseries: List[TimeseriesGroup] = [{
-                'node_id': obj.get('node_id'),
-                "tag": obj.get('tag'),
-                'data': [parse_row(row) for row in obj.get('data', [])]
-            } for obj in timeseries]
-        return timeseries
-
-    @beartype
+        if stream and response.status_code < 400:
+            trace = self._pop_trace(response)
+            with response:
+                events = iter_timeseries_events(
+                    response.iter_content(chunk_size=STREAM_CHUNK_SIZE), self._json_codec.loads
+                )
+                result = _parse_timeseries_stream(events, columnar, raw_epoch)
+            if trace is not None:
+                # The body is read while it is parsed, decoding can not be timed on its own.
+                self._finish_trace(trace, bytes_in=_bytes_read(response), total=trace.elapsed())
+            return result
+
+        return _parse_timeseries_response(self._process_response(response), columnar, raw_epoch)
+
+    @typechecked
     def store_timeseries_data(self,
                               node_id: int,
                               tag: str,
@@ -194,36 +402,28 @@ class TimeseriesClient(BaseClient):
             :class:`.EVInternalServerException`: Server encountered an unexpected condition that prevented it
                 from fulfilling the request.
         """
-        response: Response = self._session.post(
+        response: Response = self._request(
+            'POST',
             url=f'{self._url}/{self._timeseries_api_path}',
-            data=filter_none_values_from_dict({
-                'node_id': node_id,
-                'tag': tag,
-                'val': val,
-                'ts': ts.isoformat() if ts is not None else None,
-                'silent': 'true' if silent else None
-            })
+            data=_store_timeseries_body(node_id, tag, val, ts, silent)
         )
         if silent:
+            # The response is not decoded, the hooks are still told about it.
+            self._finish_trace(self._pop_trace(response))
             return None
         response_data: StoreTimeseriesResponse = self._process_response(response)
-        return {
-            'node_id': response_data['node_id'],
-            'tag': response_data['tag'],
-            'value': response_data['value'],
-            'ts': pyrfc3339.parse(response_data['ts'])
-        }
+        return _parse_store_timeseries_response(response_data)
 
-    @beartype
+    @typechecked
     def store_multiple_timeseries_data(self,
-                                       timeseries: List[TimeseriesGroup],
+                                       timeseries: List[Union[TimeseriesGroup, TimeseriesColumns]],
                                        overwrite: Optional[bool] = False,
                                        silent: Optional[bool] = True,
                                        ) -> Optional[List[TimeseriesGroup]]:
         """Store multiple data points in multiple timeseries from EnergyView API
 
         Args:
-            timeseries (List[TimeseriesGroup]): A list of timeseries objects::
+            timeseries (List[Union[TimeseriesGroup, TimeseriesColumns]]): A list of timeseries objects::
 
                 [
                     {
@@ -239,6 +439,8 @@ class TimeseriesClient(BaseClient):
                     }
                 ]
 
+                Timestamps may also be RFC3339 strings or Unix timestamps in seconds, and groups may be
+                :class:`.TimeseriesColumns`.
             overwrite (Optional[bool]): Deletes all datapoints between the lowest and highest ts (a >= x AND a <= y),
                 for each node_id and corresponding tag. Then inserts all the new datapoints.
             silent (Optional[bool]): When set to true a call will only reply with status code 201 Created and an empty
@@ -257,30 +459,192 @@ class TimeseriesClient(BaseClient):
                 from fulfilling the request.
         """
 
-        def parse_row(row: TimeseriesResponseData) -> TimeseriesData:
-            return {
-                'ts': pyrfc3339.parse(row.get('ts')),
-                'v': row.get('v')
-            }
-
-        response: Response = self._session.post(
+        response: Response = self._request(
+            'POST',
             url=f'{self._url}/{self._timeseries_api_path}',
-            data=filter_none_values_from_dict({
-                'timeseries': json.dumps(timeseries),
-                'overwrite': "replace_window" if overwrite is True else None,
-                'silent': 'true' if silent else None
-            })
+            data=_store_multiple_timeseries_body(timeseries, overwrite, silent)
         )
 
-        r: TimeseriesResponse = self._process_response(response)
-        if r is None or silent:
-            return None
-
-        timeseries: List[TimeseriesResponseGroup] = r.get('timeseries')
-        if timeseries is not None:
-            timeseries: List[TimeseriesGroup] = [{
-                'node_id': obj.get('node_id'),
-                'tag': obj.get('tag'),
-                'data': [parse_row(row) for row in obj.get('data', [])]
-            } for obj in timeseries]
-        return timeseries
+        return _parse_store_multiple_timeseries_response(self._process_response(response), silent)
+
+
+def _plan_timeseries_requests(node_ids: Optional[Union[int, List[int]]],
+                              tags: Optional[Union[str, List[str]]],
+                              start: Optional[datetime.datetime],
+                              end: Optional[datetime.datetime],
+                              resolution: Optional[str],
+                              max_nodes_per_request: Optional[int],
+                              max_points_per_request: Optional[int],
+                              sample_interval: Optional[float]
+                              ) -> List[TimeseriesRequest]:
+    """Splits a timeseries query into the node filter and time window of each request, see
+    :func:`.plan_timeseries_chunks`"""
+    # A single node or no node filter is planned as one batch, so long windows are still sliced in time.
+    chunks: List[TimeseriesChunk] = plan_timeseries_chunks(
+        node_ids if isinstance(node_ids, list) or node_ids is None else [node_ids],
+        start,
+        end,
+        resolution,
+        tags_per_node=len(tags) if isinstance(tags, list) else 1,
+        max_nodes_per_request=max_nodes_per_request,
+        max_points_per_request=max_points_per_request,
+        sample_interval=sample_interval
+    )
+    if len(chunks) <= 1:
+        return [(node_ids, start, end)]
+    # The original int or None filter is sent for each time slice.
+    return [(chunk.node_ids if isinstance(node_ids, list) else node_ids, chunk.start, chunk.end) for chunk in chunks]
+
+
+def _timeseries_query_params(node_ids: Optional[Union[int, List[int]]],
+                             tags: Optional[Union[str, List[str]]],
+                             start: Optional[datetime.datetime],
+                             end: Optional[datetime.datetime],
+                             resolution: Optional[str],
+                             aggregate: Optional[str],
+                             epoch: Optional[bool]
+                             ) -> Dict[str, Any]:
+    node_id = None
+    if isinstance(node_ids, int):
+        node_id = node_ids
+        node_ids = None
+
+    tag = None
+    if isinstance(tags, str):
+        tag = tags
+        tags = None
+
+    return filter_none_values_from_dict({
+        'node_id': node_id,
+        'node_ids': json.dumps(node_ids) if node_ids else None,
+        'tag': tag,
+        'tags': json.dumps(tags) if tags else None,
+        'start': start.isoformat() if start is not None else None,
+        'end': end.isoformat() if end is not None else None,
+        'resolution': resolution,
+        'aggregate': aggregate,
+        'epoch': 1 if epoch else None,
+    })
+
+
+def _store_timeseries_body(node_id: int,
+                           tag: str,
+                           val: float,
+                           ts: datetime.datetime,
+                           silent: Optional[bool]
+                           ) -> Dict[str, Any]:
+    return filter_none_values_from_dict({
+        'node_id': node_id,
+        'tag': tag,
+        'val': val,
+        'ts': ts.isoformat() if ts is not None else None,
+        'silent': 'true' if silent else None
+    })
+
+
+def _store_multiple_timeseries_body(timeseries: List[Union[TimeseriesGroup, TimeseriesColumns]],
+                                    overwrite: Optional[bool],
+                                    silent: Optional[bool]
+                                    ) -> Dict[str, Any]:
+    return filter_none_values_from_dict({
+        'timeseries': encode_timeseries(timeseries),
+        'overwrite': "replace_window" if overwrite is True else None,
+        'silent': 'true' if silent else None
+    })
+
+
+def _parse_rows(rows: List[TimeseriesResponseData], raw_epoch: bool = False) -> List[TimeseriesData]:
+    if not rows or isinstance(rows[0].get('ts'), str):
+        timestamps = parse_timestamps([row.get('ts') for row in rows])
+        return [{'ts': ts, 'v': row.get('v')} for ts, row in zip(timestamps, rows)]
+    # Epoch timestamps, skip RFC3339 parsing entirely
+    if raw_epoch:
+        return rows
+    fromtimestamp = datetime.datetime.fromtimestamp
+    utc = datetime.timezone.utc
+    return [{'ts': fromtimestamp(row['ts'], utc), 'v': row.get('v')} for row in rows]
+
+
+def _parse_timeseries_groups(timeseries: Optional[List[TimeseriesResponseGroup]],
+                             columnar: bool = False,
+                             raw_epoch: bool = False
+                             ) -> Optional[Union[List[TimeseriesGroup], List[TimeseriesColumns]]]:
+    if timeseries is None:
+        return None
+    if columnar:
+        return [TimeseriesColumns.from_response_group(obj) for obj in timeseries]
+    return [{
+        'node_id': obj.get('node_id'),
+        'tag': obj.get('tag'),
+        'data': _parse_rows(obj.get('data', []), raw_epoch)
+    } for obj in timeseries]
+
+
+def _parse_timeseries_response(r: Optional[TimeseriesResponse],
+                               columnar: bool = False,
+                               raw_epoch: bool = False
+                               ) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
+    if r is None:
+        return []
+    return _parse_timeseries_groups(r.get('timeseries', []), columnar, raw_epoch)
+
+
+def _parse_store_multiple_timeseries_response(r: Optional[TimeseriesResponse],
+                                              silent: Optional[bool]
+                                              ) -> Optional[List[TimeseriesGroup]]:
+    if r is None or silent:
+        return None
+    return _parse_timeseries_groups(r.get('timeseries'))
+
+
+def _parse_timeseries_stream(events: Iterator[Tuple[str, Any]],
+                             columnar: bool = False,
+                             raw_epoch: bool = False
+                             ) -> Union[List[TimeseriesGroup], List[TimeseriesColumns]]:
+    groups: List[Union[TimeseriesGroup, TimeseriesColumns]] = []
+    header: Dict[str, Any] = {}
+    parts: List[Any] = []
+    batch: List[TimeseriesResponseData] = []
+
+    def flush() -> None:
+        # Parse the raw points in batches, so only one batch of them is alive at a time.
+        if columnar:
+            parts.append(TimeseriesColumns.from_response_group({'data': batch}))
+        else:
+            parts.extend(_parse_rows(batch, raw_epoch))
+        batch.clear()
+
+    for event, value in events:
+        if event == 'data':
+            batch.extend(value)
+            if len(batch) >= STREAM_BATCH_SIZE:
+                flush()
+        elif event == 'field':
+            header[value[0]] = value[1]
+        elif event == 'start':
+            header, parts = {}, []
+        elif event == 'end':
+            if batch or not parts:
+                flush()
+            groups.append(_streamed_group(header, parts, columnar))
+    return groups
+
+
+def _streamed_group(header: Dict[str, Any],
+                    parts: List[Any],
+                    columnar: bool
+                    ) -> Union[TimeseriesGroup, TimeseriesColumns]:
+    if not columnar:
+        return {'node_id': header.get('node_id'), 'tag': header.get('tag'), 'data': parts}
+    columns = TimeseriesColumns.concatenate(parts)
+    columns.node_id, columns.tag = header.get('node_id'), header.get('tag')
+    return columns
+
+
+def _parse_store_timeseries_response(response_data: StoreTimeseriesResponse) -> StoreTimeseriesData:
+    return {
+        'node_id': response_data['node_id'],
+        'tag': response_data['tag'],
+        'value': response_data['value'],
+        'ts': parse_timestamp(response_data['ts'])
+    }
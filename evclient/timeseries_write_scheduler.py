@@ -0,0 +1,145 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Deque, Dict, List, Set, Tuple, Union
+
+from .columnar import TimeseriesColumns
+from .types.timeseries_types import TimeseriesGroup
+
+Group = Union[TimeseriesGroup, TimeseriesColumns]
+
+
+class TimeseriesWriteScheduler:
+    """Stores timeseries groups concurrently without two writes to the same node and tag in flight
+
+    Concurrent stores to the same measurement lock each other in EnergyView, while stores to different node and tag
+    pairs can proceed in parallel. Submitted groups are therefore queued per (node_id, tag): each key has at most one
+    request in flight, and different keys are written by up to `max_workers` threads. The client's rate limiter still
+    applies, so the domain limit is never exceeded.
+
+    Groups queued for the same key while a write is in flight are sent together in the next request. Keys are served
+    in turns, a busy key does not hold on to a worker thread.
+
+    Example::
+
+        with TimeseriesWriteScheduler(client) as scheduler:
+            scheduler.store(timeseries)
+    """
+
+    def __init__(self, client, max_workers: int = 10, overwrite: bool = False) -> None:
+        """
+        Args:
+            client (TimeseriesClient): The client used to store the groups.
+            max_workers (int): Maximum number of requests in flight.
+            overwrite (bool): Passed on to :meth:`.TimeseriesClient.store_multiple_timeseries_data`. Queued groups
+                are then sent one request each, since every request replaces its own time window.
+        """
+        if max_workers < 1:
+            raise ValueError('max_workers must be at least 1')
+        self._client = client
+        self.overwrite: bool = overwrite
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='TimeseriesWriteScheduler')
+        self._lock = threading.Lock()
+        self._pending: Dict[Tuple[int, str], Deque[Tuple[Group, Future]]] = {}
+        self._in_flight: Set[Tuple[int, str]] = set()
+        self._futures: Set[Future] = set()
+
+    def __enter__(self) -> 'TimeseriesWriteScheduler':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def submit(self, timeseries: List[Group]) -> List[Future]:
+        """Queue groups for storing without waiting
+
+        Args:
+            timeseries (List[Union[TimeseriesGroup, TimeseriesColumns]]): The groups to store.
+
+        Returns:
+            One :class:`concurrent.futures.Future` per group, in the same order, resolved with None once the group is
+            stored or with the exception raised by the client.
+        """
+        futures: List[Future] = []
+        ready: List[Tuple[int, str]] = []
+        with self._lock:
+            for group in timeseries:
+                key = _group_key(group)
+                future: Future = Future()
+                future.add_done_callback(self._forget)
+                self._futures.add(future)
+                self._pending.setdefault(key, deque()).append((group, future))
+                futures.append(future)
+                if key not in self._in_flight:
+                    self._in_flight.add(key)
+                    ready.append(key)
+        for key in ready:
+            self._executor.submit(self._write, key)
+        return futures
+
+    def store(self, timeseries: List[Group]) -> None:
+        """Store groups and wait until all of them are stored
+
+        Args:
+            timeseries (List[Union[TimeseriesGroup, TimeseriesColumns]]): The groups to store.
+
+        Raises:
+            Exception: The first exception raised by the client, once all groups have been attempted.
+        """
+        futures = self.submit(timeseries)
+        wait(futures)
+        for future in futures:
+            future.result()
+
+    def flush(self) -> None:
+        """Wait until all submitted groups have been attempted"""
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+
+    def close(self) -> None:
+        """Wait for the submitted groups and stop the worker threads"""
+        self.flush()
+        self._executor.shutdown()
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._futures.discard(future)
+
+    def _write(self, key: Tuple[int, str]) -> None:
+        with self._lock:
+            queue = self._pending[key]
+            if self.overwrite:
+                batch = [queue.popleft()]
+            else:
+                batch = list(queue)
+                queue.clear()
+
+        error = None
+        try:
+            self._client.store_multiple_timeseries_data(
+                [group for group, _ in batch],
+                overwrite=self.overwrite,
+                silent=True
+            )
+        except Exception as e:
+            error = e
+
+        with self._lock:
+            if queue:
+                # Requeue the key behind the other keys instead of draining it on this thread.
+                self._executor.submit(self._write, key)
+            else:
+                del self._pending[key]
+                self._in_flight.discard(key)
+        for _, future in batch:
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+
+def _group_key(group: Group) -> Tuple[int, str]:
+    if isinstance(group, TimeseriesColumns):
+        return group.node_id, group.tag
+    return group.get('node_id'), group.get('tag')
@@ -0,0 +1,172 @@
+import datetime
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .types.timeseries_types import TimeseriesData, TimeseriesGroup
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling the flush thread to send what is buffered and exit.
+_STOP = object()
+
+
+class _FlushMarker:
+    __slots__ = ('done',)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class TimeseriesWriter:
+    """Buffers single data points and stores them in batches with
+    :meth:`.TimeseriesClient.store_multiple_timeseries_data`
+
+    Points are grouped by node and tag, a batch is sent when it holds `max_batch_points` points or when its oldest
+    point has waited `flush_interval` seconds. Batches are sent from a background thread, so :meth:`write` only
+    blocks when `max_queue_size` points are waiting to be sent, which applies backpressure to fast producers.
+
+    Example::
+
+        with TimeseriesWriter(client) as writer:
+            for node_id, tag, val, ts in readings:
+                writer.write(node_id, tag, val, ts)
+    """
+
+    def __init__(self,
+                 client,
+                 max_batch_points: int = 1000,
+                 flush_interval: float = 5.0,
+                 max_queue_size: int = 10000,
+                 overwrite: bool = False,
+                 on_error: Optional[Callable[[Exception, List[TimeseriesGroup]], None]] = None
+                 ) -> None:
+        """
+        Args:
+            client (TimeseriesClient): The client used to store the batches.
+            max_batch_points (int): Number of buffered points that triggers a flush.
+            flush_interval (float): Maximum number of seconds a point is buffered before it is sent.
+            max_queue_size (int): Maximum number of points waiting to be sent, :meth:`write` blocks when reached.
+            overwrite (bool): Passed on to :meth:`.TimeseriesClient.store_multiple_timeseries_data`.
+            on_error (Optional[Callable[[Exception, List[TimeseriesGroup]], None]]): Called with the exception and
+                the batch when a batch could not be stored. Failed batches are logged and dropped by default.
+        """
+        if max_batch_points < 1:
+            raise ValueError('max_batch_points must be at least 1')
+        if flush_interval <= 0:
+            raise ValueError('flush_interval must be positive')
+        self._client = client
+        self.max_batch_points: int = max_batch_points
+        self.flush_interval: float = flush_interval
+        self.overwrite: bool = overwrite
+        self._on_error: Optional[Callable[[Exception, List[TimeseriesGroup]], None]] = on_error
+        self._queue: queue.Queue = queue.Queue(max_queue_size)
+        self._closed: bool = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='TimeseriesWriter', daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> 'TimeseriesWriter':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def write(self,
+              node_id: int,
+              tag: str,
+              val: Optional[float],
+              ts: datetime.datetime,
+              timeout: Optional[float] = None
+              ) -> None:
+        """Buffer a single data point
+
+        Args:
+            node_id (int): Domain-unique id for the node.
+            tag (str): The name of the tag / sensor as declared in EnergyView.
+            val (Optional[float]): The value to store.
+            ts (datetime): The date time of the data point.
+            timeout (Optional[float]): Maximum number of seconds to wait for room in the queue, waits forever
+                if None.
+
+        Raises:
+            ValueError: The writer is closed.
+            queue.Full: No room was made in the queue within `timeout` seconds.
+        """
+        with self._close_lock:
+            # Checked and queued together, a point written while the writer closes could otherwise land behind the
+            # stop sentinel, after the flush thread has exited.
+            if self._closed:
+                raise ValueError('write to closed TimeseriesWriter')
+            self._queue.put((node_id, tag, {'ts': ts, 'v': val}), timeout=timeout)
+
+    def flush(self) -> None:
+        """Block until all points written before the call have been sent"""
+        if self._closed:
+            return
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        # The marker is never handled if the writer is closed concurrently, stop waiting once the thread exits.
+        while not marker.done.wait(0.1) and self._thread.is_alive():
+            pass
+
+    def close(self) -> None:
+        """Send the buffered points and stop the background thread, the writer can not be used afterwards"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        pending: Dict[Tuple[int, str], List[TimeseriesData]] = {}
+        points = 0
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                node_id, tag, row = item
+                pending.setdefault((node_id, tag), []).append(row)
+                points += 1
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if points < self.max_batch_points:
+                    continue
+
+            if pending:
+                self._send(pending)
+                pending = {}
+                points = 0
+                deadline = None
+            if isinstance(item, _FlushMarker):
+                item.done.set()
+            elif item is _STOP:
+                return
+
+    def _send(self, pending: Dict[Tuple[int, str], List[TimeseriesData]]) -> None:
+        batch: List[TimeseriesGroup] = [
+            {'node_id': node_id, 'tag': tag, 'data': data}
+            for (node_id, tag), data in pending.items()
+        ]
+        try:
+            self._client.store_multiple_timeseries_data(batch, overwrite=self.overwrite, silent=True)
+        except Exception as e:
+            if self._on_error is None:
+                logger.exception(f'Failed to store {len(batch)} timeseries')
+                return
+            try:
+                self._on_error(e, batch)
+            except Exception:
+                logger.exception('TimeseriesWriter on_error callback failed')
@@ -0,0 +1,64 @@
+import datetime
+from typing import Iterable, List
+
+# Lengths of 'YYYY-MM-DDTHH:MM:SS[.fff|.ffffff]+HH:MM', the shapes datetime.fromisoformat accepts on Python 3.7+.
+_ISO_LENGTHS = frozenset((25, 29, 32))
+_fromisoformat = datetime.datetime.fromisoformat
+
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    """Parses an RFC3339 timestamp as returned by EnergyView API
+
+    Timestamps with a numeric UTC offset, or 'Z', and zero, three or six fraction digits are parsed by
+    :meth:`datetime.datetime.fromisoformat`. Any other string falls back to :func:`pyrfc3339.parse`, so the result
+    is the same as before, only faster.
+
+    Args:
+        value (str): The RFC3339 timestamp.
+
+    Returns:
+        :class:`datetime.datetime` with a fixed UTC offset. Timestamps in UTC share :data:`datetime.timezone.utc`.
+
+    Raises:
+        ValueError: If the value is not a valid RFC3339 timestamp.
+    """
+    iso = value[:-1] + '+00:00' if value[-1:] in ('Z', 'z') else value
+    if len(iso) in _ISO_LENGTHS and iso[10] in ('T', 't'):
+        try:
+            return _fromisoformat(iso)
+        except ValueError:
+            pass
+    # Imported on first use, pyrfc3339 is only needed for unusual timestamps and imports pytz.
+    import pyrfc3339
+
+    return pyrfc3339.parse(value)
+
+
+def parse_timestamps(values: Iterable[str]) -> List[datetime.datetime]:
+    """Parses many RFC3339 timestamps, e.g. all timestamps of a timeseries response
+
+    Same as calling :func:`parse_timestamp` for each value, but much faster for the usual response where all
+    timestamps share one format and a few UTC offsets: the shape is checked once per distinct length and offset
+    suffix, after which all values are parsed in a single pass.
+
+    Args:
+        values (Iterable[str]): The RFC3339 timestamps.
+
+    Returns:
+        List[:class:`datetime.datetime`] in the order of `values`.
+
+    Raises:
+        ValueError: If a value is not a valid RFC3339 timestamp.
+    """
+    values = list(values)
+    if all(_is_iso_shape(length, offset) for length, offset in {(len(value), value[-6:]) for value in values}):
+        try:
+            return list(map(_fromisoformat, values))
+        except ValueError:
+            pass
+    return [parse_timestamp(value) for value in values]
+
+
+def _is_iso_shape(length: int, offset: str) -> bool:
+    # 'Z' suffixes are rejected by fromisoformat before Python 3.11, those values go through parse_timestamp.
+    return length in _ISO_LENGTHS and offset[0] in ('+', '-') and offset[3] == ':'
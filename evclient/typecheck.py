@@ -0,0 +1,55 @@
+import functools
+import os
+import types
+from typing import Any, Callable, Dict, TypeVar
+from warnings import filterwarnings
+
+TYPE_CHECKS_ENV = 'EV_TYPE_CHECKS'
+
+F = TypeVar('F', bound=Callable[..., Any])
+
+_unchecked_methods: Dict[type, Dict[str, Callable]] = {}
+
+
+def type_checks_enabled() -> bool:
+    """Returns False if the EV_TYPE_CHECKS environment variable is 0, false, no or off"""
+    return os.environ.get(TYPE_CHECKS_ENV, '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
+
+@functools.lru_cache(maxsize=None)
+def _beartype() -> Callable:
+    # beartype is only imported when type checks are enabled.
+    from beartype import beartype
+    from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
+
+    filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
+    return beartype
+
+
+def typechecked(func: F) -> F:
+    """Checks the argument and return types of `func` at runtime with beartype
+
+    The check is left out entirely if EV_TYPE_CHECKS is off when evclient is imported. The unchecked function is kept
+    in `__unchecked__`, for clients created with `type_checks=False`.
+    """
+    if not type_checks_enabled():
+        return func
+    checked = _beartype()(func)
+    if checked is not func:
+        checked.__unchecked__ = func
+    return checked
+
+
+def disable_type_checks(client: Any) -> None:
+    """Binds the unchecked versions of the type checked methods of `client` to the instance"""
+    cls = type(client)
+    methods = _unchecked_methods.get(cls)
+    if methods is None:
+        methods = {}
+        for name in dir(cls):
+            unchecked = getattr(getattr(cls, name, None), '__unchecked__', None)
+            if unchecked is not None and name != '__init__':
+                methods[name] = unchecked
+        _unchecked_methods[cls] = methods
+    for name, method in methods.items():
+        setattr(client, name, types.MethodType(method, client))
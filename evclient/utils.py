@@ -1,12 +1,8 @@
 from typing import Dict
-from warnings import filterwarnings
 
-from beartype import beartype
-from beartype.roar import BeartypeDecorHintPep585DeprecationWarning
+from .typecheck import typechecked
 
-filterwarnings("ignore", category=BeartypeDecorHintPep585DeprecationWarning)
 
-
-@beartype
+@typechecked
 def filter_none_values_from_dict(target) -> Dict:
     return {k: v for k, v in target.items() if v is not None}
@@ -27,6 +27,11 @@ setup(
     scripts=[],
     packages=['evclient'],
     install_requires=requires,
+    extras_require={
+        'async': ['aiohttp'],
+        'numpy': ['numpy'],
+        'orjson': ['orjson'],
+    },
     license='MIT License',
     python_requires='>= 3.7',
     classifiers=[
@@ -0,0 +1,203 @@
+import asyncio
+import datetime
+import unittest
+from typing import Any, Dict, List
+
+import pyrfc3339
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:  # pragma: no cover
+    web = None
+
+from evclient import (
+    AsyncEVClient,
+    MetricsCollector,
+    RetryPolicy,
+    EVNotFoundException,
+    EVInternalServerException,
+    TimeseriesGroup
+)
+
+
+@unittest.skipIf(web is None, 'aiohttp is not installed')
+@unittest.skipIf(not hasattr(unittest, 'IsolatedAsyncioTestCase'), 'requires Python 3.8 or higher')
+class TestAsyncEVClient(getattr(unittest, 'IsolatedAsyncioTestCase', unittest.TestCase)):
+    async def asyncSetUp(self) -> None:
+        self.requests: List[Dict[str, Any]] = []
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.fail_count: int = 0
+
+        app = web.Application()
+        app.router.add_route('*', '/{domain}/api/v1/{path:.*}', self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.client: AsyncEVClient = AsyncEVClient(
+            domain='test',
+            api_key='123456789',
+            endpoint_url=str(self.server.make_url('')).rstrip('/'),
+            rate_limit=None,
+            max_concurrency=2
+        )
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+        await self.server.close()
+
+    async def handle(self, request: 'web.Request') -> 'web.Response':
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            path: str = request.match_info['path']
+            self.requests.append({
+                'method': request.method,
+                'path': path,
+                'query': dict(request.query),
+                'form': dict(await request.post()) if request.method in ('POST', 'PUT') else None,
+                'auth': request.headers.get('Authorization'),
+                'encoding': request.headers.get('Content-Encoding')
+            })
+            if path == 'nodes':
+                return web.json_response({'nodes': [{'id': 1}]})
+            if path == 'timeseries' and request.method == 'GET':
+                return web.json_response({'timeseries': [{
+                    'node_id': 1,
+                    'tag': 'outdoortemp',
+                    'data': [{'v': 2.6, 'ts': '2020-01-01T00:05:57+01:00'}]
+                }]})
+            if path.startswith('settings'):
+                return web.json_response({'value': '1'})
+            if path == 'flaky':
+                self.fail_count += 1
+                if self.fail_count < 3:
+                    return web.Response(status=503)
+                return web.json_response({'ok': True})
+            if path == 'broken':
+                return web.Response(status=500)
+            return web.json_response({'error': 'No such thing'}, status=404)
+        finally:
+            self.in_flight -= 1
+
+    async def test_get_nodes(self) -> None:
+        self.assertEqual(await self.client.get_nodes(), [{'id': 1}])
+        self.assertEqual(self.requests[0]['auth'], 'Key 123456789')
+
+    async def test_get_timeseries_data(self) -> None:
+        res: List[TimeseriesGroup] = await self.client.get_timeseries_data(node_ids=[1, 2], tags='outdoortemp')
+
+        self.assertEqual(res, [{
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [{'v': 2.6, 'ts': pyrfc3339.parse('2020-01-01T00:05:57+01:00')}]
+        }])
+        self.assertEqual(self.requests[0]['query'], {'node_ids': '[1, 2]', 'tag': 'outdoortemp'})
+
+    async def test_get_timeseries_data_chunked(self) -> None:
+        res: List[TimeseriesGroup] = await self.client.get_timeseries_data(
+            node_ids=[1, 2, 3], tags='outdoortemp', max_nodes_per_request=2
+        )
+
+        self.assertEqual(len(res), 1)
+        self.assertEqual(len(res[0]['data']), 2)
+        self.assertEqual(
+            sorted(request['query']['node_ids'] for request in self.requests),
+            ['[1, 2]', '[3]']
+        )
+
+    async def test_store_timeseries_data_silent(self) -> None:
+        ts = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+        with self.subTest('silent stores do not decode the response'):
+            self.assertIsNone(await self.client.store_timeseries_data(1, 'outdoortemp', 2.6, ts))
+
+        with self.subTest('errors are raised otherwise'):
+            with self.assertRaises(EVNotFoundException):
+                await self.client.store_timeseries_data(1, 'outdoortemp', 2.6, ts, silent=False)
+
+    async def test_store_settings(self) -> None:
+        res: Dict[str, str] = await self.client.store_settings('node', 1, 'coco', '1', force=True)
+
+        self.assertEqual(res, {'value': '1'})
+        self.assertEqual(self.requests[0]['method'], 'PUT')
+        self.assertEqual(self.requests[0]['path'], 'settings/node/1')
+        self.assertEqual(self.requests[0]['form'], {'path': 'coco', 'value': '1', 'force': '1'})
+
+    async def test_store_settings_compressed(self) -> None:
+        self.client._request_compression = 'gzip'
+        self.client._compression_threshold = 0
+        metrics = MetricsCollector()
+        self.client.hooks.append(metrics)
+        responses = []
+        metrics.on_response = lambda request, response: responses.append(response)
+
+        res: Dict[str, str] = await self.client.store_settings('node', 1, 'coco', '1', force=True)
+
+        self.assertEqual(res, {'value': '1'})
+        self.assertEqual(self.requests[0]['encoding'], 'gzip')
+        self.assertEqual(self.requests[0]['form'], {'path': 'coco', 'value': '1', 'force': '1'})
+        self.assertTrue(self.client.request_compression_supported)
+        self.assertEqual(responses[0].compression.encoding, 'gzip')
+        self.assertEqual(responses[0].compression.compressed_size, responses[0].bytes_out)
+
+    async def test_hooks(self) -> None:
+        metrics = MetricsCollector()
+        self.client.hooks.append(metrics)
+        responses = []
+        metrics.on_response = lambda request, response: responses.append(response)
+
+        await self.client.get_nodes()
+        await self.client.get_nodes()
+
+        self.assertEqual([response.status for response in responses], [200, 200])
+        first, second = responses
+        self.assertIsNotNone(first.connect)
+        self.assertIsNone(second.connect)
+        self.assertGreater(first.ttfb, 0)
+        self.assertGreaterEqual(first.total, first.ttfb)
+        self.assertIsNotNone(first.decode)
+        self.assertEqual(first.bytes_in, len(b'{"nodes": [{"id": 1}]}'))
+        self.assertEqual(metrics.snapshot()['GET nodes']['requests'], 2)
+
+    async def test_error_mapping(self) -> None:
+        with self.subTest('4xx is mapped with the error message'):
+            with self.assertRaises(EVNotFoundException) as cm:
+                await self.client.get_dataset('missing')
+            self.assertEqual(cm.exception.message, 'No such thing')
+
+        with self.subTest('5xx is mapped to EVInternalServerException'):
+            with self.assertRaises(EVInternalServerException):
+                await self.client._send('GET', f'{self.client._url}/broken')
+
+    async def test_retry(self) -> None:
+        self.client._retry_policy = RetryPolicy(random_func=lambda: 0.0)
+
+        self.assertEqual(await self.client._send('GET', f'{self.client._url}/flaky'), {'ok': True})
+        self.assertEqual(self.fail_count, 3)
+
+    async def test_concurrency_is_bounded(self) -> None:
+        await asyncio.gather(*[self.client.get_nodes() for _ in range(6)])
+
+        self.assertEqual(len(self.requests), 6)
+        self.assertEqual(self.max_in_flight, 2)
+
+    async def test_rate_limit_is_waited_for_within_the_concurrency_limit(self) -> None:
+        self.client._max_concurrency = 1
+        held: List[bool] = []
+
+        class Limiter:
+            def reserve(limiter, method: str) -> float:
+                held.append(self.client._semaphore.locked())
+                return 0.0
+
+            def reserve_domain(limiter) -> float:
+                held.append(self.client._semaphore.locked())
+                return 0.0
+
+        self.client._rate_limiter = Limiter()
+        await asyncio.gather(*[self.client.get_nodes() for _ in range(3)])
+
+        self.assertEqual(held, [True] * 6)
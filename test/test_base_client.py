@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 from typing import TextIO
 
@@ -104,6 +105,38 @@ class TestBaseClient(unittest.TestCase):
 
         self.assertEqual(responses.calls[0].request.headers.get('Authorization'), f'Key {self.api_key}')
 
+    @responses.activate
+    def test_request_is_rate_limited(self) -> None:
+        client: BaseClient = BaseClient(
+            domain=self.domain,
+            api_key=self.api_key,
+            endpoint_url=self.endpoint_url
+        )
+        other_client: BaseClient = BaseClient(
+            domain=self.domain,
+            api_key=self.api_key,
+            endpoint_url=self.endpoint_url
+        )
+
+        with self.subTest('clients on the same domain share one domain bucket'):
+            self.assertIsNotNone(client._rate_limiter)
+            self.assertIs(client._rate_limiter._domain_bucket, other_client._rate_limiter._domain_bucket)
+
+        with self.subTest('rate limiter is acquired for each request'):
+            responses.add(responses.POST, url=client._url, status=200)
+            with unittest.mock.patch.object(client._rate_limiter, 'acquire', return_value=0.0) as acquire:
+                client._request('POST', client._url)
+                acquire.assert_called_once_with('POST')
+            self.assertEqual(len(responses.calls), 1)
+
+        with self.subTest('rate limiting can be disabled'):
+            unlimited_client: BaseClient = BaseClient(
+                domain=self.domain,
+                api_key=self.api_key,
+                rate_limit=None
+            )
+            self.assertIsNone(unlimited_client._rate_limiter)
+
     @responses.activate
     def test_handle_successful_response(self) -> None:
         client: BaseClient = BaseClient(
@@ -257,6 +290,32 @@ class TestBaseClient(unittest.TestCase):
                     'DEBUG:evclient.base_client:'
                     'API Request sent:\n'
                     f'Url: {response.request.url}\n'
-                    f'Body: {response.request.body}\n'
                     f'Status Code: {response.status_code}'
                 ))
+
+        with self.subTest('request body is logged on request, truncated'):
+            body_client: BaseClient = BaseClient(
+                domain=self.domain,
+                api_key=self.api_key,
+                log_bodies=True,
+                log_body_limit=10
+            )
+            responses.add(responses.POST, url=client._base_url, status=200)
+
+            with self.assertLogs('evclient', level='DEBUG') as cm:
+                response: Response = requests.post(client._base_url, data='a' * 100)
+                body_client._process_response(response)
+                self.assertEqual(cm.output[0], (
+                    'DEBUG:evclient.base_client:'
+                    'API Request sent:\n'
+                    f'Url: {response.request.url}\n'
+                    f'Body: {"a" * 10}... (100 in total)\n'
+                    f'Status Code: {response.status_code}'
+                ))
+
+        with self.subTest('nothing is formatted when debug logging is off'):
+            body_client._log_request = unittest.mock.Mock()
+            with self.assertLogs('evclient', level='INFO'):
+                logging.getLogger('evclient').info('debug is off')
+                body_client._process_response(response)
+            body_client._log_request.assert_not_called()
@@ -0,0 +1,92 @@
+import datetime
+import math
+import unittest
+from array import array
+
+import pyrfc3339
+
+from evclient import TimeseriesColumns, TimeseriesResponseGroup
+from evclient import columnar
+from evclient.columnar import timestamp_to_ns, ns_to_datetime
+
+
+class TestTimeseriesColumns(unittest.TestCase):
+    def setUp(self) -> None:
+        self.group: TimeseriesResponseGroup = {
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [
+                {'v': 2.6, 'ts': '2020-01-01T00:05:57+01:00'},
+                {'v': None, 'ts': '2020-01-01T00:15:37.250+01:00'},
+            ]
+        }
+
+    def test_timestamp_to_ns(self) -> None:
+        self.assertEqual(timestamp_to_ns('1970-01-01T01:00:01+01:00'), 1000000000)
+        self.assertEqual(timestamp_to_ns(1.5), 1500000000)
+        self.assertEqual(timestamp_to_ns(1577833557), 1577833557000000000)
+        self.assertEqual(
+            timestamp_to_ns(datetime.datetime(1970, 1, 1, 0, 0, 0, 1, tzinfo=datetime.timezone.utc)),
+            1000
+        )
+        self.assertEqual(
+            ns_to_datetime(1500000000),
+            datetime.datetime(1970, 1, 1, 0, 0, 1, 500000, tzinfo=datetime.timezone.utc)
+        )
+
+    def test_from_response_group(self) -> None:
+        for numpy in [columnar.numpy, None]:
+            with self.subTest(numpy=numpy is not None), unittest.mock.patch.object(columnar, 'numpy', numpy):
+                columns: TimeseriesColumns = TimeseriesColumns.from_response_group(self.group)
+
+                self.assertEqual(len(columns), 2)
+                self.assertEqual(columns.ts.tolist(), [1577833557000000000, 1577834137250000000])
+                self.assertEqual(columns.v[0], 2.6)
+                self.assertTrue(math.isnan(columns.v[1]))
+                self.assertEqual(memoryview(columns.ts).itemsize, 8)
+                if numpy is None:
+                    self.assertIsInstance(columns.ts, array)
+                else:
+                    self.assertEqual(str(columns.ts.dtype), 'int64')
+                    self.assertEqual(str(columns.v.dtype), 'float64')
+
+    def test_from_epoch_response_group(self) -> None:
+        for numpy in [columnar.numpy, None]:
+            with self.subTest(numpy=numpy is not None), unittest.mock.patch.object(columnar, 'numpy', numpy):
+                columns: TimeseriesColumns = TimeseriesColumns.from_response_group({
+                    'node_id': 1,
+                    'tag': 'outdoortemp',
+                    'data': [{'v': 1, 'ts': 1577833557}, {'v': 2.5, 'ts': 1577834137.25}]
+                })
+                self.assertEqual(columns.ts.tolist(), [1577833557000000000, 1577834137250000000])
+                self.assertEqual(columns.v.tolist(), [1.0, 2.5])
+
+    def test_to_group(self) -> None:
+        columns: TimeseriesColumns = TimeseriesColumns.from_response_group(self.group)
+
+        self.assertEqual(columns.to_group(), {
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [
+                {'v': 2.6, 'ts': pyrfc3339.parse('2020-01-01T00:05:57+01:00')},
+                {'v': None, 'ts': pyrfc3339.parse('2020-01-01T00:15:37.250+01:00')},
+            ]
+        })
+        self.assertEqual(columns.to_group()['data'][0]['ts'].tzinfo, datetime.timezone.utc)
+
+    def test_concatenate(self) -> None:
+        for numpy in [columnar.numpy, None]:
+            with self.subTest(numpy=numpy is not None), unittest.mock.patch.object(columnar, 'numpy', numpy):
+                first: TimeseriesColumns = TimeseriesColumns.from_response_group(self.group)
+                second: TimeseriesColumns = TimeseriesColumns.from_response_group({
+                    'node_id': 1,
+                    'tag': 'outdoortemp',
+                    'data': [{'v': 3.0, 'ts': '2020-01-01T00:30:00+01:00'}]
+                })
+
+                merged: TimeseriesColumns = TimeseriesColumns.concatenate([first, second])
+
+                self.assertEqual(len(merged), 3)
+                self.assertEqual(merged.ts.tolist()[2], 1577835000000000000)
+                self.assertEqual(merged.v.tolist()[2], 3.0)
+                self.assertEqual(merged, TimeseriesColumns.concatenate([first, second]))
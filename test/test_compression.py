@@ -0,0 +1,189 @@
+import gzip
+import json
+import unittest
+from typing import List, Optional
+import urllib.parse
+import zlib
+
+import responses
+
+from evclient import TimeseriesClient, DatasetClient, EVBadRequestException, RequestHooks, RequestInfo, ResponseInfo
+from evclient.compression import CompressionStats, compress, encode_body, is_rejected
+
+
+class TestCompression(unittest.TestCase):
+    def test_encode_body(self) -> None:
+        with self.subTest('bytes and str'):
+            self.assertEqual(encode_body(b'{}'), b'{}')
+            self.assertEqual(encode_body('åäö'), 'åäö'.encode('utf-8'))
+
+        with self.subTest('form is encoded like requests does'):
+            self.assertEqual(encode_body({'a': '[1, 2]', 'b': None, 'c': 1}), b'a=%5B1%2C+2%5D&c=1')
+
+        with self.subTest('streams are left alone'):
+            self.assertIsNone(encode_body({'file': object()}))
+            self.assertIsNone(encode_body(None))
+
+    def test_compress(self) -> None:
+        body = b'{"v": 2.6, "ts": "2020-01-01T00:05:57+01:00"}, ' * 1000
+
+        with self.subTest('gzip'):
+            compressed, stats = compress(body, 'gzip')
+            self.assertEqual(gzip.decompress(compressed), body)
+            self.assertEqual((stats.encoding, stats.original_size, stats.compressed_size),
+                             ('gzip', len(body), len(compressed)))
+            self.assertGreater(stats.ratio, 10)
+            self.assertGreaterEqual(stats.seconds, 0)
+
+        with self.subTest('deflate'):
+            compressed, stats = compress(body, 'deflate')
+            self.assertEqual(zlib.decompress(compressed), body)
+
+        with self.subTest('ratio of an empty body'):
+            self.assertEqual(CompressionStats('gzip', 0, 0, 0.0).ratio, 1.0)
+
+    def test_is_rejected(self) -> None:
+        self.assertTrue(is_rejected(415, b''))
+        self.assertTrue(is_rejected(400, b'{"error": "Unsupported Content-Encoding gzip"}'))
+        self.assertFalse(is_rejected(400, b'{"error": "Missing node_id"}'))
+        self.assertFalse(is_rejected(400, b''))
+        self.assertFalse(is_rejected(500, b'gzip'))
+
+
+class CompressionHooks(RequestHooks):
+    def __init__(self) -> None:
+        self.compressions: List[Optional[CompressionStats]] = []
+
+    def on_response(self, request: RequestInfo, response: ResponseInfo) -> None:
+        self.compressions.append(response.compression)
+
+
+class TestClientCompression(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hooks = CompressionHooks()
+        self.client: TimeseriesClient = TimeseriesClient(
+            domain='test',
+            api_key='123456789',
+            endpoint_url='http://127.0.0.1',
+            request_compression='gzip',
+            compression_threshold=1000,
+            hooks=[self.hooks]
+        )
+        self.url: str = f'{self.client._url}/{self.client._timeseries_api_path}'
+        self.timeseries = [{
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [{'v': 2.6, 'ts': '2020-01-01T00:05:57+01:00'}] * 100
+        }]
+
+    def store(self) -> None:
+        self.client.store_multiple_timeseries_data(self.timeseries)
+
+    @responses.activate
+    def test_body_is_compressed(self) -> None:
+        responses.add(responses.POST, url=self.url, status=200)
+        self.store()
+
+        request = responses.calls[0].request
+        self.assertEqual(request.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(request.headers['Content-Type'], 'application/x-www-form-urlencoded')
+        body = urllib.parse.parse_qs(gzip.decompress(request.body).decode('utf-8'))
+        self.assertEqual(json.loads(body['timeseries'][0]), self.timeseries)
+        self.assertEqual(body['silent'], ['true'])
+
+        self.assertTrue(self.client.request_compression_supported)
+        stats: CompressionStats = self.hooks.compressions[0]
+        self.assertEqual(stats.encoding, 'gzip')
+        self.assertEqual(stats.compressed_size, len(request.body))
+        self.assertGreater(stats.ratio, 10)
+        self.assertGreaterEqual(stats.seconds, 0)
+
+    @responses.activate
+    def test_small_bodies_are_not_compressed(self) -> None:
+        responses.add(responses.POST, url=self.url, status=200)
+        self.timeseries[0]['data'] = self.timeseries[0]['data'][:1]
+        self.store()
+
+        self.assertNotIn('Content-Encoding', responses.calls[0].request.headers)
+        self.assertEqual(self.hooks.compressions, [None])
+        self.assertIsNone(self.client.request_compression_supported)
+
+    @responses.activate
+    def test_rejected_compression_falls_back(self) -> None:
+        responses.add(responses.POST, url=self.url, status=415)
+        responses.add(responses.POST, url=self.url, status=200)
+        with self.assertLogs('evclient.base_client', 'WARNING'):
+            self.store()
+        self.store()
+
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(responses.calls[0].request.headers['Content-Encoding'], 'gzip')
+        for call in responses.calls[1:]:
+            self.assertNotIn('Content-Encoding', call.request.headers)
+            body = urllib.parse.parse_qs(call.request.body)
+            self.assertEqual(json.loads(body['timeseries'][0]), self.timeseries)
+        self.assertFalse(self.client.request_compression_supported)
+        # Stats are reported per attempt, only the rejected probe was compressed.
+        self.assertEqual([stats is not None for stats in self.hooks.compressions], [True, False, False])
+
+    @responses.activate
+    def test_encoding_error_falls_back(self) -> None:
+        responses.add(responses.POST, url=self.url, json={'error': 'Can not decode gzip body'}, status=400)
+        responses.add(responses.POST, url=self.url, status=200)
+        with self.assertLogs('evclient.base_client', 'WARNING'):
+            self.store()
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertNotIn('Content-Encoding', responses.calls[1].request.headers)
+        self.assertFalse(self.client.request_compression_supported)
+
+    @responses.activate
+    def test_bad_request_while_probing_is_not_resent(self) -> None:
+        responses.add(responses.POST, url=self.url, json={'error': 'Missing node_id'}, status=400)
+        responses.add(responses.POST, url=self.url, status=200)
+        with self.assertRaises(EVBadRequestException):
+            self.store()
+        self.assertIsNone(self.client.request_compression_supported)
+        self.store()
+
+        self.assertEqual(len(responses.calls), 2)
+        for call in responses.calls:
+            self.assertEqual(call.request.headers['Content-Encoding'], 'gzip')
+        self.assertTrue(self.client.request_compression_supported)
+
+    @responses.activate
+    def test_errors_after_probe_are_not_resent(self) -> None:
+        responses.add(responses.POST, url=self.url, status=200)
+        responses.add(responses.POST, url=self.url, json={'error': 'bad'}, status=400)
+        self.store()
+        with self.assertRaises(EVBadRequestException):
+            self.store()
+
+        self.assertEqual(len(responses.calls), 2)
+        self.assertTrue(self.client.request_compression_supported)
+
+    @responses.activate
+    def test_json_body_is_compressed(self) -> None:
+        client: DatasetClient = DatasetClient(
+            domain='test',
+            api_key='123456789',
+            endpoint_url='http://127.0.0.1',
+            request_compression='deflate',
+            compression_threshold=0
+        )
+        responses.add(responses.POST, url=f'{client._url}/dataset', json={}, status=201)
+        client.create_dataset(content='e30=', dataset_format='json', name='set')
+
+        request = responses.calls[0].request
+        self.assertEqual(request.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(request.headers['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(zlib.decompress(request.body)),
+                         {'content': 'e30=', 'format': 'json', 'name': 'set'})
+
+    def test_unknown_compression(self) -> None:
+        with self.assertRaises(ValueError):
+            TimeseriesClient(domain='test', api_key='123456789', request_compression='br')
+
+
+if __name__ == '__main__':
+    unittest.main()
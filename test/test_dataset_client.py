@@ -2,10 +2,11 @@ import csv
 import json
 import os
 
+import requests
 import responses
 import unittest
 import urllib
-from typing import Dict, List, Union, Any, TextIO
+from typing import Dict, List, Tuple, Union, Any, TextIO
 
 from evclient import DatasetClient, DatasetType
 
@@ -233,3 +234,50 @@ class TestDatasetClient(unittest.TestCase):
                 responses.calls[0].request.url,
                 f'{self.client._url}/{self.client._dataset_api_path}/{dataset_uuid}'
             )
+
+    @responses.activate
+    def test_iter_datasets(self) -> None:
+        self.client = DatasetClient(domain=self.domain, api_key=self.api_key, rate_limit=None)
+        datasets: List[DatasetType] = [{
+            'uuid': f'00000000-0000-0000-0000-{i:012d}',
+            'name': f'Dataset #{i}',
+            'thing_uuid': 'a' if i % 2 else None,
+            'tags': ['forecast'] if i % 3 == 0 else []
+        } for i in range(250)]
+
+        def callback(request: requests.PreparedRequest) -> Tuple[int, Dict, str]:
+            offset, limit = int(request.params['offset']), int(request.params['limit'])
+            return 200, {}, json.dumps(datasets[offset:offset + limit])
+
+        responses.add_callback(
+            responses.GET,
+            url=f'{self.client._url}/{self.client._dataset_api_path}',
+            callback=callback
+        )
+
+        with self.subTest('pages until the first short page'):
+            self.assertEqual(list(self.client.iter_datasets()), datasets)
+            offsets = sorted(int(call.request.params['offset']) for call in responses.calls)
+            # Pages past the end may be cancelled before they are sent.
+            self.assertEqual(offsets[:3], [0, 100, 200])
+            self.assertTrue(set(offsets[3:]) <= {300, 400})
+
+        with self.subTest('without prefetch'):
+            responses.calls.reset()
+            self.assertEqual(list(self.client.iter_datasets(page_size=50, prefetch=0)), datasets)
+            self.assertEqual([int(call.request.params['offset']) for call in responses.calls], list(range(0, 300, 50)))
+
+        with self.subTest('filters'):
+            res: List[DatasetType] = list(self.client.iter_datasets(tags=['forecast'], thing_uuid='a'))
+            self.assertEqual(res, [dataset for i, dataset in enumerate(datasets) if i % 6 == 3])
+
+        with self.subTest('closing early stops paging'):
+            responses.calls.reset()
+            iterator = self.client.iter_datasets(page_size=10, prefetch=1)
+            next(iterator)
+            iterator.close()
+            self.assertLessEqual(len(responses.calls), 2)
+
+        with self.subTest('invalid arguments'):
+            self.assertRaises(ValueError, self.client.iter_datasets, page_size=101)
+            self.assertRaises(ValueError, self.client.iter_datasets, prefetch=-1)
@@ -0,0 +1,77 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# Cumulative import time of the evclient package as reported by `python -X importtime`, in milliseconds.
+IMPORT_TIME_BUDGET_MS = float(os.environ.get('EV_IMPORT_TIME_BUDGET_MS', 150))
+HEAVY_MODULES = ['aiohttp', 'numpy', 'pyrfc3339', 'pytz', 'yaml']
+
+
+def run_python(code: str, **env: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env={**os.environ, **env},
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True
+    )
+
+
+def loaded_modules(code: str, **env: str) -> list:
+    modules = HEAVY_MODULES + ['beartype']
+    code = f'import sys, json\n{code}\nprint(json.dumps([m for m in {modules!r} if m in sys.modules]))'
+    return json.loads(run_python(code, **env).stdout)
+
+
+class TestImportTime(unittest.TestCase):
+    def test_import_time_budget(self) -> None:
+        lines = run_python('import evclient').stderr.splitlines()
+        package = [line for line in lines if line.rstrip().endswith('| evclient')]
+        self.assertEqual(len(package), 1, lines[-5:])
+        cumulative_ms = int(package[0].split('|')[1]) / 1000
+        self.assertLess(cumulative_ms, IMPORT_TIME_BUDGET_MS)
+
+    def test_import_is_lazy(self) -> None:
+        self.assertEqual(loaded_modules('import evclient'), [])
+
+    def test_heavy_dependencies_load_on_first_use(self) -> None:
+        with self.subTest('client construction'):
+            code = "from evclient import EVClient\nEVClient(domain='test', api_key='123456789')"
+            self.assertEqual(loaded_modules(code, EV_TYPE_CHECKS='1'), ['beartype'])
+            self.assertEqual(loaded_modules(code, EV_TYPE_CHECKS='0'), [])
+
+        with self.subTest('yaml is imported by yaml responses'):
+            code = (
+                "from evclient import BaseClient\n"
+                "BaseClient(domain='test', api_key='123456789')._decode_content(b'a: 1', 'application/yaml')"
+            )
+            self.assertIn('yaml', loaded_modules(code))
+
+        with self.subTest('pyrfc3339 is imported by unusual timestamps only'):
+            code = "from evclient.timestamps import parse_timestamps\nparse_timestamps(['2020-01-01T00:00:00Z'])"
+            self.assertNotIn('pyrfc3339', loaded_modules(code))
+            code = "from evclient.timestamps import parse_timestamp\nparse_timestamp('2020-01-01T00:00:00.1Z')"
+            self.assertIn('pyrfc3339', loaded_modules(code))
+
+    def test_lazy_attributes(self) -> None:
+        import evclient
+        self.assertIn('EVClient', dir(evclient))
+        self.assertIs(evclient.EVNotFoundException, evclient.exceptions.EVNotFoundException)
+        with self.assertRaises(AttributeError):
+            evclient.NoSuchClient
+
+    def test_star_import(self) -> None:
+        import evclient
+        namespace: dict = {}
+        exec('from evclient import *', namespace)
+        self.assertEqual(set(namespace) - {'__builtins__'}, set(evclient.__all__))
+        self.assertEqual(len(evclient.__all__), len(set(evclient.__all__)))
+        for name in ('EVClient', 'TimeseriesGroup', 'NodeCatalog', 'EVNotFoundException'):
+            self.assertIs(namespace[name], getattr(evclient, name))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+import datetime
+import unittest
+from typing import Any, List, Tuple
+from unittest import mock
+
+import requests
+import responses
+
+from evclient import (
+    MetricsCollector,
+    RequestHooks,
+    RequestInfo,
+    ResponseInfo,
+    RetryPolicy,
+    SettingsClient,
+    TimeseriesClient,
+    EVNotFoundException
+)
+from evclient.instrumentation import EndpointMetrics, endpoint_path
+
+
+class RecordingHooks(RequestHooks):
+    def __init__(self) -> None:
+        self.events: List[Tuple[str, Any]] = []
+
+    def on_request_start(self, request: RequestInfo) -> None:
+        self.events.append(('start', request))
+
+    def on_response(self, request: RequestInfo, response: ResponseInfo) -> None:
+        self.events.append(('response', response))
+
+    def on_error(self, request: RequestInfo, error: BaseException, total: float) -> None:
+        self.events.append(('error', error))
+
+    def on_retry(self, request: RequestInfo, delay: float) -> None:
+        self.events.append(('retry', delay))
+
+    def names(self) -> List[str]:
+        return [name for name, _ in self.events]
+
+
+def response_info(total: float, status: int = 200) -> ResponseInfo:
+    return ResponseInfo(status, 10, 5, None, None, total / 2, total, 0.001)
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_endpoint_path(self) -> None:
+        api_url = 'https://customer.noda.se/test/api/v1'
+        self.assertEqual(endpoint_path(f'{api_url}/timeseries', api_url), 'timeseries')
+        self.assertEqual(endpoint_path(f'{api_url}/settings/node/12/', api_url), 'settings/node/{id}')
+        self.assertEqual(
+            endpoint_path(f'{api_url}/dataset/0b7e4a2c-9d1f-4c3e-8a5b-6f7e8d9c0a1b/raw?x=1', api_url),
+            'dataset/{id}/raw'
+        )
+
+    def test_endpoint_metrics(self) -> None:
+        metrics = EndpointMetrics(buckets=(0.1, 1.0))
+        self.assertIsNone(metrics.quantile(0.5))
+
+        for total in (0.05, 0.05, 0.5, 3.0):
+            metrics.observe(response_info(total))
+        metrics.observe(response_info(0.05, status=404))
+
+        stats = metrics.to_dict()
+        self.assertEqual(stats['histogram'], {0.1: 3, 1.0: 1, float('inf'): 1})
+        self.assertEqual(stats['status_codes'], {200: 4, 404: 1})
+        self.assertEqual((stats['bytes_in'], stats['bytes_out']), (50, 25))
+        self.assertAlmostEqual(stats['latency_sum'], 3.65)
+        self.assertAlmostEqual(stats['ttfb_sum'], 1.825)
+        self.assertEqual(stats['p50'], 0.1)
+        self.assertEqual(stats['p95'], 3.0)
+        self.assertEqual(stats['latency_max'], 3.0)
+
+
+class TestClientHooks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hooks = RecordingHooks()
+        self.metrics = MetricsCollector()
+        self.client: SettingsClient = SettingsClient(
+            domain='test',
+            api_key='123456789',
+            endpoint_url='http://127.0.0.1',
+            rate_limit=None,
+            retry_policy=RetryPolicy(max_retries=2, random_func=lambda: 0.0),
+            hooks=[self.hooks, self.metrics]
+        )
+        self.url: str = f'{self.client._url}/settings/node/1'
+        sleep_patcher = mock.patch('evclient.base_client.time.sleep')
+        sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    @responses.activate
+    def test_response(self) -> None:
+        responses.add(responses.GET, url=self.url, json={'value': '1'}, status=200)
+        self.client.get_settings('node', 1, path='coco')
+
+        self.assertEqual(self.hooks.names(), ['start', 'response'])
+        request: RequestInfo = self.hooks.events[0][1]
+        self.assertEqual((request.method, request.path, request.attempt), ('GET', 'settings/node/{id}', 0))
+        response: ResponseInfo = self.hooks.events[1][1]
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.bytes_in, len(b'{"value": "1"}'))
+        self.assertIsNone(response.dns)
+        self.assertIsNone(response.connect)
+        self.assertGreaterEqual(response.total, 0)
+        self.assertIsNotNone(response.ttfb)
+        self.assertIsNotNone(response.decode)
+
+        stats = self.metrics.snapshot()['GET settings/node/{id}']
+        self.assertEqual((stats['requests'], stats['responses'], stats['status_codes']), (1, 1, {200: 1}))
+
+    @responses.activate
+    def test_error_response(self) -> None:
+        responses.add(responses.PUT, url=self.url, json={'error': 'No such node'}, status=404)
+        with self.assertRaises(EVNotFoundException):
+            self.client.store_settings('node', 1, 'coco', '1')
+
+        self.assertEqual(self.hooks.names(), ['start', 'response'])
+        response: ResponseInfo = self.hooks.events[1][1]
+        self.assertEqual(response.status, 404)
+        self.assertIsNone(response.decode)
+        self.assertGreater(response.bytes_out, 0)
+
+    @responses.activate
+    def test_retry(self) -> None:
+        responses.add(responses.GET, url=self.url, status=503)
+        responses.add(responses.GET, url=self.url, body=requests.ConnectionError('refused'))
+        responses.add(responses.GET, url=self.url, json={'value': '1'}, status=200)
+        self.client.get_settings('node', 1)
+
+        self.assertEqual(
+            self.hooks.names(),
+            ['start', 'response', 'retry', 'start', 'error', 'retry', 'start', 'response']
+        )
+        self.assertEqual([event[1].attempt for event in self.hooks.events if event[0] == 'start'], [0, 1, 2])
+        stats = self.metrics.snapshot()['GET settings/node/{id}']
+        self.assertEqual(
+            (stats['requests'], stats['responses'], stats['errors'], stats['retries']),
+            (3, 2, 1, 2)
+        )
+        self.assertEqual(stats['status_codes'], {503: 1, 200: 1})
+
+    @responses.activate
+    def test_failing_hook_is_ignored(self) -> None:
+        responses.add(responses.GET, url=self.url, json={'value': '1'}, status=200)
+        with mock.patch.object(self.hooks, 'on_response', side_effect=RuntimeError('broken hook')):
+            with self.assertLogs('evclient.base_client', 'ERROR'):
+                self.assertEqual(self.client.get_settings('node', 1), {'value': '1'})
+        self.assertEqual(self.metrics.snapshot()['GET settings/node/{id}']['responses'], 1)
+
+    @responses.activate
+    def test_streamed_response(self) -> None:
+        client: TimeseriesClient = TimeseriesClient(
+            domain='test',
+            api_key='123456789',
+            endpoint_url='http://127.0.0.1',
+            rate_limit=None,
+            hooks=[self.hooks]
+        )
+        body = {'timeseries': [{'node_id': 1, 'tag': 'outdoortemp', 'data': [{'v': 1.0, 'ts': 1577836800}]}]}
+        responses.add(responses.GET, url=f'{client._url}/timeseries', json=body, status=200)
+        client.get_timeseries_data(node_ids=1, tags='outdoortemp', epoch=True, stream=True)
+
+        self.assertEqual(self.hooks.names(), ['start', 'response'])
+        response: ResponseInfo = self.hooks.events[1][1]
+        self.assertGreater(response.bytes_in, 0)
+        self.assertIsNone(response.decode)
+
+    @responses.activate
+    def test_silent_store(self) -> None:
+        client: TimeseriesClient = TimeseriesClient(
+            domain='test',
+            api_key='123456789',
+            endpoint_url='http://127.0.0.1',
+            rate_limit=None,
+            hooks=[self.hooks, self.metrics]
+        )
+        url = f'{client._url}/timeseries'
+        responses.add(responses.POST, url=url, status=500)
+        responses.add(responses.POST, url=url, status=201)
+        ts = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+        for _ in range(2):
+            self.assertIsNone(client.store_timeseries_data(1, 'outdoortemp', 1.0, ts))
+
+        self.assertEqual(self.hooks.names(), ['start', 'response', 'start', 'response'])
+        self.assertEqual([event[1].status for event in self.hooks.events if event[0] == 'response'], [500, 201])
+        stats = self.metrics.snapshot()['POST timeseries']
+        self.assertEqual((stats['requests'], stats['responses'], stats['status_codes']), (2, 2, {500: 1, 201: 1}))
+
+    def test_no_hooks(self) -> None:
+        client: SettingsClient = SettingsClient(domain='test', api_key='123456789')
+        self.assertEqual(client.hooks, [])
+        self.assertIsNone(client._start_trace('GET', self.url, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
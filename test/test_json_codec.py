@@ -0,0 +1,97 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+import responses
+
+from evclient import BaseClient, DatasetClient, JSONCodec, OrjsonCodec
+from evclient import json_codec
+from evclient.json_codec import get_json_codec
+
+
+class TestJSONCodec(unittest.TestCase):
+    def test_codecs(self) -> None:
+        codecs = [JSONCodec()]
+        if json_codec.orjson is not None:
+            codecs.append(OrjsonCodec())
+        document = {'a': [1, 2.5, None, True], 'b': 'åäö', 'c': {'d': 'e'}}
+        for codec in codecs:
+            with self.subTest(codec.name):
+                self.assertEqual(json.loads(codec.dumps(document)), document)
+                self.assertEqual(codec.loads(json.dumps(document)), document)
+                self.assertEqual(codec.loads(json.dumps(document).encode('utf-8')), document)
+
+            with self.subTest(f'{codec.name} accepts what json accepts'):
+                self.assertEqual(codec.loads(b'[18446744073709551616, NaN]')[0], 2 ** 64)
+                self.assertEqual(json.loads(codec.dumps({1: 2 ** 64})), {'1': 2 ** 64})
+
+            with self.subTest(f'{codec.name} rejects invalid json'):
+                with self.assertRaises(ValueError):
+                    codec.loads(b'not json')
+                with self.assertRaises(ValueError):
+                    codec.loads(b'')
+
+    def test_get_json_codec(self) -> None:
+        with self.subTest('fastest installed codec by default'):
+            with mock.patch.dict(os.environ, clear=True):
+                expected = 'json' if json_codec.orjson is None else 'orjson'
+                self.assertEqual(get_json_codec().name, expected)
+
+        with self.subTest('by name'):
+            self.assertIs(type(get_json_codec('json')), JSONCodec)
+
+        with self.subTest('from environment variable'):
+            with mock.patch.dict(os.environ, {'EV_JSON_CODEC': 'json'}):
+                self.assertIs(type(get_json_codec()), JSONCodec)
+
+        with self.subTest('instance is used as is'):
+            codec = JSONCodec()
+            self.assertIs(get_json_codec(codec), codec)
+
+        with self.subTest('unknown name'):
+            with self.assertRaises(ValueError):
+                get_json_codec('simplejson')
+
+        with self.subTest('library not installed'):
+            with mock.patch.object(json_codec, 'orjson', None):
+                with self.assertRaises(ImportError):
+                    get_json_codec('orjson')
+                with mock.patch.dict(os.environ, clear=True):
+                    self.assertIs(type(get_json_codec()), JSONCodec)
+
+
+class TestClientJSONCodec(unittest.TestCase):
+    def test_client_codec(self) -> None:
+        client: BaseClient = BaseClient(domain='test', api_key='123456789', json_codec='json')
+        self.assertEqual(client.json_codec.name, 'json')
+
+    @responses.activate
+    def test_codec_encodes_and_decodes_bodies(self) -> None:
+        codec = JSONCodec()
+        client: DatasetClient = DatasetClient(
+            domain='test',
+            api_key='123456789',
+            endpoint_url='http://127.0.0.1',
+            json_codec=codec
+        )
+        responses.add(
+            responses.POST,
+            url=f'{client._url}/dataset',
+            json={'uuid': 'abc'},
+            status=201
+        )
+        with mock.patch.object(codec, 'dumps', wraps=codec.dumps) as dumps, \
+                mock.patch.object(codec, 'loads', wraps=codec.loads) as loads:
+            result = client.create_dataset(content='e30=', dataset_format='json', name='set')
+
+        self.assertEqual(result, {'uuid': 'abc'})
+        dumps.assert_called_once_with({'content': 'e30=', 'format': 'json', 'name': 'set'})
+        loads.assert_called_once()
+        request = responses.calls[0].request
+        self.assertEqual(request.headers['Content-Type'], 'application/json')
+        self.assertEqual(json.loads(request.body), {'content': 'e30=', 'format': 'json', 'name': 'set'})
+
+
+if __name__ == '__main__':
+    unittest.main()
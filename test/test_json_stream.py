@@ -0,0 +1,77 @@
+import json
+import unittest
+from typing import Any, Iterable, List, Tuple
+
+from evclient.json_stream import iter_timeseries_events
+
+
+def flatten(events: Iterable[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+    """One event per data point, independent of how the points were batched"""
+    return [(event, point) for event, value in events for point in (value if event == 'data' else [value])]
+
+
+class TestIterTimeseriesEvents(unittest.TestCase):
+    def setUp(self) -> None:
+        self.body: bytes = json.dumps({
+            'meta': {'nested': [1, {'timeseries': []}]},
+            'timeseries': [
+                {
+                    'node_id': 1,
+                    'tag': 'outdoortemp',
+                    'data': [{'v': 2.6, 'ts': '2020-01-01T00:05:57+01:00'}, {'v': 123456789, 'ts': 1577833557.25}]
+                },
+                {'data': [], 'tag': 'indoortemp "ä"', 'node_id': 2},
+                {}
+            ],
+            'count': 3
+        }, indent=2).encode('utf-8')
+        self.expected: List[Tuple[str, Any]] = [
+            ('start', None),
+            ('field', ('node_id', 1)),
+            ('field', ('tag', 'outdoortemp')),
+            ('data', {'v': 2.6, 'ts': '2020-01-01T00:05:57+01:00'}),
+            ('data', {'v': 123456789, 'ts': 1577833557.25}),
+            ('end', None),
+            ('start', None),
+            ('field', ('tag', 'indoortemp "ä"')),
+            ('field', ('node_id', 2)),
+            ('end', None),
+            ('start', None),
+            ('end', None),
+        ]
+
+    def test_any_chunk_size(self) -> None:
+        for size in [1, 2, 5, 64, len(self.body)]:
+            with self.subTest(size=size):
+                chunks: List[bytes] = [self.body[i:i + size] for i in range(0, len(self.body), size)]
+                self.assertEqual(flatten(iter_timeseries_events(chunks)), self.expected)
+
+    def test_text_chunks(self) -> None:
+        self.assertEqual(flatten(iter_timeseries_events([self.body.decode('utf-8')])), self.expected)
+
+    def test_points_in_the_buffer_are_decoded_together(self) -> None:
+        data_events = [value for event, value in iter_timeseries_events([self.body]) if event == 'data']
+        self.assertEqual(len(data_events), 1)
+        self.assertEqual(len(data_events[0]), 2)
+
+    def test_separators_inside_strings(self) -> None:
+        points: List[Any] = [
+            {'v': 1, 'ts': 'a},{"v": 9}'},
+            {'v': {'nested': {'x': 1}}, 'ts': 'b'},
+            {'v': 3, 'ts': 'c},'},
+        ]
+        body: str = json.dumps({'timeseries': [{'node_id': 1, 'data': points}, {'node_id': 2, 'data': [{'v': 4}]}]})
+        for size in range(1, len(body) + 1):
+            with self.subTest(size=size):
+                events = flatten(iter_timeseries_events([body[i:i + size] for i in range(0, len(body), size)]))
+                self.assertEqual([value for event, value in events if event == 'data'], points + [{'v': 4}])
+
+    def test_without_timeseries(self) -> None:
+        for body in [b'{}', b'{"timeseries": []}', b'{"timeseries": null}', b' { "error" : "x" } ']:
+            with self.subTest(body=body):
+                self.assertEqual(list(iter_timeseries_events([body])), [])
+
+    def test_invalid(self) -> None:
+        for body in [b'', b'[]', b'{"timeseries": [{"data": [1,', b'{"timeseries": [{"data": [1} ]}']:
+            with self.subTest(body=body), self.assertRaises(json.JSONDecodeError):
+                list(iter_timeseries_events([body]))
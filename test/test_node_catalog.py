@@ -0,0 +1,105 @@
+import threading
+import time
+import unittest
+from typing import List
+from unittest import mock
+
+from evclient import Node, NodeCatalog, NodeType
+
+
+def node(id: int, name: str, representation: str, protocol_id: int, sensor_ids: List[int]) -> NodeType:
+    return {
+        'id': id,
+        'uuid': f'00000000-0000-0000-0000-{id:012d}',
+        'name': name,
+        'description': '',
+        'public': True,
+        'owner': False,
+        'enabled': True,
+        'archived': False,
+        'representation': representation,
+        'device': {'id': 1, 'name': 'Kelp-Basic', 'protocol_id': protocol_id},
+        'sensor_ids': sensor_ids,
+        'interval': 600
+    }
+
+
+class TestNodeCatalog(unittest.TestCase):
+    def setUp(self) -> None:
+        self.nodes: List[NodeType] = [
+            node(60, 'Exempel heatingsystem', 'circuit/heat', 1, [398, 1, 42]),
+            node(61, 'Exempel heatingsystem', 'circuit/heat', 2, [1, 9]),
+            node(62, 'Outdoor', 'sensor/outdoor', 1, [])
+        ]
+        self.client = mock.Mock()
+        self.client.get_nodes.side_effect = lambda: self.nodes
+        self.now: float = 0.0
+        self.catalog: NodeCatalog = NodeCatalog(self.client, ttl=None, clock=lambda: self.now)
+
+    def test_node(self) -> None:
+        result = Node.from_dict(self.nodes[0])
+        self.assertEqual(result.protocol_id, 1)
+        self.assertEqual(result.sensor_ids, (398, 1, 42))
+        self.assertEqual(result.to_dict(), self.nodes[0])
+        self.assertEqual(result, Node.from_dict(self.nodes[0]))
+        self.assertFalse(hasattr(result, '__dict__'))
+
+    def test_lookups(self) -> None:
+        self.assertEqual(self.client.get_nodes.call_count, 0)
+        self.assertEqual(self.catalog.by_id(60).name, 'Exempel heatingsystem')
+        self.assertIsNone(self.catalog.by_id(1))
+        self.assertEqual(self.catalog.by_uuid('00000000-0000-0000-0000-000000000062').id, 62)
+        self.assertEqual([n.id for n in self.catalog.by_name('Exempel heatingsystem')], [60, 61])
+        self.assertEqual([n.id for n in self.catalog.by_protocol_id(1)], [60, 62])
+        self.assertEqual([n.id for n in self.catalog.by_representation('circuit/heat')], [60, 61])
+        self.assertEqual([n.id for n in self.catalog.by_sensor_id(1)], [60, 61])
+        self.assertEqual(self.catalog.by_sensor_id(2), ())
+        self.assertEqual(len(self.catalog), 3)
+        self.assertEqual([n.id for n in self.catalog], [60, 61, 62])
+        self.assertIn(62, self.catalog)
+        self.assertEqual(self.client.get_nodes.call_count, 1)
+
+    def test_refresh(self) -> None:
+        self.assertIsNone(self.catalog.age)
+        self.assertEqual(len(self.catalog), 3)
+        self.now = 10.0
+        self.assertEqual(self.catalog.age, 10.0)
+
+        self.nodes = self.nodes[:1]
+        self.catalog.refresh()
+        self.assertEqual(self.catalog.age, 0.0)
+        self.assertEqual(len(self.catalog), 1)
+        self.assertIsNone(self.catalog.by_id(62))
+
+        with self.subTest('failed refresh keeps the nodes'):
+            self.client.get_nodes.side_effect = RuntimeError
+            self.assertRaises(RuntimeError, self.catalog.refresh)
+            self.assertEqual(len(self.catalog), 1)
+
+    def test_background_refresh(self) -> None:
+        refreshed = threading.Event()
+        calls: List[int] = []
+
+        def get_nodes() -> List[NodeType]:
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError('unavailable')
+            if len(calls) == 3:
+                refreshed.set()
+            return self.nodes
+
+        self.client.get_nodes.side_effect = get_nodes
+        with self.assertLogs('evclient.node_catalog', 'ERROR'):
+            with NodeCatalog(self.client, ttl=0.05) as catalog:
+                self.assertEqual(len(catalog), 3)
+                self.assertTrue(refreshed.wait(5))
+        count = len(calls)
+        time.sleep(0.1)
+        self.assertEqual(len(calls), count)
+
+    def test_invalid_ttl(self) -> None:
+        self.assertRaises(ValueError, NodeCatalog, self.client, ttl=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
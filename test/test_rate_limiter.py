@@ -0,0 +1,129 @@
+import threading
+import unittest
+from typing import List
+
+from evclient.rate_limiter import TokenBucket, RateLimiter, get_rate_limiter
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 100.0
+        self.sleeps: List[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_reserve_spaces_tokens_by_rate(self) -> None:
+        clock: FakeClock = FakeClock()
+        bucket: TokenBucket = TokenBucket(rate=10, clock=clock)
+
+        allowed: List[float] = [bucket.reserve() for _ in range(3)]
+        for actual, expected in zip(allowed, [100.0, 100.1, 100.2]):
+            self.assertAlmostEqual(actual, expected)
+
+    def test_reserve_allows_burst_up_to_capacity(self) -> None:
+        clock: FakeClock = FakeClock()
+        bucket: TokenBucket = TokenBucket(rate=10, capacity=3, clock=clock)
+
+        allowed: List[float] = [bucket.reserve() for _ in range(4)]
+        self.assertEqual(allowed[:3], [100.0, 100.0, 100.0])
+        self.assertAlmostEqual(allowed[3], 100.1)
+
+    def test_tokens_refill_while_idle(self) -> None:
+        clock: FakeClock = FakeClock()
+        bucket: TokenBucket = TokenBucket(rate=10, clock=clock)
+        bucket.reserve()
+        clock.now += 5
+        self.assertEqual(bucket.reserve(), clock.now)
+
+    def test_reserve_not_before(self) -> None:
+        clock: FakeClock = FakeClock()
+        bucket: TokenBucket = TokenBucket(rate=10, clock=clock)
+        self.assertEqual(bucket.reserve(not_before=101.0), 101.0)
+        self.assertAlmostEqual(bucket.reserve(), 101.1)
+
+    def test_invalid_arguments(self) -> None:
+        self.assertRaises(ValueError, TokenBucket, 0)
+        self.assertRaises(ValueError, TokenBucket, 1, 0.5)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_acquire_sleeps_until_slot_is_free(self) -> None:
+        clock: FakeClock = FakeClock()
+        limiter: RateLimiter = RateLimiter(rate=4, clock=clock, sleep=clock.sleep)
+
+        for _ in range(5):
+            limiter.acquire('GET')
+        self.assertEqual(len(clock.sleeps), 4)
+        self.assertAlmostEqual(clock.now, 101.0)
+
+    def test_separate_get_and_set_budgets(self) -> None:
+        clock: FakeClock = FakeClock()
+        limiter: RateLimiter = RateLimiter(rate=10, get_rate=10, set_rate=2, clock=clock, sleep=clock.sleep)
+
+        with self.subTest('SET requests are limited by their own budget'):
+            self.assertEqual(limiter.reserve('POST'), 0.0)
+            self.assertAlmostEqual(limiter.reserve('put'), 0.5)
+
+        with self.subTest('GET requests are only held back by the domain budget'):
+            self.assertAlmostEqual(limiter.reserve('GET'), 0.6)
+
+    def test_thread_safety(self) -> None:
+        limiter: RateLimiter = RateLimiter(rate=1000, sleep=lambda _: None)
+        delays: List[float] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            for _ in range(50):
+                delay = limiter.reserve('GET')
+                with lock:
+                    delays.append(delay)
+
+        threads: List[threading.Thread] = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(delays), 200)
+        self.assertAlmostEqual(max(delays), 0.199, delta=0.02)
+
+    def test_get_rate_limiter_shares_the_domain_bucket(self) -> None:
+        limiter: RateLimiter = get_rate_limiter('http://127.0.0.1/test/api/v1')
+        self.assertIs(limiter._domain_bucket, get_rate_limiter('http://127.0.0.1/test/api/v1')._domain_bucket)
+        self.assertIsNot(limiter._domain_bucket, get_rate_limiter('http://127.0.0.1/other/api/v1')._domain_bucket)
+        self.assertIs(limiter._domain_bucket, get_rate_limiter('http://127.0.0.1/test/api/v1', rate=5)._domain_bucket)
+
+    def test_clients_stay_within_the_domain_rate_together(self) -> None:
+        clock: FakeClock = FakeClock()
+        domain_bucket: TokenBucket = TokenBucket(rate=9, clock=clock)
+        default: RateLimiter = RateLimiter(clock=clock, domain_bucket=domain_bucket)
+        set_limited: RateLimiter = RateLimiter(set_rate=2, clock=clock, domain_bucket=domain_bucket)
+        self.assertIsNone(default._bucket)
+
+        delays: List[float] = []
+        for _ in range(9):
+            for limiter in (default, set_limited):
+                self.assertEqual(limiter.reserve('GET'), 0.0)
+                delays.append(limiter.reserve_domain())
+        self.assertAlmostEqual(max(delays), 17 / 9.0)
+
+    def test_client_rate_does_not_slow_down_other_clients(self) -> None:
+        clock: FakeClock = FakeClock()
+        domain_bucket: TokenBucket = TokenBucket(rate=9, clock=clock)
+        slow: RateLimiter = RateLimiter(rate=1, clock=clock, domain_bucket=domain_bucket)
+        fast: RateLimiter = RateLimiter(clock=clock, domain_bucket=domain_bucket)
+
+        with self.subTest('the slow client is held back by its own budget'):
+            self.assertEqual([slow.reserve('GET') for _ in range(3)], [0.0, 1.0, 2.0])
+            self.assertEqual(slow.reserve_domain(), 0.0)
+
+        with self.subTest('queued requests of the slow client do not hold domain slots'):
+            self.assertEqual(fast.reserve('GET'), 0.0)
+            self.assertAlmostEqual(fast.reserve_domain(), 1 / 9.0)
@@ -0,0 +1,125 @@
+import datetime
+import email.utils
+import unittest
+
+import requests
+import responses
+
+from evclient import BaseClient, RetryPolicy, EVTooManyRequestsException, EVInternalServerException
+from evclient.retry import parse_retry_after
+
+Response = requests.models.Response
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_backoff(self) -> None:
+        with self.subTest('delay cap doubles per attempt'):
+            policy: RetryPolicy = RetryPolicy(backoff_factor=0.5, max_backoff=3, random_func=lambda: 1.0)
+            self.assertEqual([policy.backoff(attempt) for attempt in range(4)], [0.5, 1.0, 2.0, 3])
+
+        with self.subTest('delay is jittered below the cap'):
+            policy: RetryPolicy = RetryPolicy(backoff_factor=1, random_func=lambda: 0.25)
+            self.assertEqual(policy.backoff(2), 1.0)
+
+    def test_is_retryable(self) -> None:
+        policy: RetryPolicy = RetryPolicy()
+
+        with self.subTest('GET is retried on 5xx and 429'):
+            self.assertTrue(policy.is_retryable('GET', 503))
+            self.assertTrue(policy.is_retryable('get', 429))
+
+        with self.subTest('client errors are not retried'):
+            self.assertFalse(policy.is_retryable('GET', 400))
+
+        with self.subTest('POST is only retried on 429 by default'):
+            self.assertFalse(policy.is_retryable('POST', 500))
+            self.assertFalse(policy.is_retryable('POST'))
+            self.assertTrue(policy.is_retryable('POST', 429))
+
+        with self.subTest('POST is retried when asked'):
+            policy: RetryPolicy = RetryPolicy(methods=['GET', 'POST'])
+            self.assertTrue(policy.is_retryable('POST', 500))
+            self.assertTrue(policy.is_retryable('POST'))
+
+    def test_get_delay(self) -> None:
+        policy: RetryPolicy = RetryPolicy(max_retries=2, max_retry_time=10, random_func=lambda: 1.0)
+
+        with self.subTest('Retry-After takes precedence over backoff'):
+            self.assertEqual(policy.get_delay('GET', 0, 0.0, 429, '3'), 3.0)
+
+        with self.subTest('backoff is used without Retry-After'):
+            self.assertEqual(policy.get_delay('GET', 1, 0.0, 500), 0.5)
+
+        with self.subTest('no retry when retries are exhausted'):
+            self.assertIsNone(policy.get_delay('GET', 2, 0.0, 500))
+
+        with self.subTest('no retry when the retry budget would be exceeded'):
+            self.assertIsNone(policy.get_delay('GET', 0, 8.0, 429, '3'))
+
+    def test_parse_retry_after(self) -> None:
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('not a date'))
+        self.assertEqual(parse_retry_after('2'), 2.0)
+        self.assertEqual(parse_retry_after('-1'), 0.0)
+
+        date: datetime.datetime = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+        self.assertAlmostEqual(parse_retry_after(email.utils.format_datetime(date, usegmt=True)), 30, delta=2)
+
+
+class TestClientRetry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client: BaseClient = BaseClient(
+            domain='test',
+            api_key='123456789',
+            rate_limit=None,
+            retry_policy=RetryPolicy(max_retries=2, random_func=lambda: 0.0)
+        )
+        sleep_patcher = unittest.mock.patch('evclient.base_client.time.sleep')
+        self.sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    @responses.activate
+    def test_retry_until_success(self) -> None:
+        responses.add(responses.GET, url=self.client._url, status=429, headers={'Retry-After': '1'})
+        responses.add(responses.GET, url=self.client._url, status=503)
+        responses.add(responses.GET, url=self.client._url, json={'ok': True}, status=200)
+
+        response: Response = self.client._request('GET', self.client._url)
+
+        self.assertEqual(self.client._process_response(response), {'ok': True})
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual([call.args[0] for call in self.sleep.call_args_list], [1.0, 0.0])
+
+    @responses.activate
+    def test_retries_exhausted(self) -> None:
+        responses.add(responses.GET, url=self.client._url, status=500)
+
+        response: Response = self.client._request('GET', self.client._url)
+
+        self.assertEqual(len(responses.calls), 3)
+        self.assertRaises(EVInternalServerException, self.client._process_response, response)
+
+    @responses.activate
+    def test_post_not_retried_on_server_error(self) -> None:
+        responses.add(responses.POST, url=self.client._url, status=500)
+        responses.add(responses.POST, url=self.client._url, status=429)
+
+        self.client._request('POST', self.client._url)
+        self.assertEqual(len(responses.calls), 1)
+
+    @responses.activate
+    def test_connection_errors(self) -> None:
+        responses.add(responses.GET, url=self.client._url, body=requests.ConnectionError('refused'))
+
+        self.assertRaises(requests.ConnectionError, self.client._request, 'GET', self.client._url)
+        self.assertEqual(len(responses.calls), 3)
+
+    @responses.activate
+    def test_no_retry_policy(self) -> None:
+        client: BaseClient = BaseClient(domain='test', api_key='123456789', rate_limit=None)
+        responses.add(responses.GET, url=client._url, status=429)
+
+        response: Response = client._request('GET', client._url)
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertRaises(EVTooManyRequestsException, client._process_response, response)
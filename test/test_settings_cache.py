@@ -0,0 +1,95 @@
+import unittest
+
+from evclient import SettingsCache, SettingsCacheStats
+from evclient.settings_cache import SettingsKey, find_settings_path, wrap_settings_path
+
+
+class TestSettingsCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.now: float = 0.0
+        self.cache: SettingsCache = SettingsCache(ttl=10, max_entries=2, clock=lambda: self.now)
+        self.key: SettingsKey = SettingsKey('https://test', 'node', 1)
+        self.tree = {'coco': {'default': {'hello': 'world', 'temp': 17}}}
+
+    def test_get(self) -> None:
+        self.assertEqual(self.cache.get(self.key, 'coco'), (False, None))
+        self.cache.put(self.key, 'coco', self.tree)
+
+        self.assertEqual(self.cache.get(self.key, 'coco'), (True, self.tree['coco']))
+        self.assertEqual(self.cache.get(self.key, 'coco.default.hello'), (True, 'world'))
+        self.assertEqual(self.cache.get(self.key, 'coco.other'), (False, None))
+        self.assertEqual(self.cache.get(self.key), (False, None))
+        self.assertEqual(self.cache.get(SettingsKey('https://test', 'node', 2), 'coco'), (False, None))
+
+        with self.subTest('copies are returned'):
+            self.cache.get(self.key, 'coco')[1]['default']['hello'] = 'changed'
+            self.tree['coco']['default']['hello'] = 'changed'
+            self.assertEqual(self.cache.get(self.key, 'coco.default.hello'), (True, 'world'))
+
+        self.assertEqual(self.cache.stats(), SettingsCacheStats(4, 4, 0, 0, 0, 1))
+        self.assertEqual(self.cache.stats().hit_ratio, 0.5)
+
+    def test_ttl(self) -> None:
+        self.cache.put(self.key, None, self.tree)
+        self.now = 9.9
+        self.assertTrue(self.cache.get(self.key, 'coco')[0])
+        self.now = 10.0
+        self.assertFalse(self.cache.get(self.key, 'coco')[0])
+        self.assertEqual(self.cache.stats(), SettingsCacheStats(1, 1, 1, 0, 0, 0))
+
+    def test_invalidate(self) -> None:
+        self.cache.put(self.key, None, self.tree)
+        self.cache.put(self.key, 'coco.default', self.tree)
+        self.cache.put(self.key, 'coco.other', {'coco': {'other': 1}})
+        self.cache.put(self.key, 'cocoa', {'cocoa': 1})
+
+        self.cache.invalidate(self.key, 'coco.default.temp')
+        self.assertEqual(self.cache.get(self.key, 'coco.other'), (True, 1))
+        self.assertEqual(self.cache.get(self.key, 'cocoa'), (True, 1))
+        self.assertEqual(self.cache.get(self.key, 'coco.default')[0], False)
+
+        self.cache.invalidate(self.key, 'coco')
+        self.assertEqual(self.cache.get(self.key, 'cocoa'), (True, 1))
+        self.assertEqual(self.cache.get(self.key, 'coco.other')[0], False)
+        self.cache.invalidate(self.key)
+        self.assertEqual(self.cache.stats().invalidations, 4)
+        self.assertEqual(self.cache.stats().entries, 0)
+
+    def test_generation(self) -> None:
+        generation = self.cache.generation()
+        self.cache.invalidate(self.key, 'coco.default.temp')
+        self.cache.put(self.key, 'coco', self.tree, generation)
+        self.assertFalse(self.cache.get(self.key, 'coco')[0])
+
+        self.cache.put(self.key, 'coco', self.tree, self.cache.generation())
+        self.assertTrue(self.cache.get(self.key, 'coco')[0])
+
+        with self.subTest('a single counter is kept for all resources'):
+            other = SettingsKey('https://test', 'node', 2)
+            generation = self.cache.generation()
+            self.cache.invalidate(SettingsKey('https://test', 'node', 3))
+            self.cache.put(other, 'coco', self.tree, generation)
+            self.assertFalse(self.cache.get(other, 'coco')[0])
+            self.assertEqual(self.cache.generation(), generation + 1)
+
+    def test_max_entries(self) -> None:
+        for settings_id in (1, 2, 3):
+            self.cache.put(SettingsKey('https://test', 'node', settings_id), None, self.tree)
+            self.cache.get(self.key)
+        self.assertTrue(self.cache.get(self.key)[0])
+        self.assertFalse(self.cache.get(SettingsKey('https://test', 'node', 2))[0])
+        self.assertEqual(self.cache.stats().evictions, 1)
+
+    def test_paths(self) -> None:
+        self.assertEqual(find_settings_path(self.tree, ['coco', 'default', 'temp']), (True, 17))
+        self.assertEqual(find_settings_path(self.tree, ['coco', 'default', 'temp', 'x']), (False, None))
+        self.assertEqual(find_settings_path(self.tree, []), (True, self.tree))
+        self.assertEqual(wrap_settings_path(['a', 'b'], 1), {'a': {'b': 1}})
+        self.assertEqual(wrap_settings_path([], 1), 1)
+
+    def test_invalid_ttl(self) -> None:
+        self.assertRaises(ValueError, SettingsCache, ttl=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
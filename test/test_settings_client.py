@@ -1,9 +1,19 @@
+import json
+import requests
 import responses
 import unittest
 import urllib
-from typing import Dict, Union
+from typing import Dict, List, Tuple, Union
 
-from evclient import SettingsClient
+from evclient import (
+    EVBadRequestException,
+    EVNotFoundException,
+    SettingsCache,
+    SettingsChange,
+    SettingsClient,
+    SettingsResult,
+    SettingsSyncResult
+)
 
 
 class TestSettingsClient(unittest.TestCase):
@@ -129,3 +139,143 @@ class TestSettingsClient(unittest.TestCase):
             self.assertEqual(body_params['path'][0], params['path'])
             self.assertEqual(body_params['value'][0], params['value'])
             self.assertFalse('force' in body_params)
+
+    @responses.activate
+    def test_get_settings_many(self) -> None:
+        self.client = SettingsClient(domain=self.domain, api_key=self.api_key, rate_limit=None)
+        url: str = f'{self.client._url}/{self.client._settings_api_path}/{self.settings_type}'
+        for settings_id in range(1, 21):
+            responses.add(responses.GET, url=f'{url}/{settings_id}', json={'id': settings_id}, status=200)
+        responses.replace(responses.GET, url=f'{url}/7', json={'error': 'No such node'}, status=404)
+
+        with self.subTest('results and errors of all ids'):
+            results: List[SettingsResult] = list(self.client.get_settings_many(
+                self.settings_type, list(range(1, 21)), path='coco', extract=True, max_workers=4
+            ))
+
+            self.assertEqual(sorted(result.settings_id for result in results), list(range(1, 21)))
+            self.assertEqual(len(responses.calls), 20)
+            for result in results:
+                if result.settings_id == 7:
+                    self.assertIsNone(result.settings)
+                    self.assertIsInstance(result.error, EVNotFoundException)
+                else:
+                    self.assertEqual(result.settings, {'id': result.settings_id})
+                    self.assertIsNone(result.error)
+            self.assertEqual(responses.calls[0].request.params, {'path': 'coco', 'extract': '1'})
+
+        with self.subTest('closing early stops the remaining requests'):
+            iterator = self.client.get_settings_many(self.settings_type, list(range(1, 21)), max_workers=1)
+            next(iterator)
+            iterator.close()
+            self.assertLessEqual(len(responses.calls), 20 + 3)
+
+        with self.subTest('no ids'):
+            self.assertEqual(list(self.client.get_settings_many(self.settings_type, [])), [])
+
+    @responses.activate
+    def test_sync_settings(self) -> None:
+        url: str = f'{self.client._url}/{self.client._settings_api_path}/{self.settings_type}/{self.settings_id}'
+        responses.add(responses.GET, url=url, json={'coco': {'default': {'hello': 'world', 'temp': 17}}}, status=200)
+        responses.add(responses.PUT, url=url, json={'value': '1'}, status=200)
+        tree: Dict = {'coco': {'default': {'hello': 'world', 'temp': 18, 'on': True}}}
+        changes: List[SettingsChange] = [
+            SettingsChange('coco.default.temp', 17, 18),
+            SettingsChange('coco.default.on', None, True)
+        ]
+
+        with self.subTest('dry run'):
+            res: List[SettingsChange] = self.client.sync_settings(
+                self.settings_type, self.settings_id, tree, dry_run=True
+            )
+            self.assertEqual(res, changes)
+            self.assertEqual([call.request.method for call in responses.calls], ['GET'])
+            self.assertEqual(responses.calls[0].request.params, {'extract': '0'})
+
+        with self.subTest('only changed leaves are stored'):
+            self.assertEqual(self.client.sync_settings(self.settings_type, self.settings_id, tree, force=True), changes)
+            self.assertEqual([call.request.method for call in responses.calls], ['GET', 'GET', 'PUT', 'PUT'])
+            bodies = [urllib.parse.parse_qs(call.request.body) for call in responses.calls[2:]]
+            self.assertEqual(bodies, [
+                {'path': ['coco.default.temp'], 'value': ['18'], 'force': ['1']},
+                {'path': ['coco.default.on'], 'value': ['true'], 'force': ['1']}
+            ])
+
+        with self.subTest('errors are raised'):
+            responses.replace(responses.PUT, url=url, json={'error': 'No such node'}, status=404)
+            with self.assertRaises(EVNotFoundException):
+                self.client.sync_settings(self.settings_type, self.settings_id, tree)
+
+    @responses.activate
+    def test_sync_settings_many(self) -> None:
+        self.client = SettingsClient(domain=self.domain, api_key=self.api_key, rate_limit=None)
+        url: str = f'{self.client._url}/{self.client._settings_api_path}/{self.settings_type}'
+        for settings_id in (1, 2, 3):
+            responses.add(responses.GET, url=f'{url}/{settings_id}', json={'a': settings_id}, status=200)
+            responses.add(responses.PUT, url=f'{url}/{settings_id}', json={'value': '2'}, status=200)
+        responses.replace(responses.PUT, url=f'{url}/3', json={'error': 'Bad value'}, status=400)
+
+        results: List[SettingsSyncResult] = sorted(self.client.sync_settings_many(
+            self.settings_type, {1: {'a': 2, 'b': 1}, 2: {'a': 2}, 3: {'a': 2}}, max_workers=2
+        ))
+
+        self.assertEqual(
+            results[0],
+            SettingsSyncResult(1, [SettingsChange('a', 1, 2), SettingsChange('b', None, 1)], 2, None)
+        )
+        self.assertEqual(results[1], SettingsSyncResult(2, [], 0, None))
+        self.assertEqual(results[2][:3], (3, [SettingsChange('a', 3, 2)], 0))
+        self.assertIsInstance(results[2].error, EVBadRequestException)
+        self.assertEqual(len([call for call in responses.calls if call.request.method == 'PUT']), 3)
+
+    @responses.activate
+    def test_get_settings_cached(self) -> None:
+        cache = SettingsCache(ttl=60)
+        self.client = SettingsClient(domain=self.domain, api_key=self.api_key, settings_cache=cache)
+        url: str = f'{self.client._url}/{self.client._settings_api_path}/{self.settings_type}/{self.settings_id}'
+        tree: Dict = {'coco': {'default': {'hello': 'world', 'temp': 17}}}
+        responses.add(responses.GET, url=url, json=tree, status=200)
+        responses.add(responses.PUT, url=url, json={'value': '18'}, status=200)
+
+        with self.subTest('sub-paths and extract are answered from the cached tree'):
+            self.assertEqual(self.client.get_settings('node', 1, path='coco', extract=True), tree['coco'])
+            self.assertEqual(responses.calls[0].request.params, {'path': 'coco', 'extract': '0'})
+            default: Dict = tree['coco']['default']
+            self.assertEqual(self.client.get_settings('node', 1, path='coco.default', extract=True), default)
+            self.assertEqual(self.client.get_settings('node', 1, path='coco.default'), {'coco': {'default': default}})
+            self.assertEqual(self.client.get_settings('node', 1, path='coco.default.hello', extract=True), 'world')
+            self.assertEqual(len(responses.calls), 1)
+            self.assertEqual(cache.stats()[:2], (3, 1))
+
+        with self.subTest('stored paths are invalidated'):
+            self.client.store_settings('node', 1, 'coco.default.temp', '18')
+            self.client.get_settings('node', 1, path='coco', extract=True)
+            self.assertEqual([call.request.method for call in responses.calls], ['GET', 'PUT', 'GET'])
+
+        with self.subTest('missing paths are left to the API'):
+            responses.add(responses.GET, url=url, json={}, status=200)
+            self.client.get_settings('node', 1, path='missing', extract=True)
+            self.assertEqual(responses.calls[-1].request.params, {'path': 'missing', 'extract': '1'})
+            self.assertEqual(len(responses.calls), 5)
+
+    @responses.activate
+    def test_get_settings_cached_during_store(self) -> None:
+        cache = SettingsCache(ttl=60)
+        self.client = SettingsClient(domain=self.domain, api_key=self.api_key, rate_limit=None, settings_cache=cache)
+        url: str = f'{self.client._url}/{self.client._settings_api_path}/{self.settings_type}/{self.settings_id}'
+        trees: List[Dict] = [{'coco': {'temp': 17}}, {'coco': {'temp': 18}}]
+
+        def get_callback(request: requests.PreparedRequest) -> Tuple[int, Dict, str]:
+            tree = trees.pop(0)
+            if len(trees) == 1:
+                # A store through the same client lands while the old tree is on its way back.
+                self.client.store_settings(self.settings_type, self.settings_id, 'coco.temp', '18')
+            return 200, {}, json.dumps(tree)
+
+        responses.add_callback(responses.GET, url=url, callback=get_callback)
+        responses.add(responses.PUT, url=url, json={'value': '18'}, status=200)
+
+        self.assertEqual(self.client.get_settings('node', 1, path='coco', extract=True), {'temp': 17})
+        self.assertEqual(cache.stats().entries, 0)
+        self.assertEqual(self.client.get_settings('node', 1, path='coco', extract=True), {'temp': 18})
+        self.assertEqual([call.request.method for call in responses.calls], ['PUT', 'GET', 'GET'])
@@ -0,0 +1,40 @@
+import unittest
+
+from evclient.settings_diff import SettingsChange, diff_settings, flatten_settings, settings_value
+
+
+class TestSettingsDiff(unittest.TestCase):
+    def test_flatten_settings(self) -> None:
+        self.assertEqual(
+            flatten_settings({'coco': {'default': {'hello': 'world', 'ids': [1, 2], 'empty': {}}}, 'on': True}),
+            {'coco.default.hello': 'world', 'coco.default.ids': [1, 2], 'on': True}
+        )
+        self.assertEqual(flatten_settings({}), {})
+        self.assertEqual(flatten_settings(None), {})
+        self.assertEqual(flatten_settings(1, 'a.b'), {'a.b': 1})
+
+    def test_diff_settings(self) -> None:
+        current = {'coco': {'default': {'hello': 'world', 'temp': 17, 'on': 1, 'keep': 'me'}}}
+        desired = {'coco': {'default': {'hello': 'world', 'temp': 17.0, 'on': True, 'new': [1]}}, 'x': 'y'}
+
+        self.assertEqual(diff_settings(current, desired), [
+            SettingsChange('coco.default.on', 1, True),
+            SettingsChange('coco.default.new', None, [1]),
+            SettingsChange('x', None, 'y')
+        ])
+        self.assertEqual(diff_settings(current, current), [])
+        self.assertEqual(diff_settings(None, {'a': None}), [SettingsChange('a', None, None)])
+        self.assertEqual(diff_settings({'a': '17'}, {'a': 17}), [SettingsChange('a', '17', 17)])
+
+    def test_settings_value(self) -> None:
+        self.assertEqual(settings_value('world'), '"world"')
+        self.assertEqual(settings_value('8080'), '"8080"')
+        self.assertEqual(settings_value('true'), '"true"')
+        self.assertEqual(settings_value(17), '17')
+        self.assertEqual(settings_value(True), 'true')
+        self.assertEqual(settings_value(None), 'null')
+        self.assertEqual(settings_value([1, 'a']), '[1, "a"]')
+
+
+if __name__ == '__main__':
+    unittest.main()
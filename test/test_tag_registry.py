@@ -0,0 +1,98 @@
+import unittest
+from typing import List
+from unittest import mock
+
+from evclient import NodeCatalog, NodeType, TagRegistry, TagType, TimeseriesQuery, TimeseriesQueryPlanner
+
+
+def tag(id: int, name: str, protocol_id: int) -> TagType:
+    return {'id': id, 'name': name, 'description': '', 'postfix': '', 'protocol_id': protocol_id}
+
+
+def node(id: int, protocol_id: int, sensor_ids: List[int]) -> NodeType:
+    return {
+        'id': id,
+        'uuid': str(id),
+        'name': str(id),
+        'device': {'id': id, 'name': 'Kelp-Basic', 'protocol_id': protocol_id},
+        'sensor_ids': sensor_ids
+    }
+
+
+class TestTagRegistry(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tags: List[TagType] = [
+            tag(1, 'outdoortemp', 1),
+            tag(2, 'supplytemp', 1),
+            tag(3, 'outdoortemp', 2),
+            tag(4, 'returntemp', 2)
+        ]
+        self.client = mock.Mock()
+        self.client.get_tags.side_effect = lambda: self.tags
+        self.client.get_nodes.return_value = [
+            node(10, 1, [1, 2]),
+            node(11, 2, [3]),
+            node(12, 1, [1]),
+            node(13, 1, [2])
+        ]
+        self.now: float = 0.0
+        self.registry: TagRegistry = TagRegistry(self.client, ttl=100, clock=lambda: self.now)
+
+    def test_lookups(self) -> None:
+        self.assertEqual(self.registry.get(3), self.tags[2])
+        self.assertIsNone(self.registry.get(5))
+        self.assertEqual(self.registry.resolve('outdoortemp', 2), self.tags[2])
+        self.assertEqual(self.registry.resolve_id('outdoortemp', 1), 1)
+        self.assertIsNone(self.registry.resolve_id('returntemp', 1))
+        self.assertEqual(self.registry.by_name('outdoortemp'), (self.tags[0], self.tags[2]))
+        self.assertEqual(self.registry.tag_names([1, 4, 99]), {'outdoortemp', 'returntemp'})
+        self.assertEqual(len(self.registry), 4)
+        self.assertEqual(list(self.registry), self.tags)
+        self.assertEqual(self.client.get_tags.call_count, 1)
+
+    def test_ttl(self) -> None:
+        self.assertIsNone(self.registry.age)
+        self.assertEqual(len(self.registry), 4)
+        self.now = 99.0
+        self.tags = self.tags[:1]
+        self.assertEqual(len(self.registry), 4)
+        self.now = 100.0
+        self.assertEqual(len(self.registry), 1)
+        self.assertEqual(self.client.get_tags.call_count, 2)
+
+        with self.subTest('refresh on demand'):
+            registry = TagRegistry(self.client, ttl=None, clock=lambda: self.now)
+            self.assertEqual(len(registry), 1)
+            self.now = 1e9
+            self.assertEqual(registry.age, 1e9 - 100.0)
+            self.tags = []
+            self.assertEqual(len(registry), 1)
+            registry.refresh()
+            self.assertEqual(len(registry), 0)
+
+    def test_plan(self) -> None:
+        planner = TimeseriesQueryPlanner(self.registry, NodeCatalog(self.client, ttl=None))
+        tags = ['outdoortemp', 'supplytemp', 'returntemp']
+
+        self.assertEqual(planner.plan([10, 11, 12, 13], tags), [
+            TimeseriesQuery([10], ['outdoortemp', 'supplytemp']),
+            TimeseriesQuery([11, 12], ['outdoortemp']),
+            TimeseriesQuery([13], ['supplytemp'])
+        ])
+        self.assertEqual(planner.plan(11, 'supplytemp'), [])
+
+        with self.subTest('unknown nodes and tags are kept'):
+            self.assertEqual(planner.plan([12, 99], ['outdoortemp', 'flow']), [
+                TimeseriesQuery([12, 99], ['outdoortemp', 'flow'])
+            ])
+
+        with self.subTest('unfiltered queries are not pruned'):
+            self.assertEqual(planner.plan(None, tags), [TimeseriesQuery(None, tags)])
+            self.assertEqual(planner.plan([10], None), [TimeseriesQuery([10], None)])
+
+    def test_invalid_ttl(self) -> None:
+        self.assertRaises(ValueError, TagRegistry, self.client, ttl=-1)
+
+
+if __name__ == '__main__':
+    unittest.main()
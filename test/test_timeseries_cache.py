@@ -0,0 +1,165 @@
+import datetime
+import json
+import tempfile
+import unittest
+import urllib
+from typing import Any, Dict, List, Tuple
+
+import responses
+
+from evclient import TimeseriesCache, TimeseriesClient, TimeseriesColumns
+from evclient.timeseries_cache import CacheKey, align_interval, merge_intervals
+
+UTC = datetime.timezone.utc
+MINUTE = 60000000
+
+
+class TestTimeseriesCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now: float = 1000000.0
+        self.cache: TimeseriesCache = TimeseriesCache(
+            self.tmp.name,
+            mutable_horizon=datetime.timedelta(seconds=100),
+            clock=lambda: self.now
+        )
+        self.key: CacheKey = CacheKey('https://test', 1, 'outdoortemp', None, None)
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def columns(self, *points: Tuple[int, float]) -> TimeseriesColumns:
+        return TimeseriesColumns.from_response_group({
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [{'ts': ts / 1000000, 'v': v} for ts, v in points]
+        })
+
+    def test_missing_and_update(self) -> None:
+        self.assertEqual(self.cache.missing(self.key, 0, 100), [(0, 100)])
+
+        self.cache.update(self.key, 10, 20, self.columns((10, 1.0), (15, 2.0), (25, 3.0)))
+        self.cache.update(self.key, 40, 50, None)
+
+        self.assertEqual(self.cache.missing(self.key, 0, 100), [(0, 10), (20, 40), (50, 100)])
+        self.assertEqual(self.cache.missing(self.key, 12, 18), [])
+        self.assertEqual(self.cache.read(self.key, 0, 100).v.tolist(), [1.0, 2.0])
+
+        self.cache.update(self.key, 15, 45, self.columns((30, 4.0)))
+        self.assertEqual(self.cache.missing(self.key, 0, 100), [(0, 10), (50, 100)])
+        self.assertEqual(self.cache.read(self.key, 0, 100).ts.tolist(), [10000, 30000])
+
+    def test_persistence(self) -> None:
+        self.cache.update(self.key, 10, 20, self.columns((10, 1.0)))
+
+        other: TimeseriesCache = TimeseriesCache(self.tmp.name, clock=lambda: self.now)
+        self.assertEqual(other.missing(self.key, 0, 100), [(0, 10), (20, 100)])
+        self.assertEqual(other.read(self.key, 0, 100).v.tolist(), [1.0])
+        self.assertEqual(other.missing(self.key._replace(tag='indoortemp'), 0, 100), [(0, 100)])
+
+        other.clear()
+        self.assertEqual(self.cache.missing(self.key, 0, 100), [(0, 100)])
+
+    def test_mutable_horizon(self) -> None:
+        horizon: int = self.cache.horizon()
+        self.assertEqual(horizon, 999900000000)
+
+        self.cache.update(self.key, horizon - 10, horizon + 10, self.columns((horizon - 5, 1.0), (horizon + 5, 2.0)))
+
+        self.assertEqual(self.cache.missing(self.key, horizon - 10, horizon + 10), [(horizon, horizon + 10)])
+        self.assertEqual(self.cache.read(self.key, 0, horizon + 10).v.tolist(), [1.0])
+
+    def test_intervals(self) -> None:
+        self.assertEqual(merge_intervals([(5, 8), (0, 2), (2, 3), (7, 9)]), [(0, 3), (5, 9)])
+        self.assertEqual(align_interval(90 * MINUTE + 1, 100 * MINUTE, 'hour'), (60 * MINUTE, 120 * MINUTE))
+        self.assertEqual(align_interval(1, 2, None), (1, 2))
+
+
+class TestCachedTimeseriesData(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.now: datetime.datetime = datetime.datetime(2022, 1, 2, tzinfo=UTC)
+        self.cache: TimeseriesCache = TimeseriesCache(
+            self.tmp.name,
+            mutable_horizon=datetime.timedelta(hours=1),
+            clock=lambda: self.now.timestamp()
+        )
+        self.client: TimeseriesClient = TimeseriesClient(domain='test', api_key='123456789', rate_limit=None)
+        self.queries: List[Dict[str, Any]] = []
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def handle(self, request) -> Tuple[int, Dict[str, str], str]:
+        query: Dict[str, str] = dict(urllib.parse.parse_qsl(urllib.parse.urlparse(request.url).query))
+        self.queries.append(query)
+        start = datetime.datetime.fromisoformat(query['start']).timestamp()
+        end = datetime.datetime.fromisoformat(query['end']).timestamp()
+        node_ids = json.loads(query['node_ids']) if 'node_ids' in query else [int(query['node_id'])]
+        tags = json.loads(query['tags']) if 'tags' in query else [query['tag']]
+        first = int(start // 600 + (start % 600 > 0))
+        timeseries = [{
+            'node_id': node_id,
+            'tag': tag,
+            'data': [{'ts': i * 600, 'v': node_id + i} for i in range(first, int(end // 600) + 1)]
+        } for node_id in node_ids for tag in tags]
+        return 200, {}, json.dumps({'timeseries': timeseries})
+
+    def get(self, start: datetime.datetime, end: datetime.datetime, **kwargs) -> List[TimeseriesColumns]:
+        return self.client.get_timeseries_data([1, 2], 'outdoortemp', start, end, columnar=True, cache=self.cache,
+                                               **kwargs)
+
+    @responses.activate
+    def test_fetches_missing_ranges_only(self) -> None:
+        responses.add_callback(responses.GET, f'{self.client._url}/timeseries', callback=self.handle)
+        day = datetime.datetime(2022, 1, 1, tzinfo=UTC)
+
+        first: List[TimeseriesColumns] = self.get(day + datetime.timedelta(hours=2), day + datetime.timedelta(hours=4))
+        self.assertEqual([len(columns) for columns in first], [13, 13])
+        self.assertEqual(len(self.queries), 1)
+
+        again: List[TimeseriesColumns] = self.get(day + datetime.timedelta(hours=3), day + datetime.timedelta(hours=4))
+        self.assertEqual(len(self.queries), 1)
+        self.assertEqual(again[0].ts.tolist(), first[0].ts.tolist()[6:])
+
+        wider: List[TimeseriesColumns] = self.get(day + datetime.timedelta(hours=1), day + datetime.timedelta(hours=5))
+        self.assertEqual(len(self.queries), 3)
+        self.assertEqual(self.queries[1]['start'], '2022-01-01T01:00:00+00:00')
+        self.assertEqual(self.queries[1]['end'], '2022-01-01T01:59:59.999999+00:00')
+        self.assertEqual(self.queries[2]['start'], '2022-01-01T04:00:00.000001+00:00')
+        self.assertEqual(len(wider[1]), 25)
+        self.assertEqual(wider[1].v.tolist(), [2.0 + ts // 600000000000 for ts in wider[1].ts.tolist()])
+        self.assertEqual(sorted(set(wider[1].ts.tolist())), wider[1].ts.tolist())
+
+    @responses.activate
+    def test_recent_data_is_always_fetched(self) -> None:
+        responses.add_callback(responses.GET, f'{self.client._url}/timeseries', callback=self.handle)
+        start: datetime.datetime = self.now - datetime.timedelta(hours=2)
+
+        first: List[TimeseriesColumns] = self.get(start, self.now)
+        second: List[TimeseriesColumns] = self.get(start, self.now)
+
+        self.assertEqual(len(self.queries), 2)
+        self.assertEqual(self.queries[1]['start'], '2022-01-01T23:00:00+00:00')
+        self.assertEqual(first, second)
+        self.assertEqual(len(first[0]), 13)
+
+    @responses.activate
+    def test_aggregated_resolution_and_groups(self) -> None:
+        responses.add_callback(responses.GET, f'{self.client._url}/timeseries', callback=self.handle)
+        day = datetime.datetime(2022, 1, 1, tzinfo=UTC)
+
+        groups = self.client.get_timeseries_data(1, 'outdoortemp', day + datetime.timedelta(minutes=75),
+                                                 day + datetime.timedelta(minutes=100), resolution='hour',
+                                                 cache=self.cache)
+
+        self.assertEqual(self.queries[0]['start'], '2022-01-01T01:00:00+00:00')
+        self.assertEqual(self.queries[0]['end'], '2022-01-01T01:59:59.999999+00:00')
+        self.assertEqual(groups[0]['data'][0]['ts'], day + datetime.timedelta(minutes=80))
+
+    def test_requires_bounded_query(self) -> None:
+        with self.assertRaises(ValueError):
+            self.client.get_timeseries_data([1], 'outdoortemp', cache=self.cache)
+        with self.assertRaises(ValueError):
+            self.client.get_timeseries_data([1], 'outdoortemp', datetime.datetime(2022, 1, 1),
+                                            datetime.datetime(2022, 1, 2), cache=self.cache)
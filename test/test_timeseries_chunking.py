@@ -0,0 +1,129 @@
+import datetime
+import unittest
+from typing import List
+
+from evclient.timeseries_chunking import (
+    TimeseriesChunk,
+    merge_timeseries_groups,
+    plan_timeseries_chunks,
+    split_time_window
+)
+from evclient import TimeseriesGroup
+
+UTC = datetime.timezone.utc
+
+
+class TestPlanTimeseriesChunks(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start: datetime.datetime = datetime.datetime(2022, 1, 1, 0, 30, tzinfo=UTC)
+        self.end: datetime.datetime = datetime.datetime(2022, 1, 1, 12, 30, tzinfo=UTC)
+
+    def test_single_chunk_without_limits(self) -> None:
+        chunks: List[TimeseriesChunk] = plan_timeseries_chunks([1, 2, 3], self.start, self.end)
+        self.assertEqual(chunks, [TimeseriesChunk([1, 2, 3], self.start, self.end)])
+
+    def test_node_batches(self) -> None:
+        chunks: List[TimeseriesChunk] = plan_timeseries_chunks([1, 2, 3, 4, 5], max_nodes_per_request=2)
+        self.assertEqual([chunk.node_ids for chunk in chunks], [[1, 2], [3, 4], [5]])
+
+    def test_points_budget_shrinks_node_batches(self) -> None:
+        chunks: List[TimeseriesChunk] = plan_timeseries_chunks(
+            [1, 2, 3, 4, 5],
+            self.start,
+            self.end,
+            resolution='hour',
+            tags_per_node=2,
+            max_points_per_request=50
+        )
+        # 12 hours and 2 tags are 24 points per node, two nodes fit in a request
+        self.assertEqual([chunk.node_ids for chunk in chunks], [[1, 2], [3, 4], [5]])
+        self.assertTrue(all(chunk.start == self.start and chunk.end == self.end for chunk in chunks))
+
+    def test_points_budget_splits_time_window(self) -> None:
+        chunks: List[TimeseriesChunk] = plan_timeseries_chunks(
+            [1, 2],
+            self.start,
+            self.end,
+            sample_interval=60,
+            max_points_per_request=300
+        )
+        # 720 points per node gives slices of 300 minutes
+        self.assertEqual(len(chunks), 6)
+        self.assertEqual([chunk.node_ids for chunk in chunks], [[1]] * 3 + [[2]] * 3)
+        self.assertEqual(chunks[0].start, self.start)
+        self.assertEqual(chunks[0].end, datetime.datetime(2022, 1, 1, 5, 29, 59, 999999, tzinfo=UTC))
+        self.assertEqual(chunks[1].start, datetime.datetime(2022, 1, 1, 5, 30, tzinfo=UTC))
+        self.assertEqual(chunks[1].end, datetime.datetime(2022, 1, 1, 10, 29, 59, 999999, tzinfo=UTC))
+        self.assertEqual(chunks[2].start, datetime.datetime(2022, 1, 1, 10, 30, tzinfo=UTC))
+        self.assertEqual(chunks[2].end, self.end)
+
+    def test_slices_start_at_whole_resolution_periods(self) -> None:
+        chunks: List[TimeseriesChunk] = plan_timeseries_chunks(
+            [1],
+            datetime.datetime(2022, 1, 1, 0, 20),
+            datetime.datetime(2022, 1, 1, 3, 0),
+            resolution='hour',
+            max_points_per_request=1
+        )
+        self.assertEqual([(chunk.start, chunk.end) for chunk in chunks], [
+            (datetime.datetime(2022, 1, 1, 0, 20), datetime.datetime(2022, 1, 1, 0, 59, 59, 999999)),
+            (datetime.datetime(2022, 1, 1, 1, 0), datetime.datetime(2022, 1, 1, 1, 59, 59, 999999)),
+            (datetime.datetime(2022, 1, 1, 2, 0), datetime.datetime(2022, 1, 1, 2, 59, 59, 999999)),
+            (datetime.datetime(2022, 1, 1, 3, 0), datetime.datetime(2022, 1, 1, 3, 0)),
+        ])
+
+    def test_calendar_resolutions_are_not_sliced(self) -> None:
+        chunks: List[TimeseriesChunk] = plan_timeseries_chunks(
+            [1],
+            self.start,
+            self.end,
+            resolution='day',
+            max_points_per_request=1
+        )
+        self.assertEqual(chunks, [TimeseriesChunk([1], self.start, self.end)])
+
+
+class TestSplitTimeWindow(unittest.TestCase):
+    def test_raw_windows_are_aligned(self) -> None:
+        windows = split_time_window(
+            datetime.datetime(2022, 1, 1, 6, tzinfo=UTC),
+            datetime.datetime(2022, 1, 3, tzinfo=UTC),
+            datetime.timedelta(days=1)
+        )
+        last: datetime.timedelta = datetime.timedelta(days=1, microseconds=-1)
+        self.assertEqual(windows, [
+            (datetime.datetime(2022, 1, 1, 6, tzinfo=UTC), datetime.datetime(2022, 1, 1, tzinfo=UTC) + last),
+            (datetime.datetime(2022, 1, 2, tzinfo=UTC), datetime.datetime(2022, 1, 2, tzinfo=UTC) + last),
+            (datetime.datetime(2022, 1, 3, tzinfo=UTC), datetime.datetime(2022, 1, 3, tzinfo=UTC)),
+        ])
+
+    def test_resolution(self) -> None:
+        start: datetime.datetime = datetime.datetime(2022, 1, 1, 0, 30, tzinfo=UTC)
+        end: datetime.datetime = datetime.datetime(2022, 1, 1, 3, 30, tzinfo=UTC)
+
+        windows = split_time_window(start, end, datetime.timedelta(minutes=90), 'hour')
+        self.assertEqual([window_start.hour for window_start, _ in windows], [0, 2])
+        self.assertEqual(split_time_window(start, end, datetime.timedelta(hours=1), 'day'), [(start, end)])
+        with self.assertRaises(ValueError):
+            split_time_window(start, end, datetime.timedelta(0))
+
+
+class TestMergeTimeseriesGroups(unittest.TestCase):
+    def test_merge(self) -> None:
+        first: List[TimeseriesGroup] = [
+            {'node_id': 1, 'tag': 'a', 'data': [{'v': 1.0, 'ts': 1}]},
+            {'node_id': 1, 'tag': 'b', 'data': [{'v': 2.0, 'ts': 1}]},
+        ]
+        second: List[TimeseriesGroup] = [
+            {'node_id': 1, 'tag': 'a', 'data': [{'v': 3.0, 'ts': 2}]},
+        ]
+        third: List[TimeseriesGroup] = [
+            {'node_id': 2, 'tag': 'a', 'data': [{'v': 4.0, 'ts': 1}]},
+        ]
+
+        self.assertEqual(merge_timeseries_groups([first, second, None, third]), [
+            {'node_id': 1, 'tag': 'a', 'data': [{'v': 1.0, 'ts': 1}, {'v': 3.0, 'ts': 2}]},
+            {'node_id': 1, 'tag': 'b', 'data': [{'v': 2.0, 'ts': 1}]},
+            {'node_id': 2, 'tag': 'a', 'data': [{'v': 4.0, 'ts': 1}]},
+        ])
+        self.assertEqual(first[0]['data'], [{'v': 1.0, 'ts': 1}])
@@ -1,10 +1,13 @@
 import copy
+import datetime
 import json
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 import pyrfc3339
+import requests
 import responses
 import unittest
+import unittest.mock
 import urllib
 
 
@@ -14,7 +17,11 @@ from evclient import (
     StoreTimeseriesResponse,
     TimeseriesResponseGroup,
     TimeseriesGroup,
-    StoreTimeseriesData
+    TimeseriesColumns,
+    StoreTimeseriesData,
+    TimeseriesQuery,
+    TimeseriesQueryPlanner,
+    EVNotFoundException
 )
 
 
@@ -122,6 +129,13 @@ class TestTimeseriesClient(unittest.TestCase):
             self.assertEqual(res, parse_response(mock_response))
             self.assertEqual(len(responses.calls), 2)
 
+        with self.subTest('call successful with columnar result'):
+            res: List[TimeseriesColumns] = self.client.get_timeseries_data(node_ids=1, columnar=True)
+
+            self.assertEqual(len(res), 1)
+            self.assertIsInstance(res[0], TimeseriesColumns)
+            self.assertEqual(res[0].to_group(), parse_response(mock_response)[0])
+
             expected_query_params: Dict[str, Any] = {
                 'node_id': str(params['node_ids']),
                 'tag': params['tags'],
@@ -149,6 +163,261 @@ class TestTimeseriesClient(unittest.TestCase):
             self.assertEqual(responses.calls[1].request.params.get('aggregate'), expected_query_params['aggregate'])
             self.assertEqual(responses.calls[1].request.params.get('epoch'), expected_query_params['epoch'])
 
+    @responses.activate
+    def test_get_timeseries_data_stream(self) -> None:
+        mock_response: TimeseriesResponse = {
+            'timeseries': [
+                {
+                    'node_id': node_id,
+                    'tag': 'outdoortemp',
+                    'data': [{'v': float(i), 'ts': f'2020-01-01T00:{i // 60:02}:{i % 60:02}+01:00'} for i in range(25)]
+                } for node_id in [1, 2]
+            ] + [{'node_id': 3, 'tag': 'outdoortemp', 'data': []}]
+        }
+        url: str = f'{self.client._url}/{self.client._timeseries_api_path}'
+        responses.add(responses.GET, url=url, json=mock_response, status=200)
+
+        with unittest.mock.patch('evclient.timeseries_client.STREAM_CHUNK_SIZE', 7), \
+                unittest.mock.patch('evclient.timeseries_client.STREAM_BATCH_SIZE', 10):
+            with self.subTest('streamed result equals the buffered result'):
+                self.assertEqual(
+                    self.client.get_timeseries_data(node_ids=[1, 2, 3], stream=True),
+                    self.client.get_timeseries_data(node_ids=[1, 2, 3])
+                )
+
+            with self.subTest('streamed columnar result'):
+                res: List[TimeseriesColumns] = self.client.get_timeseries_data(
+                    node_ids=[1, 2, 3], stream=True, columnar=True
+                )
+                self.assertEqual([(columns.node_id, len(columns)) for columns in res], [(1, 25), (2, 25), (3, 0)])
+                self.assertEqual(res, self.client.get_timeseries_data(node_ids=[1, 2, 3], columnar=True))
+
+        with self.subTest('errors are mapped as usual'):
+            responses.replace(responses.GET, url=url, json={'error': 'No such node'}, status=404)
+            with self.assertRaises(EVNotFoundException):
+                self.client.get_timeseries_data(node_ids=[4], stream=True)
+
+    @responses.activate
+    def test_get_timeseries_data_epoch(self) -> None:
+        mock_response: TimeseriesResponse = {
+            'timeseries': [
+                {
+                    'node_id': 1,
+                    'tag': 'outdoortemp',
+                    'data': [
+                        {'v': 2.6, 'ts': 1577833557},
+                        {'v': 2.7, 'ts': 1577834137.5}
+                    ]
+                }
+            ]
+        }
+
+        responses.add(
+            responses.GET,
+            url=f'{self.client._url}/{self.client._timeseries_api_path}',
+            json=mock_response,
+            status=200
+        )
+
+        with self.subTest('numeric timestamps are converted to UTC datetimes'):
+            res: List[TimeseriesGroup] = self.client.get_timeseries_data(node_ids=1, epoch=True)
+
+            self.assertEqual(res[0]['data'], [
+                {'v': 2.6, 'ts': pyrfc3339.parse('2020-01-01T00:05:57+01:00')},
+                {'v': 2.7, 'ts': pyrfc3339.parse('2020-01-01T00:15:37.5+01:00')}
+            ])
+            self.assertEqual(res[0]['data'][0]['ts'].tzinfo, datetime.timezone.utc)
+            self.assertEqual(responses.calls[0].request.params.get('epoch'), '1')
+
+        with self.subTest('numeric timestamps are kept with raw_epoch'):
+            res: List[TimeseriesGroup] = self.client.get_timeseries_data(node_ids=1, epoch=True, raw_epoch=True)
+
+            self.assertEqual(res, mock_response['timeseries'])
+
+        with self.subTest('numeric timestamps are converted to nanoseconds in columnar mode'):
+            res: List[TimeseriesColumns] = self.client.get_timeseries_data(node_ids=1, epoch=True, columnar=True)
+
+            self.assertEqual(res[0].ts.tolist(), [1577833557000000000, 1577834137500000000])
+
+    @responses.activate
+    def test_get_timeseries_data_chunked(self) -> None:
+        def callback(request: requests.PreparedRequest) -> Tuple[int, Dict, str]:
+            node_ids: List[int] = json.loads(request.params['node_ids'])
+            start: datetime.datetime = pyrfc3339.parse(request.params['start'])
+            return 200, {}, json.dumps({'timeseries': [{
+                'node_id': node_id,
+                'tag': 'outdoortemp',
+                'data': [{'v': float(node_id), 'ts': pyrfc3339.generate(start, utc=False)}]
+            } for node_id in node_ids]})
+
+        responses.add_callback(
+            responses.GET,
+            url=f'{self.client._url}/{self.client._timeseries_api_path}',
+            callback=callback
+        )
+
+        start: datetime.datetime = pyrfc3339.parse('2020-01-01T00:00:00+00:00')
+        end: datetime.datetime = pyrfc3339.parse('2020-01-01T01:59:00+00:00')
+
+        with self.subTest('request is split into node batches and time slices'):
+            res: List[TimeseriesGroup] = self.client.get_timeseries_data(
+                node_ids=[1, 2, 3],
+                tags=['outdoortemp'],
+                start=start,
+                end=end,
+                resolution='minute',
+                max_nodes_per_request=2,
+                max_points_per_request=60
+            )
+
+            self.assertEqual(len(responses.calls), 6)
+            self.assertEqual(res, [{
+                'node_id': node_id,
+                'tag': 'outdoortemp',
+                'data': [
+                    {'v': float(node_id), 'ts': start},
+                    {'v': float(node_id), 'ts': pyrfc3339.parse('2020-01-01T01:00:00+00:00')}
+                ]
+            } for node_id in [1, 2, 3]])
+
+        with self.subTest('small requests are sent as is'):
+            self.client.get_timeseries_data(node_ids=[1, 2, 3], start=start, end=end, max_nodes_per_request=3)
+            self.assertEqual(len(responses.calls), 7)
+
+        with self.subTest('columnar chunks are concatenated'):
+            res: List[TimeseriesColumns] = self.client.get_timeseries_data(
+                node_ids=[1, 2],
+                start=start,
+                end=end,
+                resolution='minute',
+                max_points_per_request=60,
+                columnar=True
+            )
+
+            self.assertEqual(len(responses.calls), 11)
+            self.assertEqual([columns.node_id for columns in res], [1, 2])
+            self.assertEqual(res[0].ts.tolist(), [1577836800000000000, 1577840400000000000])
+            self.assertEqual(res[1].v.tolist(), [2.0, 2.0])
+
+    @responses.activate
+    def test_get_timeseries_data_chunked_single_node(self) -> None:
+        def callback(request: requests.PreparedRequest) -> Tuple[int, Dict, str]:
+            start: datetime.datetime = pyrfc3339.parse(request.params['start'])
+            return 200, {}, json.dumps({'timeseries': [{
+                'node_id': int(request.params.get('node_id', 0)),
+                'tag': 'outdoortemp',
+                'data': [{'v': 1.0, 'ts': pyrfc3339.generate(start, utc=False)}]
+            }]})
+
+        responses.add_callback(
+            responses.GET,
+            url=f'{self.client._url}/{self.client._timeseries_api_path}',
+            callback=callback
+        )
+        start: datetime.datetime = pyrfc3339.parse('2020-01-01T00:00:00+00:00')
+        end: datetime.datetime = pyrfc3339.parse('2020-01-01T01:59:00+00:00')
+
+        with self.subTest('a single node is sliced in time'):
+            res: List[TimeseriesGroup] = self.client.get_timeseries_data(
+                node_ids=5, tags='outdoortemp', start=start, end=end, resolution='minute', max_points_per_request=60
+            )
+
+            self.assertEqual(len(responses.calls), 2)
+            for call in responses.calls:
+                self.assertEqual(call.request.params['node_id'], '5')
+                self.assertNotIn('node_ids', call.request.params)
+            self.assertEqual(res, [{
+                'node_id': 5,
+                'tag': 'outdoortemp',
+                'data': [
+                    {'v': 1.0, 'ts': start},
+                    {'v': 1.0, 'ts': pyrfc3339.parse('2020-01-01T01:00:00+00:00')}
+                ]
+            }])
+
+        with self.subTest('no node filter is sliced in time'):
+            self.client.get_timeseries_data(
+                tags='outdoortemp', start=start, end=end, resolution='minute', max_points_per_request=60
+            )
+
+            self.assertEqual(len(responses.calls), 4)
+            for call in responses.calls[2:]:
+                self.assertNotIn('node_id', call.request.params)
+                self.assertNotIn('node_ids', call.request.params)
+
+    @responses.activate
+    def test_get_timeseries_data_planned(self) -> None:
+        def callback(request: requests.PreparedRequest) -> Tuple[int, Dict, str]:
+            node_ids: List[int] = json.loads(request.params['node_ids'])
+            tags: List[str] = json.loads(request.params['tags'])
+            return 200, {}, json.dumps({'timeseries': [
+                {'node_id': node_id, 'tag': tag, 'data': [{'v': 1.0, 'ts': 1577836800}]}
+                for node_id in node_ids for tag in tags
+            ]})
+
+        responses.add_callback(
+            responses.GET,
+            url=f'{self.client._url}/{self.client._timeseries_api_path}',
+            callback=callback
+        )
+        planner = unittest.mock.Mock(spec=TimeseriesQueryPlanner)
+
+        with self.subTest('one request per planned query'):
+            planner.plan.return_value = [TimeseriesQuery([1, 3], ['a', 'b']), TimeseriesQuery([2], ['a'])]
+            res: List[TimeseriesGroup] = self.client.get_timeseries_data(
+                [1, 2, 3], ['a', 'b'], epoch=True, raw_epoch=True, planner=planner
+            )
+
+            planner.plan.assert_called_once_with([1, 2, 3], ['a', 'b'])
+            self.assertEqual(len(responses.calls), 2)
+            self.assertEqual(
+                [(group['node_id'], group['tag']) for group in res],
+                [(1, 'a'), (1, 'b'), (3, 'a'), (3, 'b'), (2, 'a')]
+            )
+
+        with self.subTest('no request when no pair exists'):
+            planner.plan.return_value = []
+            self.assertEqual(self.client.get_timeseries_data([1], ['c'], planner=planner), [])
+            self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_iter_timeseries_data(self) -> None:
+        def callback(request: requests.PreparedRequest) -> Tuple[int, Dict, str]:
+            node_ids: List[int] = json.loads(request.params['node_ids'])
+            start: datetime.datetime = pyrfc3339.parse(request.params['start'])
+            return 200, {}, json.dumps({'timeseries': [{
+                'node_id': node_id,
+                'tag': 'outdoortemp',
+                'data': [{'v': float(node_id), 'ts': pyrfc3339.generate(start, utc=False)}]
+            } for node_id in node_ids]})
+
+        responses.add_callback(
+            responses.GET,
+            url=f'{self.client._url}/{self.client._timeseries_api_path}',
+            callback=callback
+        )
+
+        start: datetime.datetime = pyrfc3339.parse('2020-01-01T00:00:00+00:00')
+        groups = self.client.iter_timeseries_data(
+            node_ids=[1, 2, 3],
+            tags='outdoortemp',
+            start=start,
+            end=pyrfc3339.parse('2020-01-03T12:00:00+00:00'),
+            max_nodes_per_request=2
+        )
+
+        first: TimeseriesGroup = next(groups)
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(first, {'node_id': 1, 'tag': 'outdoortemp', 'data': [{'v': 1.0, 'ts': start}]})
+
+        rest: List[TimeseriesGroup] = list(groups)
+        self.assertEqual(len(responses.calls), 6)
+        self.assertEqual(
+            [(group['node_id'], group['data'][0]['ts'].day) for group in rest],
+            [(2, 1), (3, 1), (1, 2), (2, 2), (3, 2), (1, 3), (2, 3), (3, 3)]
+        )
+        self.assertEqual(responses.calls[5].request.params['end'], '2020-01-03T12:00:00+00:00')
+
     @responses.activate
     def test_store_timeseries_data(self) -> None:
         mock_response: StoreTimeseriesResponse = {
@@ -0,0 +1,99 @@
+import datetime
+import json
+import unittest
+from unittest import mock
+from typing import List
+
+from evclient import TimeseriesColumns, TimeseriesGroup
+from evclient import columnar
+from evclient.timeseries_encoder import encode_timeseries
+
+CET = datetime.timezone(datetime.timedelta(hours=1))
+
+
+class TestEncodeTimeseries(unittest.TestCase):
+    def test_matches_json_dumps_for_strings(self) -> None:
+        timeseries: List[TimeseriesGroup] = [{
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [{'v': 2.6, 'ts': '2020-01-01T00:05:57+01:00'}, {'v': 3, 'ts': '2020-01-01T00:15:37+01:00'}]
+        }, {
+            'node_id': 2,
+            'tag': 'in"door',
+            'data': []
+        }]
+        self.assertEqual(encode_timeseries(timeseries), json.dumps(timeseries))
+
+    def test_timestamps(self) -> None:
+        timeseries: List[TimeseriesGroup] = [{
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [
+                {'v': 1.0, 'ts': datetime.datetime(2020, 1, 1, tzinfo=CET)},
+                {'v': 2.0, 'ts': '2020-01-01T00:15:00+01:00'},
+                {'v': 3.0, 'ts': 1577834100.5},
+                {'v': 4.0, 'ts': 1577834200},
+            ]
+        }]
+        self.assertEqual([row['ts'] for row in json.loads(encode_timeseries(timeseries))[0]['data']], [
+            '2020-01-01T00:00:00+01:00',
+            '2020-01-01T00:15:00+01:00',
+            '2019-12-31T23:15:00.500000+00:00',
+            '2019-12-31T23:16:40+00:00',
+        ])
+
+    def test_missing_values(self) -> None:
+        timeseries: List[TimeseriesGroup] = [{
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [
+                {'v': None, 'ts': '2020-01-01T00:00:00+01:00'},
+                {'v': float('nan'), 'ts': '2020-01-01T00:00:00+01:00'},
+                {'v': 1e-7, 'ts': '2020-01-01T00:00:00+01:00'},
+                {'v': True, 'ts': '2020-01-01T00:00:00+01:00'},
+            ]
+        }]
+        self.assertEqual(
+            [row['v'] for row in json.loads(encode_timeseries(timeseries))[0]['data']],
+            [None, None, 1e-7, True]
+        )
+
+    def test_infinite_values(self) -> None:
+        def reject(constant: str) -> None:
+            raise ValueError(f'{constant} is not valid JSON')
+
+        timeseries: List[TimeseriesGroup] = [{
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [
+                {'v': 2.5, 'ts': '2020-01-01T00:00:00+01:00'},
+                {'v': float('inf'), 'ts': '2020-01-01T00:00:00+01:00'},
+                {'v': float('-inf'), 'ts': '2020-01-01T00:00:00+01:00'},
+            ]
+        }]
+        encoded = json.loads(encode_timeseries(timeseries), parse_constant=reject)
+        self.assertEqual([row['v'] for row in encoded[0]['data']], [2.5, None, None])
+
+    def test_columns(self) -> None:
+        for numpy in [columnar.numpy, None]:
+            with self.subTest(numpy=numpy is not None), mock.patch.object(columnar, 'numpy', numpy):
+                columns: TimeseriesColumns = TimeseriesColumns.from_response_group({
+                    'node_id': 1,
+                    'tag': 'outdoortemp',
+                    'data': [
+                        {'v': 2.6, 'ts': '2020-01-01T00:05:57.25+01:00'},
+                        {'v': None, 'ts': '2020-01-01T00:15:37+01:00'}
+                    ]
+                })
+                encoded = json.loads(encode_timeseries([columns]))
+
+                self.assertEqual(encoded[0]['node_id'], 1)
+                self.assertEqual(encoded[0]['tag'], 'outdoortemp')
+                self.assertEqual([row['v'] for row in encoded[0]['data']], [2.6, None])
+                self.assertEqual(
+                    [datetime.datetime.fromisoformat(row['ts'].replace('Z', '+00:00')) for row in encoded[0]['data']],
+                    [
+                        datetime.datetime(2020, 1, 1, 0, 5, 57, 250000, tzinfo=CET),
+                        datetime.datetime(2019, 12, 31, 23, 15, 37, tzinfo=datetime.timezone.utc)
+                    ]
+                )
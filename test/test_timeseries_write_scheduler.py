@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+from concurrent.futures import Future
+from typing import List, Set, Tuple
+
+from evclient import TimeseriesGroup, TimeseriesWriteScheduler
+
+
+class FakeClient:
+    def __init__(self, delay: float = 0.02) -> None:
+        self.delay: float = delay
+        self.lock = threading.Lock()
+        self.in_flight: Set[Tuple[int, str]] = set()
+        self.max_in_flight: int = 0
+        self.conflicts: int = 0
+        self.calls: List[List[TimeseriesGroup]] = []
+        self.fail_node: int = -1
+
+    def store_multiple_timeseries_data(self, timeseries: List[TimeseriesGroup], **kwargs) -> None:
+        keys = {(group['node_id'], group['tag']) for group in timeseries}
+        with self.lock:
+            self.conflicts += len(keys & self.in_flight)
+            self.in_flight |= keys
+            self.max_in_flight = max(self.max_in_flight, len(self.in_flight))
+            self.calls.append(timeseries)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= keys
+        if any(group['node_id'] == self.fail_node for group in timeseries):
+            raise RuntimeError('boom')
+
+
+def group(node_id: int, tag: str = 'a') -> TimeseriesGroup:
+    return {'node_id': node_id, 'tag': tag, 'data': [{'v': 1.0, 'ts': '2020-01-01T00:00:00+01:00'}]}
+
+
+class TestTimeseriesWriteScheduler(unittest.TestCase):
+    def test_keys_are_written_one_at_a_time(self) -> None:
+        client: FakeClient = FakeClient()
+        with TimeseriesWriteScheduler(client, max_workers=4) as scheduler:
+            for _ in range(5):
+                scheduler.submit([group(1), group(2), group(3), group(1, 'b')])
+
+        self.assertEqual(client.conflicts, 0)
+        self.assertEqual(client.max_in_flight, 4)
+        self.assertEqual(sum(len(call) for call in client.calls), 20)
+        # Groups queued behind an in-flight write of their key are sent together
+        self.assertLess(len(client.calls), 20)
+
+    def test_max_workers(self) -> None:
+        client: FakeClient = FakeClient()
+        with TimeseriesWriteScheduler(client, max_workers=2) as scheduler:
+            scheduler.store([group(node_id) for node_id in range(6)])
+
+        self.assertEqual(client.max_in_flight, 2)
+        self.assertEqual(len(client.calls), 6)
+
+    def test_overwrite_sends_groups_separately(self) -> None:
+        client: FakeClient = FakeClient(delay=0.0)
+        with TimeseriesWriteScheduler(client, overwrite=True) as scheduler:
+            scheduler.store([group(1), group(1), group(1)])
+
+        self.assertEqual([len(call) for call in client.calls], [1, 1, 1])
+
+    def test_errors(self) -> None:
+        client: FakeClient = FakeClient(delay=0.0)
+        client.fail_node = 2
+        with TimeseriesWriteScheduler(client) as scheduler:
+            futures: List[Future] = scheduler.submit([group(1), group(2)])
+            scheduler.flush()
+            self.assertIsNone(futures[0].result())
+            self.assertIsInstance(futures[1].exception(), RuntimeError)
+
+            with self.assertRaises(RuntimeError):
+                scheduler.store([group(2), group(3)])
+            self.assertEqual(len(client.calls), 4)
@@ -0,0 +1,129 @@
+import datetime
+import json
+import queue
+import threading
+import unittest
+import urllib
+from typing import Any, Dict, List
+
+import responses
+
+from evclient import TimeseriesClient, TimeseriesWriter, TimeseriesGroup
+
+
+class FakeClient:
+    def __init__(self) -> None:
+        self.calls: List[List[TimeseriesGroup]] = []
+        self.kwargs: List[Any] = []
+        self.release = threading.Event()
+        self.release.set()
+        self.fail: bool = False
+
+    def store_multiple_timeseries_data(self, timeseries: List[TimeseriesGroup], **kwargs) -> None:
+        self.release.wait()
+        if self.fail:
+            raise RuntimeError('boom')
+        self.calls.append(timeseries)
+        self.kwargs.append(kwargs)
+
+
+class TestTimeseriesWriter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.client: FakeClient = FakeClient()
+        self.ts: datetime.datetime = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc)
+
+    def test_groups_points_by_node_and_tag(self) -> None:
+        with TimeseriesWriter(self.client, flush_interval=60) as writer:
+            writer.write(1, 'a', 1.0, self.ts)
+            writer.write(2, 'a', 2.0, self.ts)
+            writer.write(1, 'a', 3.0, self.ts)
+            writer.write(1, 'b', 4.0, self.ts)
+
+        self.assertEqual(self.client.calls, [[
+            {'node_id': 1, 'tag': 'a', 'data': [{'ts': self.ts, 'v': 1.0}, {'ts': self.ts, 'v': 3.0}]},
+            {'node_id': 2, 'tag': 'a', 'data': [{'ts': self.ts, 'v': 2.0}]},
+            {'node_id': 1, 'tag': 'b', 'data': [{'ts': self.ts, 'v': 4.0}]},
+        ]])
+        self.assertEqual(self.client.kwargs, [{'overwrite': False, 'silent': True}])
+        self.assertTrue(writer.closed)
+        with self.assertRaises(ValueError):
+            writer.write(1, 'a', 1.0, self.ts)
+
+    def test_write_while_closing(self) -> None:
+        writer: TimeseriesWriter = TimeseriesWriter(self.client, flush_interval=60)
+        closer = threading.Thread(target=writer.close)
+        put = writer._queue.put
+
+        def put_while_closing(item: Any, *args: Any, **kwargs: Any) -> None:
+            if isinstance(item, tuple):
+                closer.start()
+                threading.Event().wait(0.05)
+            put(item, *args, **kwargs)
+
+        writer._queue.put = put_while_closing
+        writer.write(1, 'a', 1.0, self.ts)
+        closer.join()
+
+        self.assertEqual(self.client.calls, [[{'node_id': 1, 'tag': 'a', 'data': [{'ts': self.ts, 'v': 1.0}]}]])
+
+    def test_flush_on_size(self) -> None:
+        with TimeseriesWriter(self.client, max_batch_points=2, flush_interval=60) as writer:
+            for i in range(5):
+                writer.write(1, 'a', float(i), self.ts)
+            writer.flush()
+            self.assertEqual([len(call[0]['data']) for call in self.client.calls], [2, 2, 1])
+
+    def test_flush_on_time(self) -> None:
+        with TimeseriesWriter(self.client, flush_interval=0.05) as writer:
+            writer.write(1, 'a', 1.0, self.ts)
+            for _ in range(100):
+                if self.client.calls:
+                    break
+                threading.Event().wait(0.01)
+            self.assertEqual(len(self.client.calls), 1)
+
+    def test_backpressure(self) -> None:
+        self.client.release.clear()
+        writer: TimeseriesWriter = TimeseriesWriter(self.client, max_batch_points=1, max_queue_size=1)
+        writer.write(1, 'a', 1.0, self.ts)  # taken by the flush thread, which blocks in the client
+        writer.write(1, 'a', 2.0, self.ts, timeout=1)
+        with self.assertRaises(queue.Full):
+            writer.write(1, 'a', 3.0, self.ts, timeout=0.01)
+        self.client.release.set()
+        writer.close()
+        self.assertEqual(len(self.client.calls), 2)
+
+    def test_on_error(self) -> None:
+        self.client.fail = True
+        errors: List[Any] = []
+        with TimeseriesWriter(self.client, on_error=lambda e, batch: errors.append((e, batch))) as writer:
+            writer.write(1, 'a', 1.0, self.ts)
+            writer.flush()
+            writer.write(1, 'a', 2.0, self.ts)
+
+        self.assertEqual(len(errors), 2)
+        self.assertIsInstance(errors[0][0], RuntimeError)
+        self.assertEqual(errors[1][1], [{'node_id': 1, 'tag': 'a', 'data': [{'ts': self.ts, 'v': 2.0}]}])
+
+
+class TestTimeseriesWriterWithClient(unittest.TestCase):
+    @responses.activate
+    def test_store_batches(self) -> None:
+        client: TimeseriesClient = TimeseriesClient(domain='test', api_key='123456789')
+        responses.add(responses.POST, url=f'{client._url}/{client._timeseries_api_path}', status=201)
+        ts: datetime.datetime = datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=1)))
+
+        with TimeseriesWriter(client) as writer:
+            writer.write(1, 'outdoortemp', 2.6, ts)
+            writer.write(1, 'outdoortemp', 2.7, ts + datetime.timedelta(minutes=15))
+
+        self.assertEqual(len(responses.calls), 1)
+        body: Dict[str, List[str]] = urllib.parse.parse_qs(responses.calls[0].request.body)
+        self.assertEqual(json.loads(body['timeseries'][0]), [{
+            'node_id': 1,
+            'tag': 'outdoortemp',
+            'data': [
+                {'ts': '2020-01-01T00:00:00+01:00', 'v': 2.6},
+                {'ts': '2020-01-01T00:15:00+01:00', 'v': 2.7},
+            ]
+        }])
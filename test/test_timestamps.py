@@ -0,0 +1,42 @@
+import datetime
+import unittest
+from typing import List
+
+import pyrfc3339
+
+from evclient.timestamps import parse_timestamp, parse_timestamps
+
+
+class TestTimestamps(unittest.TestCase):
+    def setUp(self) -> None:
+        self.values: List[str] = [
+            '2020-01-01T00:05:57+01:00',
+            '2020-01-01T00:15:37.250+01:00',
+            '2020-01-01T00:15:37.123456-05:30',
+            '2020-01-01T00:15:37Z',
+            '2020-01-01t00:15:37.123456z',
+            '2020-01-01T00:15:37.25+01:00',
+            '2020-01-01T00:15:37.123456789+01:00',
+        ]
+
+    def test_parse_timestamp(self) -> None:
+        for value in self.values:
+            with self.subTest(value=value):
+                parsed: datetime.datetime = parse_timestamp(value)
+                self.assertEqual(parsed, pyrfc3339.parse(value))
+                self.assertEqual(parsed.utcoffset(), pyrfc3339.parse(value).utcoffset())
+
+    def test_parse_timestamps(self) -> None:
+        parsed: List[datetime.datetime] = parse_timestamps(self.values + self.values)
+
+        self.assertEqual(parsed, [pyrfc3339.parse(value) for value in self.values + self.values])
+        self.assertEqual(
+            [ts.utcoffset() for ts in parsed],
+            [pyrfc3339.parse(value).utcoffset() for value in self.values + self.values]
+        )
+        self.assertIs(parsed[3].tzinfo, datetime.timezone.utc)
+
+    def test_invalid_timestamp(self) -> None:
+        for value in ['2020-13-01T00:05:57+01:00', 'not a timestamp']:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_timestamps([value])
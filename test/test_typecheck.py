@@ -0,0 +1,60 @@
+import os
+import unittest
+from unittest import mock
+
+from beartype.roar import BeartypeException
+
+from evclient import SettingsClient, AsyncEVClient
+from evclient.typecheck import type_checks_enabled, typechecked
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+class TestTypeChecks(unittest.TestCase):
+    def test_type_checks_enabled(self) -> None:
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertTrue(type_checks_enabled())
+        for value in ('0', 'false', 'Off', ' no '):
+            with mock.patch.dict(os.environ, {'EV_TYPE_CHECKS': value}):
+                self.assertFalse(type_checks_enabled())
+        with mock.patch.dict(os.environ, {'EV_TYPE_CHECKS': '1'}):
+            self.assertTrue(type_checks_enabled())
+
+    def test_typechecked(self) -> None:
+        with self.subTest('checked'):
+            with mock.patch.dict(os.environ, {'EV_TYPE_CHECKS': '1'}):
+                checked = typechecked(add)
+            self.assertIs(checked.__unchecked__, add)
+            self.assertRaises(BeartypeException, checked, 1, '2')
+
+        with self.subTest('left out when disabled'):
+            with mock.patch.dict(os.environ, {'EV_TYPE_CHECKS': '0'}):
+                self.assertIs(typechecked(add), add)
+
+    @unittest.skipUnless(type_checks_enabled(), 'type checks are disabled by EV_TYPE_CHECKS')
+    def test_client_option(self) -> None:
+        with self.subTest('checked by default'):
+            client: SettingsClient = SettingsClient(domain='test', api_key='123456789')
+            self.assertRaises(BeartypeException, client._decode_content, '{}', None)
+
+        with self.subTest('type_checks=False'):
+            client = SettingsClient(domain='test', api_key='123456789', type_checks=False)
+            self.assertEqual(client._decode_content('{}', None), {})
+            self.assertIs(client._decode_content.__func__, SettingsClient._decode_content.__unchecked__)
+
+        with self.subTest('other clients are not affected'):
+            client = SettingsClient(domain='test', api_key='123456789')
+            self.assertRaises(BeartypeException, client._decode_content, '{}', None)
+
+        with self.subTest('coroutines'):
+            try:
+                client = AsyncEVClient(domain='test', api_key='123456789', type_checks=False)
+            except ImportError:  # pragma: no cover
+                return
+            self.assertIs(client.get_nodes.__func__, AsyncEVClient.get_nodes.__unchecked__)
+
+
+if __name__ == '__main__':
+    unittest.main()